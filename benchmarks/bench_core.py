@@ -0,0 +1,187 @@
+"""
+Benchmark suite for the SRS core
+
+Measures wall time and peak memory of the hot paths in FlashcardManager and
+GoogleSheetsService.fetch_words on synthetic decks, writes the results as
+JSON and optionally compares them against a baseline run.
+
+Usage:
+    python -m benchmarks.bench_core [--sizes 1000 10000 100000 1000000]
+                                    [--output FILE] [--baseline FILE] [--threshold 0.25]
+"""
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List
+from benchmarks.fake_sheets import FakeSheetsService
+from benchmarks.synthetic import generate_rows
+from services.flashcard_logic import FlashcardManager
+
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+ANSWERS_PER_RUN = 50  # record_answer is timed per answer over this many answers
+SEARCH_QUERIES = ['a', 'ka', 'word 1', 'meaning of', 'word 12345', 'zzzz']  # Broad to empty
+
+class BenchContext:
+    """Deck data shared by all benchmarks of one size"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.rows = generate_rows(size)
+        self.words = FakeSheetsService(self.rows).fetch_words()
+        self.config = {'cards_per_session': 20}
+
+    def manager(self) -> FlashcardManager:
+        """Fresh manager over a private copy of the deck"""
+        words = [dict(word) for word in self.words]
+        return FlashcardManager(words, FakeSheetsService(self.rows), self.config)
+
+# Each benchmark prepares its state untimed and returns (run, operations)
+def bench_fetch_words(ctx: BenchContext):
+    service = FakeSheetsService(ctx.rows)
+    return service.fetch_words, 1
+
+def bench_get_due_cards_count(ctx: BenchContext):
+    return ctx.manager().get_due_cards_count, 1
+
+def bench_select_cards(ctx: BenchContext):
+    return ctx.manager()._select_cards, 1
+
+def bench_start_new_session(ctx: BenchContext):
+    manager = ctx.manager()
+    return (lambda: manager.start_new_session(force_new=True)), 1
+
+def bench_record_answer(ctx: BenchContext):
+    manager = ctx.manager()
+    manager.config = {'cards_per_session': ANSWERS_PER_RUN}
+    manager.start_new_session(force_new=True)
+
+    def run():
+        correct = True
+        while manager.has_next_card():
+            manager.record_answer(correct)
+            manager.next_card()
+            correct = not correct
+
+    return run, max(manager.session_size, 1)
+
+def bench_build_search_index(ctx: BenchContext):
+    manager = ctx.manager()
+    return manager.search_index, 1
+
+def bench_search(ctx: BenchContext):
+    index = ctx.manager().search_index()
+
+    def run():
+        for query in SEARCH_QUERIES:
+            index.search(query)
+
+    return run, len(SEARCH_QUERIES)
+
+BENCHMARKS: Dict[str, Callable] = {
+    'fetch_words': bench_fetch_words,
+    'get_due_cards_count': bench_get_due_cards_count,
+    '_select_cards': bench_select_cards,
+    'start_new_session': bench_start_new_session,
+    'record_answer': bench_record_answer,
+    'build_search_index': bench_build_search_index,
+    'search': bench_search,
+}
+
+def _repeats(size: int) -> int:
+    if size <= 10000:
+        return 7
+    if size <= 100000:
+        return 3
+    return 1
+
+def measure(prepare: Callable, ctx: BenchContext) -> Dict:
+    """Best-of-N time per operation and peak traced memory of one run"""
+    best = float('inf')
+    for _ in range(_repeats(ctx.size)):
+        run, operations = prepare(ctx)
+        gc.collect()
+        started = time.perf_counter()
+        run()
+        best = min(best, (time.perf_counter() - started) / operations)
+
+    # Memory is traced in a separate run, tracemalloc slows allocation down
+    run, _ = prepare(ctx)
+    gc.collect()
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'seconds': best, 'peak_bytes': peak}
+
+def run_suite(sizes: List[int], names: List[str]) -> Dict:
+    results = {name: {} for name in names}
+    for size in sizes:
+        print(f"Deck size {size}", file=sys.stderr)
+        ctx = BenchContext(size)
+        for name in names:
+            result = measure(BENCHMARKS[name], ctx)
+            results[name][str(size)] = result
+            print(f"  {name:<22} {result['seconds'] * 1000:12.3f} ms  "
+                  f"{result['peak_bytes'] / 1024 / 1024:9.2f} MiB peak", file=sys.stderr)
+        del ctx
+        gc.collect()
+
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'sizes': sizes
+        },
+        'results': results
+    }
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Return descriptions of every measurement slower than baseline * (1 + threshold)"""
+    regressions = []
+    for name, by_size in current['results'].items():
+        for size, result in by_size.items():
+            base = baseline.get('results', {}).get(name, {}).get(size)
+            if not base:
+                continue
+            for metric in ('seconds', 'peak_bytes'):
+                if base[metric] and result[metric] > base[metric] * (1 + threshold):
+                    ratio = result[metric] / base[metric]
+                    regressions.append(f"{name} @ {size}: {metric} {ratio:.2f}x baseline")
+    return regressions
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the FlashTick SRS core")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), help="run only these benchmarks")
+    parser.add_argument('--output', '-o', default='bench_core.json', help="where to write the JSON results")
+    parser.add_argument('--baseline', help="JSON results of a previous run to compare against")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="allowed slowdown before a result counts as a regression (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.sizes, args.only or list(BENCHMARKS))
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,268 @@
+"""
+End-to-end UI latency benchmark on Qt's offscreen platform
+
+Drives the real MainWindow and FlashcardView against the in-memory Sheets
+fake, scripts full practice sessions and records startup time, per-card
+transition latency percentiles and the share of each reveal spent in
+animations. A second session in rapid mode (no animations) measures the
+raw flip (reveal) and advance (answer to next front) latency, followed by
+the cost of restyling a status label and of switching the theme.
+
+Usage:
+    python -m benchmarks.bench_ui [--deck-size 10000] [--cards 100]
+                                  [--output FILE] [--baseline FILE] [--threshold 0.25]
+"""
+
+import os
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+THINK_SECONDS = 0.05  # Idle time between rapid mode key presses
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """p50/p90/p99/max of millisecond samples"""
+    if not samples:
+        return {'p50': 0.0, 'p90': 0.0, 'p99': 0.0, 'max': 0.0}
+    ordered = sorted(samples)
+
+    def pick(fraction):
+        return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+    return {'p50': pick(0.50), 'p90': pick(0.90), 'p99': pick(0.99), 'max': ordered[-1]}
+
+class UIBenchmark:
+    """Scripts practice sessions through the real widgets"""
+
+    def __init__(self, deck_size: int, cards: int, seed: int = 7):
+        from PySide6.QtWidgets import QApplication
+
+        self.app = QApplication.instance() or QApplication(sys.argv[:1])
+        self.deck_size = deck_size
+        self.cards = cards
+        self.rng = random.Random(seed)
+        self.work_ms = 0.0  # Time spent inside instrumented view methods
+
+    def wait_until(self, condition: Callable[[], bool], timeout: float = 5.0):
+        """Run the event loop until condition() holds"""
+        deadline = time.perf_counter() + timeout
+        while not condition():
+            if time.perf_counter() > deadline:
+                raise TimeoutError("UI did not reach the expected state")
+            self.app.processEvents()
+            time.sleep(0.0005)
+
+    def settle(self):
+        """Flush pending events so layout and painting are included"""
+        self.app.processEvents()
+
+    def think(self, seconds: float = THINK_SECONDS):
+        """Keep the event loop running for a user's thinking time"""
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            self.app.processEvents()
+            time.sleep(0.001)
+
+    def _instrument(self, obj, name: str):
+        """Accumulate the time spent in obj.name into self.work_ms"""
+        original = getattr(obj, name)
+
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self.work_ms += (time.perf_counter() - started) * 1000
+
+        setattr(obj, name, timed)
+
+    def run(self) -> Dict:
+        from benchmarks.fake_sheets import FakeSheetsService
+        from benchmarks.synthetic import generate_rows
+        from services.flashcard_logic import FlashcardManager
+
+        config = _BenchConfig({'cards_per_session': self.cards})
+        rows = generate_rows(self.deck_size)
+
+        # Startup: window construction until the home view is painted
+        started = time.perf_counter()
+        from ui.main_window import MainWindow
+        window = MainWindow(config)
+        window.show()
+        self.settle()
+        startup_ms = (time.perf_counter() - started) * 1000
+
+        # Deck load: fetch + manager + home view refresh
+        started = time.perf_counter()
+        window.sheets_service = FakeSheetsService(rows)
+        words = window.sheets_service.fetch_words()
+        window.flashcard_manager = FlashcardManager(words, window.sheets_service, config)
+        window.update_home_view_connection()
+        self.settle()
+        deck_load_ms = (time.perf_counter() - started) * 1000
+
+        # First practice open includes lazily building the flashcard view
+        started = time.perf_counter()
+        window.start_practice()
+        self.settle()
+        open_practice_ms = (time.perf_counter() - started) * 1000
+
+        view = window.flashcard_view
+        for name in ('reveal_card', 'reveal_complete', 'show_action_buttons'):
+            self._instrument(view, name)
+
+        reveal_total, reveal_work, answer_ms = [], [], []
+        session_complete_ms = 0.0
+        while window.stack.currentWidget() is view:
+            self.work_ms = 0.0
+            started = time.perf_counter()
+            view.reveal_card(None)
+            self.wait_until(lambda: view.action_widget.isVisible())
+            reveal_total.append((time.perf_counter() - started) * 1000)
+            reveal_work.append(self.work_ms)
+
+            last_card = not window.flashcard_manager.has_next_card()
+            self.think()
+            started = time.perf_counter()
+            view.handle_answer(self.rng.random() < 0.8)
+            self.settle()
+            elapsed = (time.perf_counter() - started) * 1000
+            if last_card:
+                session_complete_ms = elapsed
+            else:
+                answer_ms.append(elapsed)
+
+        animation_overhead = [total - work for total, work in zip(reveal_total, reveal_work)]
+        flip_ms, advance_ms = self.run_rapid_session(window, config)
+        status_ms, theme_switch_ms = self.measure_restyle(window)
+        window.close()
+
+        results = {
+            'startup_ms': startup_ms,
+            'deck_load_ms': deck_load_ms,
+            'open_practice_ms': open_practice_ms,
+            'session_complete_ms': session_complete_ms,
+            'theme_switch_ms': theme_switch_ms,
+            'cards_reviewed': len(reveal_total)
+        }
+        for name, samples in (('reveal_total', reveal_total),
+                              ('reveal_work', reveal_work),
+                              ('animation_overhead', animation_overhead),
+                              ('answer_transition', answer_ms),
+                              ('rapid_flip', flip_ms),
+                              ('rapid_advance', advance_ms),
+                              ('status_restyle', status_ms)):
+            for stat, value in percentiles(samples).items():
+                results[f"{name}_{stat}_ms"] = value
+        return results
+
+    def run_rapid_session(self, window, config):
+        """Script a rapid mode session, returns (flip, advance) latencies in ms"""
+        config.set('rapid_mode', True)
+        window.flashcard_manager.start_new_session(force_new=True)
+        view = window.flashcard_view
+        view.load_session(window.flashcard_manager)
+        window.stack.setCurrentWidget(view)
+        self.settle()
+
+        flip_ms, advance_ms = [], []
+        while window.stack.currentWidget() is view:
+            self.think()
+            started = time.perf_counter()
+            view.reveal_card(None)
+            self.settle()
+            flip_ms.append((time.perf_counter() - started) * 1000)
+
+            last_card = not window.flashcard_manager.has_next_card()
+            self.think()
+            started = time.perf_counter()
+            view.handle_answer(self.rng.random() < 0.8)
+            self.settle()
+            if not last_card:
+                advance_ms.append((time.perf_counter() - started) * 1000)
+        return flip_ms, advance_ms
+
+    def measure_restyle(self, window, repeat: int = 200):
+        """Time status label state flips (ms each) and a theme round trip (ms)"""
+        from ui.styles import Styles, apply_theme, set_state, theme_names
+
+        status_ms = []
+        for i in range(repeat):
+            started = time.perf_counter()
+            set_state(window.status_label, 'tone', 'ok' if i % 2 else 'error')
+            self.settle()
+            status_ms.append((time.perf_counter() - started) * 1000)
+
+        other = next(name for name in theme_names() if name != Styles.DEFAULT_THEME)
+        started = time.perf_counter()
+        apply_theme(other)
+        self.settle()
+        apply_theme(Styles.DEFAULT_THEME)
+        self.settle()
+        return status_ms, (time.perf_counter() - started) * 1000
+
+class _BenchConfig(dict):
+    """ConfigManager stand-in that never touches config/config.json"""
+
+    def set(self, key, value):
+        self[key] = value
+
+    def save(self):
+        pass
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Return every millisecond metric slower than baseline * (1 + threshold)"""
+    regressions = []
+    for name, value in current['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if name.endswith('_ms') and base and value > base * (1 + threshold):
+            regressions.append(f"{name}: {value:.2f} ms vs {base:.2f} ms ({value / base:.2f}x)")
+    return regressions
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark FlashTick UI latency")
+    parser.add_argument('--deck-size', type=int, default=10000)
+    parser.add_argument('--cards', type=int, default=100, help="cards per scripted session")
+    parser.add_argument('--output', '-o', default='bench_ui.json')
+    parser.add_argument('--baseline', help="JSON results of a previous run to compare against")
+    parser.add_argument('--threshold', type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    results = UIBenchmark(args.deck_size, args.cards).run()
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'qt_platform': os.environ.get('QT_QPA_PLATFORM'),
+            'deck_size': args.deck_size,
+            'cards': args.cards
+        },
+        'results': results
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    for name, value in results.items():
+        unit = ' ms' if name.endswith('_ms') else ''
+        print(f"  {name:<32} {value:10.2f}{unit}")
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""
+In-memory stand-in for a Google Sheets worksheet
+
+Implements the subset of the gspread Worksheet/Spreadsheet API that
+GoogleSheetsService uses, so benchmarks exercise the real service code
+(parsing, batching) without network access.
+"""
+
+import re
+import time
+from typing import List, Optional
+from services.google_sheets import GoogleSheetsService
+
+_A1_RE = re.compile(r'^([A-Z]+)(\d+)$')
+
+def _parse_a1(label: str):
+    """Convert an A1 cell label into a 1-based (row, col) pair"""
+    letters, digits = _A1_RE.match(label).groups()
+    col = 0
+    for letter in letters:
+        col = col * 26 + (ord(letter) - ord('A') + 1)
+    return int(digits), col
+
+class FakeCell:
+    def __init__(self, value):
+        self.value = value
+
+class FakeWorksheet:
+    """Worksheet backed by a list of string rows"""
+
+    def __init__(self, rows: List[List[str]], worksheet_id: int = 0, title: str = 'Sheet1',
+                 latency: float = 0.0):
+        self.rows = rows
+        self.id = worksheet_id
+        self.title = title
+        self.latency = latency  # Simulated seconds per API request
+        self.request_count = 0
+
+    def _request(self):
+        self.request_count += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _set(self, row: int, col: int, value):
+        while len(self.rows) < row:
+            self.rows.append([])
+        cells = self.rows[row - 1]
+        while len(cells) < col:
+            cells.append('')
+        cells[col - 1] = str(value)
+
+    def get_all_values(self):
+        self._request()
+        return [list(row) for row in self.rows]
+
+    def cell(self, row: int, col: int):
+        self._request()
+        cells = self.rows[row - 1] if row <= len(self.rows) else []
+        return FakeCell(cells[col - 1] if col <= len(cells) else '')
+
+    def col_values(self, col: int):
+        self._request()
+        values = [row[col - 1] if col <= len(row) else '' for row in self.rows]
+        while values and not values[-1]:
+            values.pop()
+        return values
+
+    def acell(self, label: str):
+        return self.cell(*_parse_a1(label))
+
+    def update_cell(self, row: int, col: int, value):
+        self._request()
+        self._set(row, col, value)
+
+    def update(self, values, range_name: Optional[str] = None, **kwargs):
+        self._request()
+        start_row, start_col = _parse_a1((range_name or 'A1').split(':')[0])
+        for r, row_values in enumerate(values):
+            for c, value in enumerate(row_values):
+                self._set(start_row + r, start_col + c, value)
+
+    def batch_update(self, data, **kwargs):
+        self._request()
+        for item in data:
+            start_row, start_col = _parse_a1(item['range'].split(':')[0])
+            for r, row_values in enumerate(item['values']):
+                for c, value in enumerate(row_values):
+                    self._set(start_row + r, start_col + c, value)
+
+    def append_rows(self, values, **kwargs):
+        self._request()
+        self.rows.extend([str(v) for v in row] for row in values)
+
+class FakeSpreadsheet:
+    """Spreadsheet holding one or more fake worksheets"""
+
+    def __init__(self, worksheets: List[FakeWorksheet]):
+        self._worksheets = worksheets
+
+    def worksheets(self):
+        return list(self._worksheets)
+
+    def get_worksheet(self, index: int):
+        return self._worksheets[index] if index < len(self._worksheets) else None
+
+    def add_worksheet(self, title: str, rows: int = 0, cols: int = 0, **kwargs):
+        worksheet = FakeWorksheet([], worksheet_id=max(ws.id for ws in self._worksheets) + 1, title=title)
+        self._worksheets.append(worksheet)
+        return worksheet
+
+    def batch_update(self, body):
+        for request in body.get('requests', []):
+            if 'deleteDimension' in request:
+                target = request['deleteDimension']['range']
+                worksheet = next(ws for ws in self._worksheets if ws.id == target['sheetId'])
+                worksheet._request()
+                del worksheet.rows[target['startIndex']:target['endIndex']]
+
+class FakeSheetsService(GoogleSheetsService):
+    """GoogleSheetsService wired to an in-memory worksheet"""
+
+    def __init__(self, rows: List[List[str]], latency: float = 0.0):
+        super().__init__()
+        self.worksheet = FakeWorksheet(rows, latency=latency)
+        self.sheet = FakeSpreadsheet([self.worksheet])
+        self.client = object()
+        self.spreadsheet_id = 'fake'
@@ -0,0 +1,62 @@
+"""
+Deterministic synthetic decks for benchmarks
+"""
+
+import random
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+# Share of cards per SRS stage (0-8) in a mature deck: a learning pile at
+# stage 0, a long tail through the middle stages and a mastered block
+STAGE_WEIGHTS = [0.18, 0.12, 0.10, 0.09, 0.08, 0.07, 0.06, 0.05, 0.25]
+NEW_FRACTION = 0.15        # Never practiced (stage 0, empty date)
+PRACTICED_TODAY = 0.05     # Practiced today, so not due
+HISTORY_DAYS = 365         # Practice dates spread over the last year
+
+def generate_deck(size: int, seed: int = 42, today: Optional[date] = None) -> List[Dict]:
+    """Generate fetch_words-style dictionaries with realistic SRS metadata"""
+    rng = random.Random(seed)
+    today = today or date.today()
+    words = []
+
+    for i in range(size):
+        if rng.random() < NEW_FRACTION:
+            practice_date = ''
+            stage = 0
+            failed = 0
+        else:
+            stage = rng.choices(range(len(STAGE_WEIGHTS)), weights=STAGE_WEIGHTS)[0]
+            if rng.random() < PRACTICED_TODAY:
+                days_ago = 0
+            else:
+                # Recent practice is more common than old practice
+                days_ago = 1 + min(int(rng.expovariate(1 / 20)), HISTORY_DAYS - 1)
+            practice_date = (today - timedelta(days=days_ago)).isoformat()
+            failed = min(int(rng.expovariate(1.0) * (2 if stage == 0 else 1)), 20)
+
+        words.append({
+            'row_index': i + 2,
+            'front': f"word {i} {_syllables(rng)}",
+            'back': f"meaning of {_syllables(rng)} #{i}",
+            'last_practice_date': practice_date,
+            'srs_stage': stage,
+            'failed_count': failed
+        })
+
+    return words
+
+def _syllables(rng: random.Random) -> str:
+    return ''.join(rng.choice('bcdfghjklmnprstvz') + rng.choice('aeiou') for _ in range(rng.randint(2, 5)))
+
+def generate_rows(size: int, seed: int = 42, today: Optional[date] = None) -> List[List[str]]:
+    """Generate worksheet rows (header + A-E string columns) as get_all_values returns them"""
+    rows = [['Front', 'Back', 'Last Practice Date', 'SRS Stage', 'Number of Failed']]
+    for word in generate_deck(size, seed, today):
+        rows.append([
+            word['front'],
+            word['back'],
+            word['last_practice_date'],
+            str(word['srs_stage']),
+            str(word['failed_count'])
+        ])
+    return rows
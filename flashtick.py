@@ -0,0 +1,370 @@
+"""
+FlashTick command-line interface
+
+Headless entry point for scripted tasks (cron jobs, shell prompts). Uses
+services and models directly and never imports PySide6.
+
+Usage:
+    python flashtick.py due [--refresh] [--json]
+    python flashtick.py sync
+    python flashtick.py import FILE [--local PATH] [--batch-size N] [--restart] [--allow-duplicates]
+    python flashtick.py dedup [--merge]
+    python flashtick.py archive [--dry-run] [--restore [QUERY]] [--reset]
+    python flashtick.py export [--format json|csv] [--output FILE]
+    python flashtick.py forecast [--days N] [--capacity N] [--json] [--scheduler NAME]
+    python flashtick.py bench [--repeat N]
+"""
+
+import time
+_STARTED_AT = time.perf_counter()
+
+import sys
+import csv
+import json
+import argparse
+from datetime import datetime
+from typing import List, Dict
+from services.config_manager import ConfigManager
+from services.deck_snapshot import DeckSnapshot
+from services.scheduler import SCHEDULERS, get_scheduler
+from services import metrics
+from services.tracing import tracer
+
+def _source_key(config) -> str:
+    return DeckSnapshot.source_key_for(config.get('spreadsheet_id', ''), config.get('sheet_gid', ''))
+
+def _require_spreadsheet(config):
+    if not config.get('spreadsheet_id', ''):
+        raise SystemExit("Error: No spreadsheet configured. Set one up in the app's Settings first.")
+
+def _open_snapshot(config):
+    """Open the deck snapshot for the configured sheet, or None"""
+    if not config.get('spreadsheet_id', ''):
+        return None
+    snapshot = DeckSnapshot()
+    if snapshot.open() and snapshot.source_key == _source_key(config):
+        return snapshot
+    snapshot.close()
+    return None
+
+def _connect(config):
+    """Connect to the configured Google Sheet"""
+    from services.sharded_sheets import ShardedSheetsService
+
+    _require_spreadsheet(config)
+    return ShardedSheetsService.from_config(config.get('spreadsheet_id'), config.get('sheet_gid', ''), config)
+
+def fetch_and_save(config, sheets_service=None) -> List[Dict]:
+    """Fetch words from the sheet and refresh the local snapshot"""
+    sheets_service = sheets_service or _connect(config)
+    words_data = sheets_service.fetch_words()
+    DeckSnapshot.save(words_data, _source_key(config))
+    return words_data
+
+def load_words(config, refresh: bool = False) -> List[Dict]:
+    """Load words from the snapshot, falling back to the sheet"""
+    if not refresh:
+        snapshot = _open_snapshot(config)
+        if snapshot:
+            try:
+                return snapshot.to_words()
+            finally:
+                snapshot.close()
+    return fetch_and_save(config)
+
+def _create_manager(config, words_data, sheets_service=None):
+    from services.flashcard_logic import FlashcardManager
+    return FlashcardManager(words_data, sheets_service, config)
+
+def cmd_due(args, config):
+    """Print how many cards are due today"""
+    today = datetime.now().strftime('%Y-%m-%d')
+    snapshot = None if args.refresh else _open_snapshot(config)
+
+    if snapshot:
+        try:
+            total, due = snapshot.word_count(), snapshot.due_count(today, get_scheduler(config.get('scheduler')))
+        finally:
+            snapshot.close()
+    else:
+        manager = _create_manager(config, load_words(config, refresh=True))
+        total, due = len(manager.words_data), manager.get_due_cards_count()
+
+    if args.json:
+        print(json.dumps({'date': today, 'due': due, 'total_cards': total}))
+    else:
+        print(due)
+    return 0
+
+def cmd_sync(args, config):
+    """Fetch the deck from Google Sheets, give new cards their ID and refresh the snapshot"""
+    started = time.perf_counter()
+    sheets_service = _connect(config)
+    words_data = sheets_service.fetch_words()
+    assigned = sheets_service.assign_ids(words_data)
+    DeckSnapshot.save(words_data, _source_key(config))
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(f"Synced {len(words_data)} words in {elapsed_ms:.0f} ms")
+    if assigned:
+        print(f"Assigned IDs to {assigned} new cards")
+    return 0
+
+def cmd_import(args, config):
+    """Stream a CSV/TSV or Anki deck into the sheet (or a local deck file)"""
+    from services.importer import DeckImporter, SheetsImportTarget, LocalImportTarget
+    from services.dedup import DuplicateIndex
+
+    duplicate_index = None
+    if args.local:
+        target = LocalImportTarget(args.local)
+        if not args.allow_duplicates:
+            duplicate_index = DuplicateIndex.from_words(target.words)
+    else:
+        sheets_service = _connect(config)
+        target = SheetsImportTarget(sheets_service)
+        if not args.allow_duplicates:
+            sheets_service.fetch_words()
+            duplicate_index = sheets_service.duplicate_index
+
+    def progress(stats):
+        print(f"  {stats['rows_written']} rows written, {stats['rows_per_second']:.0f} rows/s",
+              file=sys.stderr)
+
+    importer = DeckImporter(target, batch_size=args.batch_size, progress_callback=progress,
+                            duplicate_index=duplicate_index)
+    stats = importer.run(args.file, resume=not args.restart)
+
+    if stats['rows_resumed']:
+        print(f"Resumed after {stats['rows_resumed']} previously imported rows")
+    print(f"Imported {stats['rows_written']} rows in {stats['batches']} batches, "
+          f"{stats['elapsed_seconds']:.1f} s ({stats['rows_per_second']:.0f} rows/s, "
+          f"{stats['write_seconds']:.1f} s writing)")
+    if stats['rows_skipped']:
+        print(f"Skipped {stats['rows_skipped']} rows already in the deck")
+    if not args.local:
+        print("Run 'flashtick sync' to refresh the local snapshot")
+    return 0
+
+def cmd_dedup(args, config):
+    """Report (and optionally merge) duplicate cards"""
+    sheets_service = _connect(config)
+    manager = _create_manager(config, fetch_and_save(config, sheets_service), sheets_service)
+    groups = manager.find_duplicates()
+
+    for group in groups:
+        rows = ', '.join(str(word['row_index']) for word in group)
+        print(f"{group[0]['front']} -> {group[0]['back']}: rows {rows}")
+    print(f"{sum(len(group) - 1 for group in groups)} duplicate rows in {len(groups)} groups")
+
+    if args.merge and groups:
+        removed = manager.merge_duplicates()
+        DeckSnapshot.save(manager.words_data, _source_key(config))
+        print(f"Merged duplicates, removed {removed} rows")
+    return 0
+
+def cmd_archive(args, config):
+    """Move mastered cards to the archive worksheet, or restore archived ones"""
+    sheets_service = _connect(config)
+    manager = _create_manager(config, fetch_and_save(config, sheets_service), sheets_service)
+
+    if args.restore is not None:
+        if args.dry_run:
+            query = args.restore.strip().casefold()
+            count = sum(1 for word in sheets_service.fetch_archive()
+                        if query in word['front'].casefold() or query in word['back'].casefold())
+            print(f"{count} archived cards match")
+            return 0
+        restored = manager.restore_archived(args.restore, reset=args.reset)
+        DeckSnapshot.save(manager.words_data, _source_key(config))
+        print(f"Restored {restored} cards, {len(manager.words_data)} cards in the deck")
+        return 0
+
+    retired = len(manager.retired_positions())
+    if args.dry_run:
+        print(f"{retired} of {len(manager.words_data)} cards would be archived")
+        return 0
+    archived = manager.archive_retired()
+    DeckSnapshot.save(manager.words_data, _source_key(config))
+    print(f"Archived {archived} mastered cards, {len(manager.words_data)} cards left in the deck")
+    return 0
+
+def cmd_export(args, config):
+    """Export deck statistics as JSON or CSV"""
+    manager = _create_manager(config, load_words(config, refresh=args.refresh))
+    stats = manager.get_deck_stats()
+
+    out = open(args.output, 'w', newline='') if args.output else sys.stdout
+    try:
+        if args.format == 'csv':
+            writer = csv.writer(out)
+            writer.writerow(['metric', 'value'])
+            for key in ('date', 'total_cards', 'new', 'due', 'mastered'):
+                writer.writerow([key, stats[key]])
+            for stage, count in enumerate(stats['stage_counts']):
+                writer.writerow([f"stage_{stage}", count])
+        else:
+            json.dump(stats, out, indent=2)
+            out.write('\n')
+    finally:
+        if args.output:
+            out.close()
+    return 0
+
+def cmd_forecast(args, config):
+    """Project due cards and review time for the coming days"""
+    from services.analytics import ReviewAnalytics
+    from models.deck import DeckColumns
+    from services.forecast import forecaster_from_history, peak_day
+    from services.review_log import ReviewLog
+
+    scheduler = get_scheduler(args.scheduler or config.get('scheduler'))
+
+    snapshot = _open_snapshot(config)
+    if snapshot:
+        try:
+            deck = DeckColumns.from_snapshot(snapshot, scheduler)
+        finally:
+            snapshot.close()
+    else:
+        deck = DeckColumns.from_words(load_words(config, refresh=True), scheduler)
+
+    summary = ReviewAnalytics(ReviewLog()).summary()
+    forecaster = forecaster_from_history(summary, config.get('cards_per_session', 20), scheduler)
+    if args.capacity is not None:
+        forecaster.daily_capacity = args.capacity or None
+    forecast = forecaster.forecast(deck, args.days)
+
+    if args.json:
+        print(json.dumps(forecast, indent=2))
+        return 0
+
+    capacity = forecaster.daily_capacity or 'all due'
+    print(f"Deck: {len(deck)} cards, {scheduler.label} scheduler, capacity {capacity} reviews/day, "
+          f"{forecaster.seconds_per_review:.1f} s/review")
+    print(f"  {'date':<12}{'due':>8}{'reviews':>9}{'backlog':>9}{'minutes':>9}")
+    for day in forecast:
+        print(f"  {day['date']:<12}{day['due']:>8}{day['reviews']:>9}{day['backlog']:>9}{day['minutes']:>9.0f}")
+    peak = peak_day(forecast)
+    if peak:
+        print(f"Peak: {peak['due']} due on {peak['date']}")
+    return 0
+
+def _time_ms(func, repeat: int) -> float:
+    """Best-of-N wall time of func in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+def cmd_bench(args, config):
+    """Time the core operations against the local deck"""
+    today = datetime.now().strftime('%Y-%m-%d')
+    words_data = load_words(config)
+    manager = _create_manager(config, words_data)
+
+    def snapshot_due():
+        snapshot = _open_snapshot(config)
+        if snapshot:
+            snapshot.due_count(today, manager.scheduler)
+            snapshot.close()
+
+    results = [
+        ('snapshot open + due count', _time_ms(snapshot_due, args.repeat)),
+        ('snapshot load words', _time_ms(lambda: load_words(config), args.repeat)),
+        ('get_due_cards_count', _time_ms(manager.get_due_cards_count, args.repeat)),
+        ('_select_cards', _time_ms(manager._select_cards, args.repeat)),
+        ('start_new_session', _time_ms(lambda: manager.start_new_session(force_new=True), args.repeat)),
+    ]
+
+    print(f"Deck: {len(words_data)} words, best of {args.repeat}")
+    for name, elapsed_ms in results:
+        print(f"  {name:<28} {elapsed_ms:10.2f} ms")
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='flashtick', description="FlashTick command-line interface")
+    parser.add_argument('--timing', action='store_true', help="print total run time to stderr")
+    parser.add_argument('--metrics', metavar='FILE',
+                        help="record metrics and write them to FILE (.prom for Prometheus text, else JSON)")
+    parser.add_argument('--trace', metavar='FILE',
+                        help="record trace spans and write them to FILE as Chrome trace JSON")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    due = subparsers.add_parser('due', help="print the number of cards due today")
+    due.add_argument('--refresh', action='store_true', help="fetch from Google Sheets instead of the snapshot")
+    due.add_argument('--json', action='store_true', help="print JSON instead of a bare number")
+    due.set_defaults(func=cmd_due)
+
+    sync = subparsers.add_parser('sync', help="fetch the deck, give new cards an ID and refresh the local snapshot")
+    sync.set_defaults(func=cmd_sync)
+
+    importer = subparsers.add_parser('import', help="import a CSV/TSV or Anki .apkg file "
+                                     "(exported with 'Support older Anki versions')")
+    importer.add_argument('file')
+    importer.add_argument('--local', metavar='PATH', help="import into a local deck file instead of the sheet")
+    importer.add_argument('--batch-size', type=int, default=None, help="rows per batched write")
+    importer.add_argument('--restart', action='store_true', help="ignore any saved checkpoint")
+    importer.add_argument('--allow-duplicates', action='store_true', help="import rows already in the deck")
+    importer.set_defaults(func=cmd_import)
+
+    dedup = subparsers.add_parser('dedup', help="report duplicate cards")
+    dedup.add_argument('--merge', action='store_true', help="keep the most advanced copy and delete the rest")
+    dedup.set_defaults(func=cmd_dedup)
+
+    archive = subparsers.add_parser('archive', help="move mastered cards to the archive worksheet")
+    archive.add_argument('--dry-run', action='store_true', help="only count the cards that would move")
+    archive.add_argument('--restore', nargs='?', const='', metavar='QUERY',
+                         help="move archived cards whose front or back contains QUERY (all without QUERY) back")
+    archive.add_argument('--reset', action='store_true', help="restore cards at stage 0 to learn them again")
+    archive.set_defaults(func=cmd_archive)
+
+    export = subparsers.add_parser('export', help="export deck statistics")
+    export.add_argument('--format', choices=('json', 'csv'), default='json')
+    export.add_argument('--output', '-o', help="output file (default: stdout)")
+    export.add_argument('--refresh', action='store_true', help="fetch from Google Sheets instead of the snapshot")
+    export.set_defaults(func=cmd_export)
+
+    forecast = subparsers.add_parser('forecast', help="project the due load of the coming days")
+    forecast.add_argument('--days', type=int, default=30, help="days to project (default: 30)")
+    forecast.add_argument('--capacity', type=int, default=None,
+                          help="reviews per day (default: your recent average, 0 = every due card)")
+    forecast.add_argument('--json', action='store_true', help="print JSON instead of a table")
+    forecast.add_argument('--scheduler', choices=sorted(SCHEDULERS), default=None,
+                          help="simulate this scheduler instead of the configured one")
+    forecast.set_defaults(func=cmd_forecast)
+
+    bench = subparsers.add_parser('bench', help="time core operations against the local deck")
+    bench.add_argument('--repeat', type=int, default=5)
+    bench.set_defaults(func=cmd_bench)
+
+    return parser
+
+def main(argv=None) -> int:
+    """Run the command-line interface"""
+    args = build_parser().parse_args(argv)
+    config = ConfigManager()
+    metrics.registry.enabled = bool(args.metrics)
+    tracer.enabled = bool(args.trace)
+
+    try:
+        with tracer.span(f"cli.{args.command}"):
+            code = args.func(args, config)
+    except SystemExit:
+        raise
+    except Exception as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        code = 1
+
+    if args.metrics:
+        metrics.registry.write(args.metrics)
+    if args.trace:
+        tracer.write(args.trace)
+
+    if args.timing:
+        print(f"flashtick {args.command}: {(time.perf_counter() - _STARTED_AT) * 1000:.0f} ms", file=sys.stderr)
+    return code
+
+if __name__ == "__main__":
+    sys.exit(main())
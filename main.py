@@ -3,47 +3,80 @@ Flashcard Practice Application
 Main entry point for the application
 """
 
+import time
+_STARTED_AT = time.perf_counter()
+
 import sys
-import os
+import argparse
 from PySide6.QtWidgets import QApplication
-from PySide6.QtGui import QIcon
-from ui.main_window import MainWindow
+from PySide6.QtCore import QTimer
 from services.config_manager import ConfigManager
+from services.startup_timer import StartupTimer
+from services import metrics
+from services.tracing import tracer
+from services.profiler import profiler
+
+def parse_args():
+    """Parse FlashTick options, leaving Qt's own arguments untouched"""
+    parser = argparse.ArgumentParser(description="Flashcard Practice")
+    parser.add_argument('--startup-budget', type=int, metavar='MS', default=None,
+                        help="log per-phase startup timings and warn above this budget")
+    parser.add_argument('--trace', metavar='FILE', default=None,
+                        help="record trace spans and write a Chrome trace JSON file on exit")
+    parser.add_argument('--stall-threshold', type=int, metavar='MS', default=None,
+                        help="report GUI event loop stalls longer than this (0 disables)")
+    parser.add_argument('--profile', action='store_true',
+                        help="profile startup and each practice session (reports in config/profiles)")
+    args, _ = parser.parse_known_args()
+    return args
 
 def main():
     """Initialize and run the application"""
+    args = parse_args()
     config = ConfigManager()
+    metrics.registry.enabled = bool(config.get('metrics_enabled', False))
+    tracer.enabled = bool(args.trace)
+    profiler.enabled = args.profile or bool(config.get('profiling_enabled', False))
+    profiler.start('startup')
+    
+    budget_ms = args.startup_budget if args.startup_budget is not None else config.get('startup_budget_ms', 0)
+    startup_timer = StartupTimer(_STARTED_AT, budget_ms)
+    startup_timer.mark('imports')
     
     # Create Qt application
     app = QApplication(sys.argv)
     app.setApplicationName("Flashcard Practice")
     app.setStyle('Fusion')
+    startup_timer.mark('qapplication')
     
     # Set application icon (this affects taskbar on Windows/Linux)
-    icon_paths = [
-        "icon.png",
-        "icon_256.png",
-        "icon.ico",
-        "assets/icon.png",
-        "assets/icon.ico"
-    ]
+    from ui.icons import app_icon
+    app.setWindowIcon(app_icon())
+    startup_timer.mark('icon')
+    
+    from ui.main_window import MainWindow
+    startup_timer.mark('ui imports')
     
-    icon_set = False
-    for icon_path in icon_paths:
-        if os.path.exists(icon_path):
-            app_icon = QIcon(icon_path)
-            app.setWindowIcon(app_icon)
-            icon_set = True
-            break
+    with tracer.span('startup.main_window'):
+        window = MainWindow(config, startup_timer=startup_timer)
+        window.show()
+    startup_timer.mark('show')
     
-    window = MainWindow(config)
+    # Runs once the event loop is idle, i.e. the home screen is interactive
+    QTimer.singleShot(0, window.report_startup_time)
     
-    if icon_set:
-        window.setWindowIcon(app.windowIcon())
+    if args.trace:
+        app.aboutToQuit.connect(lambda: tracer.write(args.trace))
     
-    window.show()
+    stall_threshold = args.stall_threshold if args.stall_threshold is not None else config.get('stall_threshold_ms', 0)
+    if stall_threshold:
+        from ui.stall_detector import StallDetector
+        stall_detector = StallDetector(stall_threshold, parent=app)
+        # Start once the event loop runs, startup itself is measured by the startup timer
+        QTimer.singleShot(0, stall_detector.start)
+        app.aboutToQuit.connect(stall_detector.stop)
     
     sys.exit(app.exec())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,16 @@
+"""
+Epoch-day numbers of the dates stored in the sheet
+"""
+
+from datetime import date
+
+NEVER = -1  # Epoch-day value for cards never practiced
+
+def to_epoch_day(date_str: str) -> int:
+    """Convert a YYYY-MM-DD practice date into an epoch-day number"""
+    if not date_str:
+        return NEVER
+    try:
+        return date.fromisoformat(date_str).toordinal()
+    except ValueError:
+        return 0  # Unparseable dates are treated as long overdue
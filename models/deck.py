@@ -0,0 +1,103 @@
+"""
+Column-oriented deck model for vectorized scheduling
+"""
+
+from typing import Dict, List
+import numpy as np
+from services.deck_snapshot import DeckSnapshot
+
+class DeckColumns:
+    """Column-oriented copy of the SRS fields of a deck
+
+    Days are epoch days, DeckSnapshot.NEVER when unset. state holds the
+    scheduler's numeric per-card state, one column per STATE_FIELDS entry.
+    Suspended cards are never due.
+    """
+
+    def __init__(self, stage: np.ndarray, last_day: np.ndarray, failed: np.ndarray,
+                 due_day: np.ndarray = None, state: np.ndarray = None, suspended: np.ndarray = None):
+        self.stage = stage.astype(np.int16)
+        self.last_day = last_day.astype(np.int64)
+        self.failed = failed.astype(np.int64)
+        if due_day is None:
+            due_day = np.full(len(self.stage), DeckSnapshot.NEVER)
+        self.due_day = due_day.astype(np.int64)
+        if state is None:
+            state = np.zeros((len(self.stage), 0))
+        self.state = state.astype(np.float64)
+        if suspended is None:
+            suspended = np.zeros(len(self.stage), dtype=bool)
+        self.suspended = suspended.astype(bool)
+
+    def __len__(self) -> int:
+        return len(self.stage)
+
+    def copy(self) -> 'DeckColumns':
+        return DeckColumns(self.stage, self.last_day, self.failed, self.due_day, self.state, self.suspended)
+
+    @staticmethod
+    def _states(scheduler, texts, stages) -> np.ndarray:
+        fields = len(scheduler.STATE_FIELDS) if scheduler is not None else 0
+        if not fields:
+            return np.zeros((len(stages), 0))
+        values = [scheduler.parse_state(text, stage) for text, stage in zip(texts, stages)]
+        return np.array(values, dtype=np.float64).reshape(len(stages), fields)
+
+    @classmethod
+    def from_words(cls, words: List[Dict], scheduler=None) -> 'DeckColumns':
+        """Columns of fetch_words-style dictionaries
+
+        scheduler: decodes the Scheduler State of each card, if it keeps state
+        """
+        count = len(words)
+        to_day = DeckSnapshot.to_epoch_day
+        stage = np.fromiter((word.get('srs_stage', 0) for word in words), dtype=np.int16, count=count)
+        return cls(
+            stage,
+            np.fromiter((to_day(word.get('last_practice_date', '')) for word in words), dtype=np.int64, count=count),
+            np.fromiter((word.get('failed_count', 0) for word in words), dtype=np.int64, count=count),
+            np.fromiter((to_day(word.get('due_date', '')) for word in words), dtype=np.int64, count=count),
+            cls._states(scheduler, (word.get('scheduler_state', '') for word in words), stage.tolist()),
+            np.fromiter((bool(word.get('suspended')) for word in words), dtype=bool, count=count)
+        )
+
+    @classmethod
+    def from_snapshot(cls, snapshot: DeckSnapshot, scheduler=None) -> 'DeckColumns':
+        """Copy the columns out of an open snapshot without materializing words"""
+        stage = np.frombuffer(snapshot.srs_stage, dtype=np.uint8)
+        states = None
+        if scheduler is not None and scheduler.STATE_FIELDS:
+            states = cls._states(scheduler, snapshot.strings('scheduler_state'), stage.tolist())
+        return cls(
+            stage,
+            np.frombuffer(snapshot.last_day, dtype=np.int32),
+            np.frombuffer(snapshot.failed_count, dtype=np.uint32),
+            np.frombuffer(snapshot.due_day, dtype=np.int32),
+            states,
+            np.frombuffer(snapshot.flags, dtype=np.uint8) & DeckSnapshot.FLAG_SUSPENDED
+        )
+
+    def set_row(self, index: int, word: Dict, scheduler=None):
+        """Refresh one row from its dictionary"""
+        self.stage[index] = word.get('srs_stage', 0)
+        self.last_day[index] = DeckSnapshot.to_epoch_day(word.get('last_practice_date', ''))
+        self.failed[index] = word.get('failed_count', 0)
+        self.due_day[index] = DeckSnapshot.to_epoch_day(word.get('due_date', ''))
+        self.suspended[index] = bool(word.get('suspended'))
+        if self.state.shape[1]:
+            self.state[index] = scheduler.parse_state(word.get('scheduler_state', ''), word.get('srs_stage', 0))
+
+    def row_updates(self, index: int, scheduler) -> Dict:
+        """Dictionary fields of one row, as written back after an answer
+
+        Due date and state are only included for schedulers that keep state.
+        """
+        updates = {
+            'srs_stage': int(self.stage[index]),
+            'last_practice_date': DeckSnapshot.to_iso_date(int(self.last_day[index])),
+            'failed_count': int(self.failed[index])
+        }
+        if scheduler.STATE_FIELDS:
+            updates['due_date'] = DeckSnapshot.to_iso_date(int(self.due_day[index]))
+            updates['scheduler_state'] = scheduler.format_state(self.state[index])
+        return updates
@@ -1,37 +1,45 @@
 """
-Flashcard data model with Tick-8 SRS support
+Flashcard data model with SRS metadata
 """
 
+from models.dates import to_epoch_day
+
 class Flashcard:
-    """Represents a single flashcard with Tick-8 SRS metadata"""
+    """Represents a single flashcard with SRS metadata"""
     
     MAX_STAGE = 8  # Mastery stage
     
     def __init__(self, data: dict):
         """Initialize flashcard from dictionary"""
-        self.row_index = data['row_index']
+        self.row_index = data['row_index']  # Sheet row when the card was loaded
+        self.id = data.get('id', '')  # Stable card ID (hidden ID column)
+        self.key = self.id or self.row_index  # What the session and outbox track it by
         self.front = data['front']
         self.back = data['back']
         self.last_practice_date = data['last_practice_date']
         self.srs_stage = data.get('srs_stage', 0)  # SRS stage 0-8
         self.failed_count = data.get('failed_count', 0)  # Number of failures
+        self.due_date = data.get('due_date', '')  # Set by interval schedulers
+        self.scheduler_state = data.get('scheduler_state', '')
+        self.suspended = bool(data.get('suspended', False))  # Left out of reviews
         
     def is_new(self) -> bool:
         """Check if this is a new word (never practiced)"""
         return not self.last_practice_date or self.last_practice_date == ''
     
-    def is_due_today(self, today: str) -> bool:
-        """Check if this card is due for review today (Tick-8 method)"""
-        # Mastered cards are not due
-        if self.is_mastered():
-            return False
+    def is_due_today(self, today: str, scheduler) -> bool:
+        """Check if this card is due for review today
         
-        # New cards are always due
-        if self.is_new():
-            return True
-        
-        # In Tick-8, if practiced yesterday or before, it's due today
-        return self.last_practice_date < today
+        scheduler: the services.scheduler.Scheduler of the deck
+        """
+        if self.suspended:
+            return False
+        return scheduler.is_due_values(
+            self.srs_stage,
+            to_epoch_day(self.last_practice_date),
+            to_epoch_day(self.due_date),
+            to_epoch_day(today)
+        )
     
     def is_mastered(self) -> bool:
         """Check if card has reached mastery"""
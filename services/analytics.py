@@ -0,0 +1,264 @@
+"""
+Learning analytics computed from the review log with NumPy
+"""
+
+import os
+from datetime import date
+from typing import Dict, List, Optional
+import numpy as np
+from services.dedup import review_id
+from services.review_log import ReviewLog, CORRECT, SKIPPED
+
+# Matches ReviewLog.RECORD field for field
+RECORD_DTYPE = np.dtype([
+    ('card_id', '<u8'),
+    ('timestamp', '<f8'),
+    ('epoch_day', '<i4'),
+    ('response_ms', '<u4'),
+    ('outcome', 'u1'),
+    ('old_stage', 'u1'),
+    ('new_stage', 'u1'),
+    ('padding', 'V1'),
+])
+assert RECORD_DTYPE.itemsize == ReviewLog.RECORD.size
+
+MAX_STAGE = 8
+
+def _merge_counts(keys: np.ndarray, values: np.ndarray, new_keys: np.ndarray, new_values: np.ndarray):
+    """Add new_values into values by key, returns (sorted keys, summed values)
+
+    values may be 1-D or 2-D (one row per key).
+    """
+    all_keys = np.concatenate([keys, new_keys])
+    all_values = np.concatenate([values, new_values])
+    merged_keys, inverse = np.unique(all_keys, return_inverse=True)
+    if all_values.ndim == 1:
+        return merged_keys, np.bincount(inverse, weights=all_values, minlength=len(merged_keys)).astype(np.int64)
+    columns = [np.bincount(inverse, weights=column, minlength=len(merged_keys)) for column in all_values.T]
+    return merged_keys, np.stack(columns, axis=1).astype(np.int64)
+
+class ReviewAnalytics:
+    """Incrementally maintained aggregates over the review log
+
+    update() folds only records appended since the last call into running
+    totals (per-stage retention, lapses, daily volume, per-card error counts)
+    and persists them, so each session adds milliseconds of work regardless
+    of how long the history is. A compacted log is re-read from scratch.
+    """
+
+    CACHE_FILE = 'config/analytics_cache.npz'
+
+    def __init__(self, review_log: ReviewLog, cache_path: Optional[str] = CACHE_FILE):
+        self.review_log = review_log
+        self.cache_path = cache_path
+        self._card_names = {}
+        self._card_names_key = None
+        self._reset()
+        self._load_cache()
+
+    def _reset(self):
+        self.consumed = 0           # Log records folded in so far
+        self.log_stamp = 0.0        # Log compaction time the totals belong to
+        self.skips = 0
+        self.response_ms_total = 0
+        self.stage_reviews = np.zeros(MAX_STAGE + 1, dtype=np.int64)
+        self.stage_correct = np.zeros(MAX_STAGE + 1, dtype=np.int64)
+        self.days = np.zeros(0, dtype=np.int64)                   # Sorted epoch days
+        self.day_counts = np.zeros(0, dtype=np.int64)             # Answers per day
+        self.card_ids = np.zeros(0, dtype=np.uint64)              # Sorted card ids
+        self.card_counts = np.zeros((0, 2), dtype=np.int64)       # (answers, incorrect)
+
+    def _load_cache(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with np.load(self.cache_path) as cache:
+                self.consumed = int(cache['consumed'])
+                self.log_stamp = float(cache['log_stamp'])
+                self.skips = int(cache['skips'])
+                self.response_ms_total = int(cache['response_ms_total'])
+                self.stage_reviews = cache['stage_reviews']
+                self.stage_correct = cache['stage_correct']
+                self.days = cache['days']
+                self.day_counts = cache['day_counts']
+                self.card_ids = cache['card_ids']
+                self.card_counts = cache['card_counts']
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Warning: Ignoring analytics cache: {str(e)}")
+            self._reset()
+
+    def _save_cache(self):
+        if not self.cache_path:
+            return
+        tmp_path = self.cache_path + '.tmp.npz'  # np.savez appends .npz otherwise
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+            np.savez(
+                tmp_path,
+                consumed=self.consumed,
+                log_stamp=self.log_stamp,
+                skips=self.skips,
+                response_ms_total=self.response_ms_total,
+                stage_reviews=self.stage_reviews,
+                stage_correct=self.stage_correct,
+                days=self.days,
+                day_counts=self.day_counts,
+                card_ids=self.card_ids,
+                card_counts=self.card_counts
+            )
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"Warning: Failed to save analytics cache: {str(e)}")
+
+    def _read_records(self, start: int) -> np.ndarray:
+        """Log records from index start on, as a structured array"""
+        path = self.review_log.path
+        header = ReviewLog.HEADER.size
+        if not os.path.exists(path) or os.path.getsize(path) <= header:
+            return np.zeros(0, dtype=RECORD_DTYPE)
+        total = (os.path.getsize(path) - header) // RECORD_DTYPE.itemsize
+        if total <= start:
+            return np.zeros(0, dtype=RECORD_DTYPE)
+        return np.fromfile(path, dtype=RECORD_DTYPE, count=total - start,
+                           offset=header + start * RECORD_DTYPE.itemsize)
+
+    def update(self) -> int:
+        """Fold records appended since the last update, returns how many"""
+        self.review_log.flush()
+        stamp = self.review_log.last_compacted()
+        if stamp != self.log_stamp or self.review_log.count() < self.consumed:
+            self._reset()
+            self.log_stamp = stamp
+
+        records = self._read_records(self.consumed)
+        if self.review_log.last_compacted() != stamp:
+            # Compacted on another thread while reading, the offsets changed
+            return self.update()
+        if not len(records):
+            return 0
+
+        self._fold(records)
+        self.consumed += len(records)
+        self._save_cache()
+        return len(records)
+
+    def _fold(self, records: np.ndarray):
+        """Add a chunk of records to the running totals"""
+        answered = records[records['outcome'] != SKIPPED]
+        self.skips += len(records) - len(answered)
+        self.response_ms_total += int(answered['response_ms'].sum(dtype=np.int64))
+
+        correct = answered['outcome'] == CORRECT
+        stages = np.minimum(answered['old_stage'], MAX_STAGE)
+        self.stage_reviews += np.bincount(stages, minlength=MAX_STAGE + 1)
+        self.stage_correct += np.bincount(stages[correct], minlength=MAX_STAGE + 1)
+
+        days, counts = np.unique(answered['epoch_day'].astype(np.int64), return_counts=True)
+        self.days, self.day_counts = _merge_counts(self.days, self.day_counts, days, counts)
+
+        ids, inverse = np.unique(answered['card_id'], return_inverse=True)
+        per_card = np.stack([
+            np.bincount(inverse, minlength=len(ids)),
+            np.bincount(inverse[~correct], minlength=len(ids))
+        ], axis=1)
+        self.card_ids, self.card_counts = _merge_counts(self.card_ids, self.card_counts, ids, per_card)
+
+    def answered(self) -> int:
+        return int(self.stage_reviews.sum())
+
+    def retention_by_stage(self) -> List[Optional[float]]:
+        """Share of correct answers per stage before the answer (None without data)"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rates = self.stage_correct / self.stage_reviews
+        return [None if reviews == 0 else float(rate) for rate, reviews in zip(rates, self.stage_reviews)]
+
+    def lapse_rate(self) -> float:
+        """Share of answers on already learned cards (stage > 0) that were wrong"""
+        learned = int(self.stage_reviews[1:].sum())
+        lapses = learned - int(self.stage_correct[1:].sum())
+        return lapses / learned if learned else 0.0
+
+    def streaks(self, today: date) -> Dict:
+        """Current and longest run of consecutive days with reviews"""
+        if not len(self.days):
+            return {'current': 0, 'longest': 0}
+
+        # Runs break wherever consecutive review days are more than a day apart
+        breaks = np.flatnonzero(np.diff(self.days) != 1)
+        starts = np.concatenate([[0], breaks + 1])
+        ends = np.concatenate([breaks, [len(self.days) - 1]])
+        lengths = ends - starts + 1
+
+        # A streak is still alive if the last review was today or yesterday
+        current = int(lengths[-1]) if today.toordinal() - int(self.days[-1]) <= 1 else 0
+        return {'current': current, 'longest': int(lengths.max())}
+
+    def daily_volume(self, today: date, days: int = 30) -> List[Dict]:
+        """Answers per day for the last `days` days, oldest first"""
+        first = today.toordinal() - days + 1
+        counts = np.zeros(days, dtype=np.int64)
+        in_window = (self.days >= first) & (self.days <= today.toordinal())
+        counts[self.days[in_window] - first] = self.day_counts[in_window]
+        return [{'date': date.fromordinal(first + offset).isoformat(), 'reviews': int(count)}
+                for offset, count in enumerate(counts)]
+
+    def hardest_cards(self, limit: int = 10, min_reviews: int = 3) -> List[Dict]:
+        """Cards with the highest error rate among those answered min_reviews times"""
+        reviews = self.card_counts[:, 0]
+        eligible = np.flatnonzero((reviews >= min_reviews) & (self.card_counts[:, 1] > 0))
+        if not len(eligible):
+            return []
+
+        incorrect = self.card_counts[eligible, 1]
+        error_rate = incorrect / reviews[eligible]
+        # Highest error rate first, more failures break ties
+        order = np.lexsort((-incorrect, -error_rate))[:limit]
+        return [{
+            'card_id': int(self.card_ids[eligible[i]]),
+            'reviews': int(reviews[eligible[i]]),
+            'incorrect': int(incorrect[i]),
+            'error_rate': float(error_rate[i])
+        } for i in order]
+
+    def _names_for(self, words: List[Dict]) -> Dict[int, Dict]:
+        """card id -> word, cached for the lifetime of the words list"""
+        key = (id(words), len(words))
+        if key != self._card_names_key:
+            self._card_names = {review_id(word): word for word in words}
+            self._card_names_key = key
+        return self._card_names
+
+    def summary(self, words: Optional[List[Dict]] = None, today: Optional[date] = None,
+                hardest: int = 10) -> Dict:
+        """Fold new log entries and return every statistic
+
+        words: the current deck, used to attach front/back text to hardest cards
+        """
+        self.update()
+        today = today or date.today()
+        answered = self.answered()
+        correct = int(self.stage_correct.sum())
+
+        hardest_cards = self.hardest_cards(hardest)
+        if words:
+            names = self._names_for(words)
+            for card in hardest_cards:
+                word = names.get(card['card_id'])
+                card['front'] = word['front'] if word else ''
+                card['back'] = word['back'] if word else ''
+            hardest_cards = [card for card in hardest_cards if card['front']]
+
+        volume = self.daily_volume(today)
+        return {
+            'total_reviews': answered + self.skips,
+            'answered': answered,
+            'skipped': self.skips,
+            'retention': correct / answered if answered else 0.0,
+            'retention_by_stage': self.retention_by_stage(),
+            'lapse_rate': self.lapse_rate(),
+            'mean_response_ms': self.response_ms_total / answered if answered else 0.0,
+            'reviews_today': volume[-1]['reviews'],
+            'daily_volume': volume,
+            'streak': self.streaks(today),
+            'hardest_cards': hardest_cards
+        }
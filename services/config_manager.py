@@ -2,6 +2,7 @@
 Configuration management
 """
 
+import copy
 import json
 import os
 
@@ -12,7 +13,18 @@ class ConfigManager:
     DEFAULT_CONFIG = {
         'cards_per_session': 20,
         'spreadsheet_id': '',
-        'sheet_gid': ''
+        'sheet_gid': '',
+        'startup_budget_ms': 0,
+        'metrics_enabled': False,
+        'stall_threshold_ms': 0,
+        'profiling_enabled': False,
+        'scheduler': 'tick8',
+        'rapid_mode': False,
+        'theme': 'light',
+        'image_cache_mb': 64,
+        'auto_archive': False,
+        'shard_spreadsheets': [],
+        'shard_max_rows': 50000
     }
     
     def __init__(self):
@@ -24,10 +36,11 @@ class ConfigManager:
         if os.path.exists(self.CONFIG_FILE):
             try:
                 with open(self.CONFIG_FILE, 'r') as f:
-                    return {**self.DEFAULT_CONFIG, **json.load(f)}
+                    return {**copy.deepcopy(self.DEFAULT_CONFIG), **json.load(f)}
             except:
                 pass
-        return self.DEFAULT_CONFIG.copy()
+        # Deep copy, so list defaults aren't shared between configurations
+        return copy.deepcopy(self.DEFAULT_CONFIG)
         
     def save(self):
         """Save configuration to file"""
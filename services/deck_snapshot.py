@@ -0,0 +1,237 @@
+"""
+Compact binary snapshot of the deck for instant cold starts
+"""
+
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from datetime import date
+from typing import List, Dict, Optional
+from models import dates
+from services import metrics
+
+class DeckSnapshot:
+    """Memory-mapped snapshot of fetch_words results
+
+    File layout (little-endian):
+    - Header: magic, version, row count, saved-at timestamp, source key length
+    - Source key (utf-8, identifies spreadsheet + sheet gid)
+    - Fixed-width columns, one value per card, each padded to 8 bytes:
+      row_index (uint32), srs_stage (uint8), failed_count (uint32),
+      last practice epoch-day (int32, -1 when never practiced),
+      due epoch-day (int32, -1 when the scheduler stores none),
+      flags (uint8, FLAG_SUSPENDED)
+    - String offsets (uint32, STRING_FIELDS per card + 1) into the blob
+    - UTF-8 string blob (front, back, last_practice_date, scheduler_state,
+      card ID per card)
+    """
+
+    SNAPSHOT_FILE = 'config/deck_snapshot.bin'
+    MAGIC = b'FTSNAP'
+    VERSION = 4
+    HEADER = struct.Struct('<6sHIdI')
+    STRING_FIELDS = ('front', 'back', 'last_practice_date', 'scheduler_state', 'id')
+    NEVER = dates.NEVER  # Epoch-day value for cards never practiced
+    FLAG_SUSPENDED = 1
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or self.SNAPSHOT_FILE
+        self._file = None
+        self._mmap = None
+        self.source_key = ''
+        self.saved_at = 0.0
+        self.row_count = 0
+        self.row_index = None
+        self.srs_stage = None
+        self.failed_count = None
+        self.last_day = None
+        self.due_day = None
+        self.flags = None
+        self._offsets = None
+        self._blob = None
+
+    @staticmethod
+    def source_key_for(spreadsheet_id: str, sheet_gid: Optional[str]) -> str:
+        """Build the key identifying which sheet a snapshot belongs to"""
+        return f"{spreadsheet_id}:{sheet_gid or ''}"
+
+    @staticmethod
+    def to_epoch_day(date_str: str) -> int:
+        """Convert a YYYY-MM-DD practice date into an epoch-day number"""
+        return dates.to_epoch_day(date_str)
+
+    @staticmethod
+    def to_iso_date(day: int) -> str:
+        """Convert an epoch-day number back into YYYY-MM-DD ('' for NEVER)"""
+        return date.fromordinal(day).isoformat() if day > 0 else ''
+
+    @classmethod
+    @metrics.instrumented('snapshot.save')
+    def save(cls, words: List[Dict], source_key: str, path: Optional[str] = None):
+        """Write words to a snapshot file atomically"""
+        path = path or cls.SNAPSHOT_FILE
+        count = len(words)
+
+        blob = bytearray()
+        offsets = array('I', [0])
+        for word in words:
+            for field in cls.STRING_FIELDS:
+                blob += (word.get(field) or '').encode('utf-8')
+                offsets.append(len(blob))
+
+        columns = [
+            array('I', (word['row_index'] for word in words)),
+            array('B', (min(max(word.get('srs_stage', 0), 0), 255) for word in words)),
+            array('I', (word.get('failed_count', 0) for word in words)),
+            array('i', (cls.to_epoch_day(word.get('last_practice_date', '')) for word in words)),
+            array('i', (cls.to_epoch_day(word.get('due_date', '')) for word in words)),
+            array('B', (cls.FLAG_SUSPENDED if word.get('suspended') else 0 for word in words)),
+            offsets,
+        ]
+
+        key_bytes = source_key.encode('utf-8')
+        tmp_path = path + '.tmp'
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, count, time.time(), len(key_bytes)))
+            f.write(key_bytes)
+            cls._pad(f)
+            for column in columns:
+                if sys.byteorder != 'little':
+                    column.byteswap()
+                column.tofile(f)
+                cls._pad(f)
+            f.write(blob)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _pad(f):
+        """Pad the file position to an 8-byte boundary"""
+        remainder = f.tell() % 8
+        if remainder:
+            f.write(b'\0' * (8 - remainder))
+
+    @metrics.instrumented('snapshot.open')
+    def open(self) -> bool:
+        """Memory-map the snapshot file, returns False if missing or invalid"""
+        self.close()
+        if not os.path.exists(self.path):
+            return False
+
+        try:
+            self._file = open(self.path, 'rb')
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            view = memoryview(self._mmap)
+
+            magic, version, count, saved_at, key_len = self.HEADER.unpack_from(view, 0)
+            if magic != self.MAGIC or version != self.VERSION or sys.byteorder != 'little':
+                self.close()
+                return False
+
+            pos = self.HEADER.size
+            self.source_key = bytes(view[pos:pos + key_len]).decode('utf-8')
+            pos = self._align(pos + key_len)
+
+            self.row_count = count
+            self.saved_at = saved_at
+            self.row_index, pos = self._column(view, pos, 'I', count)
+            self.srs_stage, pos = self._column(view, pos, 'B', count)
+            self.failed_count, pos = self._column(view, pos, 'I', count)
+            self.last_day, pos = self._column(view, pos, 'i', count)
+            self.due_day, pos = self._column(view, pos, 'i', count)
+            self.flags, pos = self._column(view, pos, 'B', count)
+            self._offsets, pos = self._column(view, pos, 'I', count * len(self.STRING_FIELDS) + 1)
+            self._blob = view[pos:pos + self._offsets[-1]]
+            return True
+        except (OSError, ValueError, struct.error, UnicodeDecodeError, IndexError):
+            self.close()
+            return False
+
+    @staticmethod
+    def _align(pos: int) -> int:
+        return (pos + 7) & ~7
+
+    def _column(self, view, pos: int, typecode: str, count: int):
+        """Slice a fixed-width column out of the mapped file"""
+        size = array(typecode).itemsize * count
+        column = view[pos:pos + size].cast(typecode)
+        return column, self._align(pos + size)
+
+    def close(self):
+        """Release the memory map"""
+        for name in ('row_index', 'srs_stage', 'failed_count', 'last_day', 'due_day', 'flags', '_offsets', '_blob'):
+            column = getattr(self, name)
+            if column is not None:
+                column.release()
+                setattr(self, name, None)
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.row_count = 0
+
+    def is_open(self) -> bool:
+        """Check if a snapshot is currently mapped"""
+        return self._mmap is not None
+
+    def word_count(self) -> int:
+        """Number of cards in the snapshot"""
+        return self.row_count
+
+    def due_count(self, today: str, scheduler=None) -> int:
+        """Count cards due today straight from the mapped columns
+
+        scheduler: services.scheduler.Scheduler deciding what is due, Tick-8 if None
+        """
+        if not self.is_open():
+            return 0
+        today_day = self.to_epoch_day(today)
+        suspended = self.FLAG_SUSPENDED
+        if scheduler is None or scheduler.name == 'tick8':
+            max_stage = 8
+            return sum(1 for stage, day, flags in zip(self.srs_stage, self.last_day, self.flags)
+                       if stage < max_stage and day < today_day and not flags & suspended)
+        is_due = scheduler.is_due_values
+        return sum(1 for stage, day, due, flags in zip(self.srs_stage, self.last_day, self.due_day, self.flags)
+                   if not flags & suspended and is_due(stage, day, due, today_day))
+
+    def _string(self, index: int) -> str:
+        start = self._offsets[index]
+        end = self._offsets[index + 1]
+        return bytes(self._blob[start:end]).decode('utf-8')
+
+    def strings(self, field: str) -> List[str]:
+        """One STRING_FIELDS value for every card"""
+        if not self.is_open():
+            return []
+        field_count = len(self.STRING_FIELDS)
+        first = self.STRING_FIELDS.index(field)
+        return [self._string(i * field_count + first) for i in range(self.row_count)]
+
+    def to_words(self) -> List[Dict]:
+        """Materialize the snapshot into fetch_words-style dictionaries"""
+        if not self.is_open():
+            return []
+
+        field_count = len(self.STRING_FIELDS)
+        words = []
+        for i in range(self.row_count):
+            base = i * field_count
+            words.append({
+                'row_index': self.row_index[i],
+                'front': self._string(base),
+                'back': self._string(base + 1),
+                'last_practice_date': self._string(base + 2),
+                'srs_stage': self.srs_stage[i],
+                'failed_count': self.failed_count[i],
+                'due_date': self.to_iso_date(self.due_day[i]),
+                'scheduler_state': self._string(base + 3),
+                'suspended': bool(self.flags[i] & self.FLAG_SUSPENDED),
+                'id': self._string(base + 4)
+            })
+        return words
@@ -0,0 +1,91 @@
+"""
+Hash-indexed duplicate detection for flashcards
+"""
+
+import hashlib
+import unicodedata
+from typing import Dict, List, Optional
+
+def normalize_text(text: str) -> str:
+    """Normalize card text for comparison
+
+    Applies Unicode NFKC normalization, casefolding and whitespace collapsing,
+    so "Café", "café" and "  CAFÉ " all compare equal.
+    """
+    text = unicodedata.normalize('NFKC', text or '')
+    return ' '.join(text.casefold().split())
+
+def card_key(front: str, back: str) -> bytes:
+    """Fixed-size hash of a card's normalized front and back"""
+    normalized = f"{normalize_text(front)}\x1f{normalize_text(back)}"
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).digest()
+
+def card_id(front: str, back: str) -> int:
+    """Stable 64-bit card identifier derived from the card's normalized text"""
+    return int.from_bytes(card_key(front, back)[:8], 'little')
+
+def review_id(word: Dict) -> int:
+    """64-bit key of a card's review history, kept through edits of its text
+
+    The card's sheet ID as a number, card_id() of its text if it has none.
+    New sheet IDs are card_id() in hex, so history logged before a card got
+    its ID stays with it.
+    """
+    if word.get('id'):
+        try:
+            return int(word['id'], 16) & 0xFFFFFFFFFFFFFFFF
+        except ValueError:  # Edited by hand
+            return card_id(word['id'], '')
+    return card_id(word['front'], word['back'])
+
+class DuplicateIndex:
+    """Incrementally built index from normalized card text to sheet rows
+
+    Each add() is a single dict lookup, so finding every duplicate in a deck
+    is O(n) instead of comparing cards pairwise.
+    """
+
+    def __init__(self):
+        self._first_row: Dict[bytes, int] = {}   # key -> first row with that card
+        self._duplicates: Dict[bytes, List[int]] = {}  # key -> later duplicate rows
+
+    def __len__(self) -> int:
+        return len(self._first_row)
+
+    def add(self, front: str, back: str, row_index: Optional[int] = None) -> Optional[int]:
+        """Add a card, returns the row of the existing card if it is a duplicate
+
+        Cards without a row (e.g. rows being imported) are indexed with -1.
+        """
+        key = card_key(front, back)
+        existing = self._first_row.get(key)
+        if existing is None:
+            self._first_row[key] = row_index if row_index is not None else -1
+            return None
+
+        if row_index is not None:
+            self._duplicates.setdefault(key, []).append(row_index)
+        return existing
+
+    def add_words(self, words: List[Dict]):
+        """Index fetch_words-style dictionaries"""
+        for word in words:
+            self.add(word['front'], word['back'], word['row_index'])
+
+    def contains(self, front: str, back: str) -> bool:
+        """Check if an equivalent card is already indexed"""
+        return card_key(front, back) in self._first_row
+
+    def duplicate_groups(self) -> List[List[int]]:
+        """Rows of each duplicated card, first occurrence first"""
+        return [[self._first_row[key]] + rows for key, rows in self._duplicates.items()]
+
+    def duplicate_count(self) -> int:
+        """Number of redundant rows (excluding each first occurrence)"""
+        return sum(len(rows) for rows in self._duplicates.values())
+
+    @classmethod
+    def from_words(cls, words: List[Dict]) -> 'DuplicateIndex':
+        index = cls()
+        index.add_words(words)
+        return index
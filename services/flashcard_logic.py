@@ -1,40 +1,414 @@
 """
-Flashcard selection and session management logic with Tick-8 SRS
+Flashcard selection and session management logic with pluggable SRS schedulers
 """
 
-from datetime import datetime
-from typing import List, Dict, Optional, Set
+from bisect import bisect_left
+from collections import deque
+from datetime import date
+from typing import Callable, Iterable, List, Dict, Optional, Set
 from models.flashcard import Flashcard
+from services.dedup import DuplicateIndex, review_id
+from services.review_log import ReviewLog, CORRECT, INCORRECT, SKIPPED
+from services.scheduler import Scheduler, get_scheduler
+from services.outbox import Outbox
+from services.google_sheets import GoogleSheetsService
+from services import metrics
 
 class FlashcardManager:
-    """Manages flashcard selection and practice sessions with Tick-8 SRS"""
+    """Manages flashcard selection and practice sessions
+    
+    Due checks, priorities and answer transitions are delegated to the
+    configured scheduler (Tick-8 by default), which works on a column copy
+    of the deck built on first use.
+    """
     
     MAX_STAGE = 8
+    BULK_CHUNK = 2000  # Cards changed between progress reports of a bulk operation
+    UNDO_LIMIT = 20    # Bulk operations that can be undone
+    ARCHIVE_MIN_CARDS = 100    # Retired cards worth an automatic archive run...
+    ARCHIVE_MIN_FRACTION = 10  # ...and at least 1/N of the deck
     
-    def __init__(self, words_data: List[Dict], sheets_service, config):
-        """Initialize the flashcard manager"""
+    def __init__(self, words_data: List[Dict], sheets_service, config, review_log: Optional[ReviewLog] = None,
+                 outbox: Optional[Outbox] = None):
+        """Initialize the flashcard manager
+
+        review_log: optional log every answer and skip is appended to
+        outbox: optional write-behind queue; answers are then queued there
+                instead of written to the sheet immediately
+        """
         self.words_data = words_data
         self.sheets_service = sheets_service
         self.config = config
+        self.review_log = review_log
+        self.outbox = outbox
+        self.scheduler: Scheduler = get_scheduler(config.get('scheduler'))
+        self._deck = None       # DeckColumns of words_data
+        self._positions = {}    # Card key (GoogleSheetsService.cell_key) -> index in words_data
+        self._search_index = None  # TrigramIndex of words_data, keyed by position
+        self.layout_version = 0    # Bumped whenever cards are removed or change position
         self.session_cards = []
         self.current_index = 0
         self.session_size = 0
         self.session_stats = {'correct': 0, 'incorrect': 0, 'skipped': 0}
         self.session_active = False
         self.seen_card_ids = set()  # Track which cards have been SEEN (shown to user)
+        self._undo = deque(maxlen=self.UNDO_LIMIT)  # (label, {card key: previous fields})
+        
+    def set_scheduler(self, name: str):
+        """Switch to another scheduler (see services.scheduler.SCHEDULERS)"""
+        self.scheduler = get_scheduler(name)
+        self._deck = None
+    
+    def deck_columns(self):
+        """Column copy of the deck for the scheduler's batch methods"""
+        if self._deck is None or len(self._deck) != len(self.words_data):
+            from models.deck import DeckColumns
+            self._deck = DeckColumns.from_words(self.words_data, self.scheduler)
+            key = GoogleSheetsService.cell_key
+            self._positions = {key(word): i for i, word in enumerate(self.words_data)}
+        return self._deck
+    
+    def search_index(self):
+        """Trigram index over the front and back of every card, built on first use
+        
+        Cards appended to words_data since are indexed incrementally.
+        """
+        from services.search_index import TrigramIndex
         
+        indexed = len(self._search_index) if self._search_index is not None else 0
+        if self._search_index is None or indexed > len(self.words_data):
+            self._search_index = TrigramIndex.from_words(self.words_data)
+        elif indexed < len(self.words_data):
+            self._search_index.add_many(
+                (i, TrigramIndex.card_text(word)) for i, word in enumerate(self.words_data[indexed:], indexed)
+            )
+        return self._search_index
+    
+    def has_search_index(self) -> bool:
+        return self._search_index is not None
+    
+    def install_search_index(self, index, layout_version: int):
+        """Keep an index built elsewhere (e.g. on a worker) from a copy of words_data
+        
+        layout_version: the manager's layout_version when the copy was made.
+        The index is dropped if cards were removed or moved since; cards
+        appended since are indexed by search_index().
+        """
+        if layout_version == self.layout_version and self._search_index is None:
+            self._search_index = index
+    
+    @metrics.instrumented('manager.get_due_cards_count')
     def get_due_cards_count(self) -> int:
         """Get count of cards due for review today"""
-        today = datetime.now().strftime('%Y-%m-%d')
-        due_count = sum(1 for word in self.words_data 
-                       if self._is_card_due(word, today))
-        return due_count
+        today = date.today().toordinal()
+        return int(self.scheduler.review_mask(self.deck_columns(), today).sum())
+    
+    def get_deck_stats(self) -> Dict:
+        """Get deck-wide statistics (totals and SRS stage distribution)"""
+        stage_counts = [0] * (self.MAX_STAGE + 1)
+        new_count = 0
+        
+        for word in self.words_data:
+            stage = min(max(word.get('srs_stage', 0), 0), self.MAX_STAGE)
+            stage_counts[stage] += 1
+            if not word.get('last_practice_date'):
+                new_count += 1
+        
+        return {
+            'date': date.today().isoformat(),
+            'total_cards': len(self.words_data),
+            'new': new_count,
+            'due': self.get_due_cards_count(),
+            'mastered': stage_counts[self.MAX_STAGE],
+            'stage_counts': stage_counts
+        }
+    
+    def find_duplicates(self) -> List[List[Dict]]:
+        """Group cards with the same normalized front and back (O(n))"""
+        index = DuplicateIndex.from_words(self.words_data)
+        by_row = {word['row_index']: word for word in self.words_data}
+        return [[by_row[row] for row in group] for group in index.duplicate_groups()]
+    
+    @metrics.instrumented('manager.merge_duplicates')
+    def merge_duplicates(self) -> int:
+        """Keep the most advanced card of each duplicate group and delete the rest
+        
+        Failure counts of removed cards are added to the kept card. Returns the
+        number of rows removed. Must not be called during an active session.
+        """
+        # Rows are deleted by number, follow any moved in the sheet first
+        self.refresh_rows()
+        groups = self.find_duplicates()
+        if not groups:
+            return 0
+        
+        # Write queued answers before the rows of their cards are deleted
+        if self.outbox is not None:
+            self.outbox.flush(self.sheets_service)
+        
+        removed_rows = []
+        failed_updates = {}
+        for group in groups:
+            keeper = max(group, key=lambda w: (w.get('srs_stage', 0), w.get('last_practice_date', ''), -w['row_index']))
+            extra_failed = sum(w.get('failed_count', 0) for w in group if w is not keeper)
+            if extra_failed:
+                keeper['failed_count'] = keeper.get('failed_count', 0) + extra_failed
+                failed_updates[(keeper['row_index'], 5)] = keeper['failed_count']
+            removed_rows.extend(w['row_index'] for w in group if w is not keeper)
+        
+        # Update kept cards before deleting, while row numbers are still valid
+        self.sheets_service.update_cells(failed_updates)
+        self.sheets_service.delete_rows(removed_rows)
+        self._drop_rows(removed_rows)
+        
+        return len(removed_rows)
+    
+    def _drop_rows(self, removed_rows: List[int], removed_keys=None):
+        """Remove deleted rows locally, shifting row numbers the same way the sheet did
+        
+        removed_keys: card keys of the removed cards, to find them by key
+        instead of by row
+        """
+        removed_rows = sorted(removed_rows)
+        removed = set(removed_rows)
+        row_base = self.sheets_service.row_base
+        key = GoogleSheetsService.cell_key
+        remaining = []
+        for word in self.words_data:
+            row = word['row_index']
+            if (row in removed) if removed_keys is None else (key(word) in removed_keys):
+                continue
+            word['row_index'] -= bisect_left(removed_rows, row) - bisect_left(removed_rows, row_base(row))
+            remaining.append(word)
+        self._set_words(remaining)
+    
+    def _set_words(self, words: List[Dict]):
+        """Replace the cards of words_data in place, positions of cards change"""
+        self.words_data[:] = words
+        self._deck = None
+        self._search_index = None
+        self.layout_version += 1
+    
+    @metrics.instrumented('manager.refresh_rows')
+    def refresh_rows(self) -> Dict:
+        """Follow cards to their current rows without reloading the deck
+        
+        Reads only the sheet's ID column. Cards whose ID left the sheet are
+        dropped, with their queued cells; other cards keep their position, so
+        the column copy and search index stay valid when rows were only
+        inserted, moved or sorted.
+        Returns counts of cards moved and removed, and of IDs in the sheet
+        not in the deck (cards added there, picked up by the next full fetch).
+        """
+        rows = self.sheets_service.fetch_row_map()
+        moved = 0
+        remaining = []
+        for word in self.words_data:
+            row = rows.get(word.get('id'))
+            if row is None and word.get('id'):
+                continue
+            if row is not None and row != word['row_index']:
+                word['row_index'] = row
+                moved += 1
+            remaining.append(word)
+        
+        removed = len(self.words_data) - len(remaining)
+        if removed:
+            self._set_words(remaining)
+            if self.outbox is not None:
+                self.outbox.discard_missing(remaining)
+        known = sum(1 for word in remaining if word.get('id'))
+        return {'moved': moved, 'removed': removed, 'added': len(rows) - known}
+    
+    # Archive
+    
+    def retired_positions(self) -> List[int]:
+        """Positions of the cards the scheduler never shows again"""
+        import numpy as np
+        return np.flatnonzero(self.scheduler.retired_mask(self.deck_columns())).tolist()
+    
+    def should_archive(self) -> bool:
+        """Whether enough retired cards piled up for an archive run to pay off"""
+        retired = len(self.retired_positions())
+        return retired >= max(self.ARCHIVE_MIN_CARDS, len(self.words_data) // self.ARCHIVE_MIN_FRACTION)
+    
+    @metrics.instrumented('manager.archive_retired')
+    def archive_retired(self) -> int:
+        """Move the cards the scheduler never shows again to the archive worksheet
+        
+        Returns the number of cards archived. Must not be called during an
+        active session. The GUI runs the three steps separately, the sheet
+        I/O of archive_planned() on a worker.
+        """
+        # Rows shift by the deleted row numbers, follow any moved in the sheet first
+        self.refresh_rows()
+        archived = self.archive_planned(self.plan_archive())
+        self.apply_archived(archived)
+        return len(archived)
+    
+    def plan_archive(self) -> List[Dict]:
+        """Copies of the retired cards, to pass to archive_planned()"""
+        return [dict(self.words_data[i]) for i in self.retired_positions()]
+    
+    @metrics.instrumented('manager.archive_planned')
+    def archive_planned(self, planned: List[Dict]) -> List[Dict]:
+        """Move planned cards to the archive worksheet, without touching the local deck
+        
+        Only sheet I/O, so it can run on a worker while the GUI thread reads
+        the deck. Cards are moved from the rows their IDs are in now; cards
+        no longer in the sheet are skipped. Returns the cards archived, each
+        with the row it was deleted from, for apply_archived().
+        """
+        if not planned:
+            return []
+        # Write queued answers before their rows move to the archive
+        if self.outbox is not None:
+            self.outbox.flush(self.sheets_service)
+        
+        rows = self.sheets_service.fetch_row_map() if any(word.get('id') for word in planned) else {}
+        archived = []
+        for word in planned:
+            if word.get('id'):
+                if word['id'] not in rows:
+                    continue
+                word['row_index'] = rows[word['id']]
+            archived.append(word)
+        if archived:
+            self.sheets_service.archive_rows(archived)
+        return archived
+    
+    def apply_archived(self, archived: List[Dict]):
+        """Drop cards archive_planned() moved from the local deck"""
+        if archived:
+            key = GoogleSheetsService.cell_key
+            self._drop_rows([word['row_index'] for word in archived], {key(word) for word in archived})
     
-    def _is_card_due(self, word: Dict, today: str) -> bool:
-        """Check if a card is due for review"""
-        temp_card = Flashcard(word)
-        return temp_card.is_due_today(today)
+    @metrics.instrumented('manager.restore_archived')
+    def restore_archived(self, query: str = '', reset: bool = False) -> int:
+        """Move archived cards whose front or back contains query back into the deck
         
+        reset: restore them as stage 0 cards to learn again, instead of as they were
+        Returns the number of cards restored; they are appended to the deck.
+        """
+        query = query.strip().casefold()
+        restored = [word for word in self.sheets_service.fetch_archive()
+                    if query in word['front'].casefold() or query in word['back'].casefold()]
+        if not restored:
+            return 0
+        if reset:
+            for word in restored:
+                word.update(srs_stage=0, due_date='', scheduler_state='')
+        
+        # Queued answers address rows by number, write them before reloading
+        if self.outbox is not None:
+            self.outbox.flush(self.sheets_service)
+        
+        self.sheets_service.restore_rows(restored)
+        # Rows are appended after any blank rows, and a sharded deck appends
+        # to several worksheets, so take the row numbers from the sheet
+        self._set_words(self.sheets_service.fetch_words())
+        return len(restored)
+        
+    # Bulk operations
+    
+    def reset_stage(self, positions: Iterable[int], progress: Callable = None) -> int:
+        """Put cards back to stage 0, keeping their history"""
+        return self.set_stage(positions, 0, progress, label="Reset Stage")
+    
+    def set_stage(self, positions: Iterable[int], stage: int, progress: Callable = None,
+                  label: str = None) -> int:
+        """Move cards to an SRS stage
+        
+        Schedulers that keep state restart it from the new stage.
+        """
+        stage = min(max(int(stage), 0), self.MAX_STAGE)
+        changes = {'srs_stage': stage}
+        if self.scheduler.STATE_FIELDS:
+            changes.update(due_date='', scheduler_state='')
+        return self.bulk_update(positions, changes, label or f"Set Stage {stage}", progress)
+    
+    def clear_history(self, positions: Iterable[int], progress: Callable = None) -> int:
+        """Make cards new again: stage 0, never practiced, no failures"""
+        changes = {'srs_stage': 0, 'last_practice_date': '', 'failed_count': 0}
+        if self.scheduler.STATE_FIELDS:
+            changes.update(due_date='', scheduler_state='')
+        return self.bulk_update(positions, changes, "Clear History", progress)
+    
+    def set_suspended(self, positions: Iterable[int], suspended: bool, progress: Callable = None) -> int:
+        """Leave cards out of reviews, or bring them back"""
+        return self.bulk_update(positions, {'suspended': bool(suspended)},
+                                "Suspend" if suspended else "Unsuspend", progress)
+    
+    @metrics.instrumented('manager.bulk_update')
+    def bulk_update(self, positions: Iterable[int], changes: Dict, label: str,
+                    progress: Callable = None) -> int:
+        """Apply the same field changes to many cards at once
+        
+        positions: indices in words_data
+        progress: optional callback(done, total), called every BULK_CHUNK cards
+        Returns the number of cards that changed. The operation can be
+        undone with undo_bulk().
+        """
+        return self._apply_rows({position: changes for position in dict.fromkeys(positions)}, label, progress)
+    
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+    
+    def undo_label(self) -> Optional[str]:
+        """Name of the bulk operation undo_bulk() reverts, None if there is none"""
+        return self._undo[-1][0] if self._undo else None
+    
+    @metrics.instrumented('manager.undo_bulk')
+    def undo_bulk(self, progress: Callable = None) -> int:
+        """Restore the cards changed by the last bulk operation"""
+        if not self._undo:
+            return 0
+        label, previous = self._undo.pop()
+        key = GoogleSheetsService.cell_key
+        positions = {key(word): i for i, word in enumerate(self.words_data)}
+        rows = {positions[card]: fields for card, fields in previous.items() if card in positions}
+        return self._apply_rows(rows, None, progress)
+    
+    def _apply_rows(self, rows: Dict[int, Dict], label: Optional[str], progress: Callable = None) -> int:
+        """Apply per-card field changes locally, then write them in one batch
+        
+        rows: position in words_data -> changed fields
+        label: records an undo entry under this name, None for no entry
+        """
+        # Cards of an active session were chosen from the old values
+        if self.session_active:
+            self.end_session()
+        
+        deck = self._deck if self._deck is not None and len(self._deck) == len(self.words_data) else None
+        previous = {}
+        cells = {}
+        total = len(rows)
+        for done, (position, changes) in enumerate(rows.items(), 1):
+            word = self.words_data[position]
+            changed = {field: value for field, value in changes.items() if word.get(field) != value}
+            if changed:
+                key = GoogleSheetsService.cell_key(word)
+                previous[key] = {field: word.get(field) for field in changed}
+                word.update(changed)
+                cells.update(GoogleSheetsService.stat_cells(key, changed))
+                if deck is not None:
+                    deck.set_row(position, word, self.scheduler)
+            if progress is not None and (done % self.BULK_CHUNK == 0 or done == total):
+                progress(done, total)
+        
+        if label is not None and previous:
+            self._undo.append((label, previous))
+        
+        # Queue the cells for the next flush, or write them now in one batch
+        if self.outbox is not None:
+            self.outbox.put(cells)
+        elif self.sheets_service is not None:
+            unwritten = self.sheets_service.update_card_cells(cells)
+            if unwritten:
+                raise Exception(f"Failed to update {len(unwritten)} cells of cards no longer in the sheet")
+        return len(previous)
+    
+    @metrics.instrumented('manager.start_new_session')
     def start_new_session(self, force_new=False):
         """Start a new practice session or resume existing one"""
         if self.session_active and not force_new and self.has_next_card():
@@ -53,59 +427,19 @@ class FlashcardManager:
         self.session_size = len(self.session_cards)
         self.session_active = True
         
+    @metrics.instrumented('manager.select_cards')
     def _select_cards(self) -> List[Dict]:
-        """Select cards due for review based on Tick-8 SRS"""
-        today = datetime.now().strftime('%Y-%m-%d')
-        
-        # Filter to only cards due today
-        due_cards = [word for word in self.words_data 
-                    if self._is_card_due(word, today)]
-        
-        if not due_cards:
-            return []
-        
-        # Prioritize by:
-        # 1. Failed cards with failures (stage 0 + has been practiced before)
-        # 2. New failed cards (stage 0 + never practiced)
-        # 3. Lower stages (less progress)
-        # 4. Failed count (more failures = higher priority)
-        for word in due_cards:
-            stage = word.get('srs_stage', 0)
-            failed = word.get('failed_count', 0)
-            is_new = not word.get('last_practice_date')
-            
-            # Priority score
-            priority = 0
-            
-            # FIXED LOGIC:
-            if stage == 0 and not is_new:
-                # Failed cards (practiced before, now at stage 0)
-                priority += 2000  # HIGHEST priority
-            elif stage == 0 and is_new:
-                # New cards (never practiced)
-                priority += 1000  # Second priority
-            else:
-                # Cards in progress (stages 1-7)
-                priority += (10 - stage) * 10  # Lower stages = higher priority
-            
-            # Add bonus for more failures
-            priority += failed * 50  # Increased weight for failed cards
-            
-            word['priority_score'] = priority
-        
-        # Sort by priority
-        sorted_cards = sorted(due_cards, key=lambda x: x['priority_score'], reverse=True)
-        
-        # Take up to batch size
+        """Select the due cards with the highest scheduler priority"""
         cards_per_session = self.config.get('cards_per_session', 20)
-        return sorted_cards[:min(cards_per_session, len(sorted_cards))]
+        selected = self.scheduler.select(self.deck_columns(), date.today().toordinal(), cards_per_session)
+        return [self.words_data[i] for i in selected]
         
     def get_current_card(self) -> Optional[Flashcard]:
         """Get the current flashcard"""
         if 0 <= self.current_index < len(self.session_cards):
             card = self.session_cards[self.current_index]
             # Mark as seen when retrieved
-            self.seen_card_ids.add(card.row_index)
+            self.seen_card_ids.add(card.key)
             return card
         return None
         
@@ -122,47 +456,80 @@ class FlashcardManager:
         """Move to the next card"""
         self.current_index += 1
         
-    def skip_card(self):
+    def peek_next_card(self) -> Optional[Flashcard]:
+        """The card after the current one, without marking it as seen"""
+        if not self.has_next_card() or self.current_index + 1 >= len(self.session_cards):
+            return None
+        return self.session_cards[self.current_index + 1]
+    
+    def upcoming_cards(self, count: int) -> List[Flashcard]:
+        """Up to count cards after the current one, e.g. to preload their images"""
+        if not self.has_next_card():
+            return []
+        return self.session_cards[self.current_index + 1:self.current_index + 1 + count]
+        
+    @metrics.instrumented('manager.skip_card')
+    def skip_card(self, response_ms: int = 0):
         """Skip the current card (counts toward batch size)"""
         card = self.get_current_card()
         if card:
             self.session_stats['skipped'] += 1
+            self._log_review(card, SKIPPED, card.srs_stage, response_ms)
             self.next_card()
         
-    def record_answer(self, is_correct: bool):
-        """Record user's answer and update SRS data"""
+    @metrics.instrumented('manager.record_answer')
+    def record_answer(self, is_correct: bool, response_ms: int = 0):
+        """Record user's answer and update SRS data
+        
+        response_ms: time from showing the card to revealing its back
+        """
         card = self.get_current_card()
         if not card:
             return
         
+        # A card no longer in the deck (e.g. merged away) is neither counted nor saved
+        deck = self.deck_columns()
+        position = self._positions.get(card.key)
+        if position is None:
+            return
+        
         if is_correct:
             self.session_stats['correct'] += 1
         else:
             self.session_stats['incorrect'] += 1
         
-        if is_correct:
-            new_stage = min(card.srs_stage + 1, self.MAX_STAGE)
-        else:
-            new_stage = 0  # Reset to beginning on wrong answer
+        # Let the scheduler move the card's row, then copy it back to the word
+        self.scheduler.answer_batch(deck, [position], [is_correct], date.today().toordinal())
+        updates = deck.row_updates(position, self.scheduler)
+        new_stage = updates['srs_stage']
+        
+        self._log_review(card, CORRECT if is_correct else INCORRECT, new_stage, response_ms)
         
-        # Update Google Sheets
-        self.sheets_service.update_word_stats(
-            card.row_index,
-            is_correct,
-            new_stage
-        )
+        # Update Google Sheets, or queue the changed cells for the next flush
+        if self.outbox is not None:
+            self.outbox.put(GoogleSheetsService.stat_cells(card.key, updates))
+        else:
+            self.sheets_service.update_word_stats(
+                self.words_data[position]['row_index'],
+                is_correct,
+                new_stage,
+                updates.get('due_date'),
+                updates.get('scheduler_state')
+            )
         
         # Update local data
-        for word in self.words_data:
-            if word['row_index'] == card.row_index:
-                word['last_practice_date'] = datetime.now().strftime('%Y-%m-%d')
-                word['srs_stage'] = new_stage
-                if not is_correct:
-                    word['failed_count'] += 1
-                break
+        self.words_data[position].update(updates)
+            
+    def _log_review(self, card: Flashcard, outcome: int, new_stage: int, response_ms: int):
+        """Append a review to the review log, if one is attached"""
+        if self.review_log is not None:
+            key = review_id({'id': card.id, 'front': card.front, 'back': card.back})
+            self.review_log.append(key, outcome, card.srs_stage, new_stage, response_ms)
             
     def end_session(self):
         """Mark session as complete"""
+        if self.review_log is not None:
+            self.review_log.flush()
         self.session_active = False
         self.session_cards = []
         self.current_index = 0
@@ -0,0 +1,100 @@
+"""
+Due-load forecasting with a vectorized scheduler simulation
+"""
+
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from models.deck import DeckColumns
+from services.scheduler import Scheduler, get_scheduler
+
+MAX_STAGE = 8
+DEFAULT_PASS_RATE = 0.85
+DEFAULT_SECONDS_PER_REVIEW = 8.0
+ANSWER_SECONDS = 3.0     # Reveal-to-answer time, not recorded in the review log
+CAPACITY_WINDOW_DAYS = 14
+
+class DueForecaster:
+    """Projects daily due counts and review time
+
+    Each simulated day the scheduler decides which cards are due. The user
+    reviews up to daily_capacity of them in the scheduler's priority order;
+    each review passes with the observed pass rate of the card's stage and
+    is applied with the scheduler's batch answer transition.
+    """
+
+    def __init__(self, pass_rates: Optional[Sequence[Optional[float]]] = None,
+                 seconds_per_review: float = DEFAULT_SECONDS_PER_REVIEW,
+                 daily_capacity: Optional[int] = None, seed: int = 0,
+                 scheduler: Optional[Scheduler] = None):
+        """Initialize the forecaster
+
+        pass_rates: pass probability per stage 0-8, None entries use the default
+        daily_capacity: reviews per day, None reviews every due card
+        scheduler: algorithm to simulate, Tick-8 if None
+        """
+        rates = list(pass_rates or [])
+        rates += [None] * (MAX_STAGE + 1 - len(rates))
+        self.pass_rates = np.array([DEFAULT_PASS_RATE if rate is None else rate
+                                    for rate in rates[:MAX_STAGE + 1]])
+        self.seconds_per_review = seconds_per_review
+        self.daily_capacity = daily_capacity
+        self.seed = seed
+        self.scheduler = scheduler or get_scheduler()
+
+    def forecast(self, deck: DeckColumns, days: int = 30, today: Optional[date] = None) -> List[Dict]:
+        """Per-day due count, reviews, backlog and expected minutes, starting today"""
+        today = today or date.today()
+        rng = np.random.default_rng(self.seed)
+        deck = deck.copy()
+        scheduler = self.scheduler
+
+        results = []
+        for offset in range(days):
+            day = today.toordinal() + offset
+            due = np.flatnonzero(scheduler.review_mask(deck, day))
+            due_count = len(due)
+
+            reviewed = due
+            if self.daily_capacity is not None and due_count > self.daily_capacity:
+                score = scheduler.priorities(deck, day)[due]
+                top = np.argpartition(-score, self.daily_capacity - 1)[:self.daily_capacity]
+                reviewed = due[top]
+
+            stage = np.minimum(deck.stage[reviewed], MAX_STAGE)
+            passed = rng.random(len(reviewed)) < self.pass_rates[stage]
+            scheduler.answer_batch(deck, reviewed, passed, day)
+
+            results.append({
+                'date': (today + timedelta(days=offset)).isoformat(),
+                'due': due_count,
+                'reviews': len(reviewed),
+                'backlog': due_count - len(reviewed),
+                'minutes': len(reviewed) * self.seconds_per_review / 60,
+                'mastered': int(np.count_nonzero(deck.stage >= MAX_STAGE))
+            })
+        return results
+
+def forecaster_from_history(summary: Optional[Dict], cards_per_session: int,
+                            scheduler: Optional[Scheduler] = None) -> DueForecaster:
+    """Forecaster calibrated with ReviewAnalytics.summary() results
+
+    Pass rates come from observed retention per stage, review time from the
+    mean response time and capacity from the average volume of recent days
+    with reviews, falling back to one session a day without history.
+    """
+    if not summary or not summary['answered']:
+        return DueForecaster(daily_capacity=cards_per_session, scheduler=scheduler)
+
+    recent = [day['reviews'] for day in summary['daily_volume'][-CAPACITY_WINDOW_DAYS:] if day['reviews']]
+    capacity = round(sum(recent) / len(recent)) if recent else cards_per_session
+    return DueForecaster(
+        pass_rates=summary['retention_by_stage'],
+        seconds_per_review=summary['mean_response_ms'] / 1000 + ANSWER_SECONDS,
+        daily_capacity=max(capacity, 1),
+        scheduler=scheduler
+    )
+
+def peak_day(forecast: List[Dict]) -> Optional[Dict]:
+    """The forecast day with the most due cards"""
+    return max(forecast, key=lambda day: day['due']) if forecast else None
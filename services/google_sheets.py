@@ -2,10 +2,17 @@
 Google Sheets integration service with Tick-8 SRS support
 """
 
-import gspread
-from google.oauth2.service_account import Credentials
 from datetime import datetime
 from typing import List, Dict, Optional
+from services.dedup import DuplicateIndex, card_id
+from services import metrics
+
+class PartialAppendError(Exception):
+    """An append that wrote some of its rows; rows holds the ones not written"""
+
+    def __init__(self, message: str, rows: List[List]):
+        super().__init__(message)
+        self.rows = rows
 
 class GoogleSheetsService:
     """Service for interacting with Google Sheets"""
@@ -15,18 +22,42 @@ class GoogleSheetsService:
         'https://www.googleapis.com/auth/drive'
     ]
     
+    MAX_BATCH_REQUESTS = 500  # Requests per spreadsheets.batchUpdate call
+    MAX_BATCH_CELLS = 50000   # Cells per values.batchUpdate call
+    
+    HEADER = ['Front', 'Back', 'Last Practice Date', 'SRS Stage', 'Number of Failed',
+              'Due Date', 'Scheduler State', 'Suspended', 'ID']
+    ID_COLUMN = 9  # Hidden, stable card IDs assigned by assign_ids
+    
+    # Word dictionary fields written back after answers and bulk edits, and their columns
+    STAT_COLUMNS = {'last_practice_date': 3, 'srs_stage': 4, 'failed_count': 5,
+                    'due_date': 6, 'scheduler_state': 7, 'suspended': 8}
+    SUSPENDED_VALUE = 'TRUE'
+    
+    # Mastered cards are moved to "<worksheet title> Archive" with the date they left
+    ARCHIVE_SUFFIX = ' Archive'
+    ARCHIVE_HEADER = HEADER + ['Archived']
+    
     def __init__(self, spreadsheet_id: Optional[str] = None, sheet_gid: Optional[str] = None):
         self.spreadsheet_id = spreadsheet_id
         self.sheet_gid = sheet_gid
         self.client = None
         self.sheet = None
         self.worksheet = None
+        self.worksheet_list = []  # Worksheets of the spreadsheet, listed on connect
+        self.duplicate_index = None  # Built by fetch_words
+        self.ids_labeled = True  # Whether column I has its header, checked by fetch_words
         
         if spreadsheet_id:
             self._connect()
         
+    @metrics.instrumented('sheets.connect')
     def _connect(self):
         """Establish connection to Google Sheets"""
+        # Imported lazily, gspread and google-auth are slow to import
+        import gspread
+        from google.oauth2.service_account import Credentials
+        
         try:
             # Load credentials
             creds = Credentials.from_service_account_file(
@@ -41,21 +72,31 @@ class GoogleSheetsService:
             self.sheet = self.client.open_by_key(self.spreadsheet_id)
             
             # Get specific worksheet by gid (if provided)
+            self.worksheet_list = self.sheet.worksheets()
             if self.sheet_gid:
-                for ws in self.sheet.worksheets():
+                for ws in self.worksheet_list:
                     if str(ws.id) == self.sheet_gid:
                         self.worksheet = ws
                         break
             
             # Fall back to first sheet if gid not found or not provided
-            if not self.worksheet:
-                self.worksheet = self.sheet.get_worksheet(0)
+            if not self.worksheet and self.worksheet_list:
+                self.worksheet = self.worksheet_list[0]
                 
         except FileNotFoundError:
             raise Exception("config/credentials.json file not found. Please follow the setup instructions.")
         except Exception as e:
             raise Exception(f"Failed to connect to Google Sheets: {str(e)}")
     
+    @classmethod
+    def for_worksheet(cls, client, sheet, worksheet) -> 'GoogleSheetsService':
+        """Service for a worksheet of an already opened spreadsheet"""
+        service = cls()
+        service.client = client
+        service.sheet = sheet
+        service.worksheet = worksheet
+        return service
+    
     def connect_to_sheet(self, spreadsheet_id: str, sheet_gid: Optional[str] = None):
         """Connect to a specific Google Sheet"""
         self.spreadsheet_id = spreadsheet_id
@@ -65,7 +106,25 @@ class GoogleSheetsService:
     def is_connected(self) -> bool:
         """Check if connected to a Google Sheet"""
         return self.client is not None and self.worksheet is not None
+    
+    def row_base(self, row_index: int) -> int:
+        """Number the rows of row_index's worksheet start after (0 with a single worksheet)
+        
+        Rows deleted from one worksheet only shift the rows after them in
+        the same worksheet.
+        """
+        return 0
+    
+    def used_rows(self) -> int:
+        """Rows in use up to the last card, header included (not the grid size)"""
+        if not self.is_connected():
+            raise Exception("Not connected to a Google Sheet")
+        try:
+            return len(self.worksheet.col_values(1))
+        except Exception as e:
+            raise Exception(f"Failed to count rows: {str(e)}")
             
+    @metrics.instrumented('sheets.fetch_words')
     def fetch_words(self) -> List[Dict]:
         """Fetch all words from the spreadsheet
         
@@ -75,13 +134,23 @@ class GoogleSheetsService:
         C: Last Practice Date
         D: SRS Stage (0-8)
         E: Number of Failed
+        F: Due Date (interval schedulers only)
+        G: Scheduler State (interval schedulers only)
+        H: Suspended (any value suspends the card)
+        I: ID (written by assign_ids(), hidden)
+        
+        Only reads the sheet: cards without an ID, or with one copied from
+        another card, are returned without one.
         """
         if not self.is_connected():
             raise Exception("Not connected to a Google Sheet")
             
         try:
-            # Get all values (columns A-E)
-            all_values = self.worksheet.get_all_values()
+            # Get all values (columns A-I)
+            with metrics.timer('sheets.get_all_values') as timer:
+                all_values = self.worksheet.get_all_values()
+                if metrics.registry.enabled:
+                    timer.nbytes = sum(len(cell) for row in all_values for cell in row)
             
             if len(all_values) < 2:
                 return []
@@ -90,28 +159,143 @@ class GoogleSheetsService:
             data_rows = all_values[1:]
             
             words = []
-            for idx, row in enumerate(data_rows, start=2):  # Start at 2 (1 is header)
-                if len(row) >= 2 and row[0].strip():  # Check if Front exists
-                    words.append({
-                        'row_index': idx,
-                        'front': row[0].strip(),
-                        'back': row[1].strip(),
-                        'last_practice_date': row[2].strip() if len(row) > 2 else '',
-                        'srs_stage': int(row[3]) if len(row) > 3 and row[3].isdigit() else 0,
-                        'failed_count': int(row[4]) if len(row) > 4 and row[4].isdigit() else 0
-                    })
-                    
-            return words
+            duplicate_index = DuplicateIndex()
+            with metrics.timer('sheets.parse'):
+                for idx, row in enumerate(data_rows, start=2):  # Start at 2 (1 is header)
+                    word = self.parse_row(row, idx)
+                    if word:
+                        duplicate_index.add(word['front'], word['back'], idx)
+                        words.append(word)
+            
+            self.duplicate_index = duplicate_index
         except Exception as e:
             raise Exception(f"Failed to fetch words: {str(e)}")
         
-    def update_word_stats(self, row_index: int, correct: bool, new_stage: int):
-        """Update statistics and SRS data for a word (Tick-8 method)
+        header = all_values[0]
+        self.ids_labeled = len(header) >= self.ID_COLUMN and bool(header[self.ID_COLUMN - 1])
+        self._drop_copied_ids(words)
+        return words
+    
+    @staticmethod
+    def _drop_copied_ids(words: List[Dict]):
+        """Clear the ID of every card but the first one having it"""
+        seen = set()
+        for word in words:
+            if word['id'] in seen:
+                word['id'] = ''
+            elif word['id']:
+                seen.add(word['id'])
+    
+    @staticmethod
+    def new_card_id(front: str, back: str, taken) -> str:
+        """ID for a card that has none, derived from its text so every client
+        fetching the same new rows picks the same one
+        """
+        text, salt = back, 0
+        while True:
+            new_id = f"{card_id(front, text):016x}"
+            if new_id not in taken:
+                return new_id
+            salt += 1
+            text = f"{back}\x00{salt}"  # Duplicate cards
+    
+    @metrics.instrumented('sheets.assign_ids')
+    def assign_ids(self, words: List[Dict]) -> int:
+        """Give the fetched cards without an ID a new one and save them
+        
+        Once written, an ID stays with its card through edits of the text,
+        sorting and moved rows, so it keys caches instead of the row. Run on
+        connect and by 'flashtick sync'; if the IDs can't be written, those
+        cards are left without one and keyed by row until the next run.
+        The first run also writes the column header and hides the column.
+        Returns the number of IDs written.
+        """
+        taken = {word['id'] for word in words if word['id']}
+        new_ids = []
+        cells = {}
+        for word in words:
+            if not word['id']:
+                new_id = self.new_card_id(word['front'], word['back'], taken)
+                new_ids.append((word, new_id))
+                cells[(word['row_index'], self.ID_COLUMN)] = new_id
+                taken.add(new_id)
+        if not cells:
+            return 0
+        
+        try:
+            if not self.ids_labeled:
+                cells[(1, self.ID_COLUMN)] = self.HEADER[self.ID_COLUMN - 1]
+                self.sheet.batch_update({'requests': [{
+                    'updateDimensionProperties': {
+                        'range': {
+                            'sheetId': self.worksheet.id,
+                            'dimension': 'COLUMNS',
+                            'startIndex': self.ID_COLUMN - 1,
+                            'endIndex': self.ID_COLUMN
+                        },
+                        'properties': {'hiddenByUser': True},
+                        'fields': 'hiddenByUser'
+                    }
+                }]})
+            self.update_cells(cells)
+        except Exception as e:
+            print(f"Warning: Failed to save card IDs: {str(e)}")
+            return 0
+        self.ids_labeled = True
+        for word, new_id in new_ids:
+            word['id'] = new_id
+        return len(new_ids)
+    
+    @metrics.instrumented('sheets.fetch_row_map')
+    def fetch_row_map(self) -> Dict[str, int]:
+        """Current row of every card ID, reading only the ID column"""
+        if not self.is_connected():
+            raise Exception("Not connected to a Google Sheet")
+        try:
+            values = self.worksheet.col_values(self.ID_COLUMN)
+        except Exception as e:
+            raise Exception(f"Failed to fetch card IDs: {str(e)}")
+        return {value: row for row, value in enumerate(values[1:], start=2) if value}
+    
+    @staticmethod
+    def parse_row(row: List[str], row_index: int) -> Optional[Dict]:
+        """Word dictionary of a sheet row, None if it has no front"""
+        if len(row) < 2 or not row[0].strip():
+            return None
+        return {
+            'row_index': row_index,
+            'front': row[0].strip(),
+            'back': row[1].strip(),
+            'last_practice_date': row[2].strip() if len(row) > 2 else '',
+            'srs_stage': int(row[3]) if len(row) > 3 and row[3].isdigit() else 0,
+            'failed_count': int(row[4]) if len(row) > 4 and row[4].isdigit() else 0,
+            'due_date': row[5].strip() if len(row) > 5 else '',
+            'scheduler_state': row[6].strip() if len(row) > 6 else '',
+            'suspended': len(row) > 7 and bool(row[7].strip()),
+            'id': row[8].strip() if len(row) > 8 else ''
+        }
+    
+    @classmethod
+    def row_values(cls, word: Dict) -> List:
+        """Sheet row (columns A-I) of a word dictionary"""
+        return [word['front'], word['back'], word.get('last_practice_date', ''), word.get('srs_stage', 0),
+                word.get('failed_count', 0), word.get('due_date', ''), word.get('scheduler_state', ''),
+                cls.cell_value('suspended', word.get('suspended')), word.get('id', '')]
+    
+    @staticmethod
+    def cell_key(word: Dict):
+        """What queued cells of a word are keyed by: its card ID, or its row without one"""
+        return word.get('id') or word['row_index']
+        
+    def update_word_stats(self, row_index: int, correct: bool, new_stage: int,
+                          due_date: Optional[str] = None, scheduler_state: Optional[str] = None):
+        """Update statistics and SRS data for a word
         
         Updates:
         - Column C: Last Practice Date
         - Column D: SRS Stage
         - Column E: Number of Failed (only if wrong)
+        - Columns F/G: Due Date and Scheduler State (only if given)
         """
         if not self.is_connected():
             return
@@ -120,16 +304,264 @@ class GoogleSheetsService:
             today = datetime.now().strftime('%Y-%m-%d')
             
             # Update last practice date (Column C)
-            self.worksheet.update_cell(row_index, 3, today)
+            self._update_cell(row_index, 3, today)
             
             # Update SRS stage (Column D)
-            self.worksheet.update_cell(row_index, 4, new_stage)
+            self._update_cell(row_index, 4, new_stage)
             
             # Update failed count only if incorrect (Column E)
             if not correct:
-                current_failed = self.worksheet.cell(row_index, 5).value
+                current_failed = self._read_cell(row_index, 5)
                 new_failed = int(current_failed) + 1 if current_failed and current_failed.isdigit() else 1
-                self.worksheet.update_cell(row_index, 5, new_failed)
+                self._update_cell(row_index, 5, new_failed)
             
+            # Interval schedulers also store when the card is due next
+            if due_date is not None:
+                self._update_cell(row_index, 6, due_date)
+            if scheduler_state is not None:
+                self._update_cell(row_index, 7, scheduler_state)
+            
+        except Exception as e:
+            print(f"Warning: Failed to update word stats: {str(e)}")
+    
+    @classmethod
+    def stat_cells(cls, key, updates: Dict) -> Dict[tuple, object]:
+        """Map changed word fields onto update_cells() cells
+        
+        key: the row, or the cell_key() for update_card_cells()
+        """
+        return {(key, cls.STAT_COLUMNS[field]): cls.cell_value(field, value)
+                for field, value in updates.items() if field in cls.STAT_COLUMNS}
+    
+    @classmethod
+    def cell_value(cls, field: str, value):
+        """Sheet cell value of a word field"""
+        if field == 'suspended':
+            return cls.SUSPENDED_VALUE if value else ''
+        return value
+    
+    @metrics.instrumented('sheets.update_cell')
+    def _update_cell(self, row: int, col: int, value):
+        self.worksheet.update_cell(row, col, value)
+    
+    @metrics.instrumented('sheets.read_cell')
+    def _read_cell(self, row: int, col: int):
+        return self.worksheet.cell(row, col).value
+    
+    @metrics.instrumented('sheets.ensure_header')
+    def ensure_header(self):
+        """Write the header row if the worksheet is empty"""
+        if not self.is_connected():
+            raise Exception("Not connected to a Google Sheet")
+        
+        if not self.worksheet.acell('A1').value:
+            self.worksheet.update([self.HEADER], 'A1', value_input_option='RAW')
+    
+    @metrics.instrumented('sheets.append_rows')
+    def append_rows(self, rows: List[List]):
+        """Append rows (columns A-E) after the last row in one request"""
+        if not self.is_connected():
+            raise Exception("Not connected to a Google Sheet")
+        
+        if not rows:
+            return
+        
+        try:
+            self.worksheet.append_rows(rows, value_input_option='RAW', table_range='A1')
+        except Exception as e:
+            raise Exception(f"Failed to append rows: {str(e)}")
+    
+    def archive_worksheet(self, create: bool = False):
+        """Archive worksheet of the connected worksheet, None if there is none yet"""
+        if not self.is_connected():
+            raise Exception("Not connected to a Google Sheet")
+        
+        title = self.worksheet.title + self.ARCHIVE_SUFFIX
+        for worksheet in self.sheet.worksheets():
+            if worksheet.title == title:
+                return worksheet
+        if not create:
+            return None
+        try:
+            worksheet = self.sheet.add_worksheet(title=title, rows=1, cols=len(self.ARCHIVE_HEADER))
+            worksheet.update([self.ARCHIVE_HEADER], 'A1', value_input_option='RAW')
+            return worksheet
+        except Exception as e:
+            raise Exception(f"Failed to create the archive worksheet: {str(e)}")
+    
+    @metrics.instrumented('sheets.fetch_archive')
+    def fetch_archive(self) -> List[Dict]:
+        """Fetch the archived words, row_index being their row in the archive worksheet"""
+        archive = self.archive_worksheet()
+        if archive is None:
+            return []
+        try:
+            all_values = archive.get_all_values()
+        except Exception as e:
+            raise Exception(f"Failed to fetch archived words: {str(e)}")
+        words = []
+        for idx, row in enumerate(all_values[1:], start=2):
+            word = self.parse_row(row, idx)
+            if word:
+                words.append(word)
+        return words
+    
+    @metrics.instrumented('sheets.archive_rows')
+    def archive_rows(self, words: List[Dict]):
+        """Move words to the archive worksheet
+        
+        One append to the archive, then the batched row deletion here. The
+        rows are deleted only once they are archived, so a failure can leave
+        a card in both worksheets but never in neither.
+        """
+        if not words:
+            return
+        archive = self.archive_worksheet(create=True)
+        archived_on = datetime.now().strftime('%Y-%m-%d')
+        try:
+            archive.append_rows([self.row_values(word) + [archived_on] for word in words],
+                                value_input_option='RAW', table_range='A1')
+        except Exception as e:
+            raise Exception(f"Failed to archive rows: {str(e)}")
+        self.delete_rows([word['row_index'] for word in words])
+    
+    @metrics.instrumented('sheets.restore_rows')
+    def restore_rows(self, words: List[Dict]):
+        """Move fetch_archive() words back to the end of the worksheet"""
+        if not words:
+            return
+        self.append_rows([self.row_values(word) for word in words])
+        self.delete_rows([word['row_index'] for word in words], self.archive_worksheet())
+    
+    @staticmethod
+    def _a1(row: int, col: int) -> str:
+        """Convert a 1-based row/column pair into A1 notation"""
+        letters = ''
+        while col:
+            col, remainder = divmod(col - 1, 26)
+            letters = chr(ord('A') + remainder) + letters
+        return f"{letters}{row}"
+    
+    @classmethod
+    def cell_ranges(cls, cells: Dict[tuple, object]) -> List[Dict]:
+        """Coalesce cells into rectangular values.batchUpdate ranges
+        
+        Consecutive rows of a column become one run, and neighbouring
+        columns with runs over the same rows one rectangle, so a bulk edit
+        of a contiguous block is a single range however many cells it has.
+        """
+        by_column = {}
+        for (row, col), value in cells.items():
+            by_column.setdefault(col, []).append((row, value))
+        
+        runs = {}  # (first row, last row) -> {column: values}
+        for col, column_cells in by_column.items():
+            column_cells.sort()
+            start = 0
+            for i in range(1, len(column_cells) + 1):
+                if i == len(column_cells) or column_cells[i][0] != column_cells[i - 1][0] + 1:
+                    span = (column_cells[start][0], column_cells[i - 1][0])
+                    runs.setdefault(span, {})[col] = [value for _, value in column_cells[start:i]]
+                    start = i
+        
+        ranges = []
+        for (first, last), columns in sorted(runs.items()):
+            cols = sorted(columns)
+            start = 0
+            for i in range(1, len(cols) + 1):
+                if i == len(cols) or cols[i] != cols[i - 1] + 1:
+                    block = cols[start:i]
+                    name = cls._a1(first, block[0])
+                    if first != last or len(block) > 1:
+                        name += ':' + cls._a1(last, block[-1])
+                    ranges.append({'range': name,
+                                   'values': [list(row) for row in zip(*(columns[col] for col in block))]})
+                    start = i
+        return ranges
+    
+    @metrics.instrumented('sheets.batch_update')
+    def update_cells(self, cells: Dict[tuple, object]):
+        """Write many cells in as few values.batchUpdate requests as possible
+        
+        cells: mapping of (row_index, column) to the new value. Cells are
+        coalesced into ranges (see cell_ranges()), one request per
+        MAX_BATCH_CELLS cells.
+        """
+        if not self.is_connected() or not cells:
+            return
+        
+        batches, batch, size = [], [], 0
+        for cell_range in self.cell_ranges(cells):
+            batch.append(cell_range)
+            size += len(cell_range['values']) * len(cell_range['values'][0])
+            if size >= self.MAX_BATCH_CELLS:
+                batches.append(batch)
+                batch, size = [], 0
+        if batch:
+            batches.append(batch)
+        
+        try:
+            for data in batches:
+                self.worksheet.batch_update(data, value_input_option='RAW')
+        except Exception as e:
+            raise Exception(f"Failed to update cells: {str(e)}")
+    
+    def update_card_cells(self, cells: Dict[tuple, object]) -> Dict[tuple, object]:
+        """Write cells keyed by card ID to wherever the cards are now
+        
+        One request for the ID column (only if any cell is keyed by ID), then
+        update_cells(). Survives rows inserted, deleted or sorted in the sheet
+        since the cells were queued. Returns the cells of IDs not found in the
+        sheet, which were not written.
+        """
+        if not self.is_connected():
+            raise Exception("Not connected to a Google Sheet")
+        if not cells:
+            return {}
+        rows = self.fetch_row_map() if any(isinstance(key, str) for key, _ in cells) else {}
+        resolved = {}
+        unresolved = {}
+        for (key, col), value in cells.items():
+            row = rows.get(key) if isinstance(key, str) else key
+            if row is None:
+                unresolved[(key, col)] = value
+            else:
+                resolved[(row, col)] = value
+        self.update_cells(resolved)
+        return unresolved
+    
+    @metrics.instrumented('sheets.delete_rows')
+    def delete_rows(self, row_indices: List[int], worksheet=None):
+        """Delete rows using as few batched requests as possible
+        
+        Adjacent rows are merged into ranges and deleted bottom-up, so earlier
+        deletions do not shift the rows of later ones.
+        worksheet: worksheet of the same spreadsheet to delete from, the connected one if None
+        """
+        if not self.is_connected():
+            raise Exception("Not connected to a Google Sheet")
+        worksheet = worksheet or self.worksheet
+        
+        ranges = []
+        for row in sorted(set(row_indices), reverse=True):
+            if ranges and ranges[-1][0] == row + 1:
+                ranges[-1][0] = row
+            else:
+                ranges.append([row, row])
+        
+        requests = [{
+            'deleteDimension': {
+                'range': {
+                    'sheetId': worksheet.id,
+                    'dimension': 'ROWS',
+                    'startIndex': start - 1,
+                    'endIndex': end
+                }
+            }
+        } for start, end in ranges]
+        
+        try:
+            for i in range(0, len(requests), self.MAX_BATCH_REQUESTS):
+                self.sheet.batch_update({'requests': requests[i:i + self.MAX_BATCH_REQUESTS]})
         except Exception as e:
-            print(f"Warning: Failed to update word stats: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Failed to delete rows: {str(e)}")
@@ -0,0 +1,301 @@
+"""
+Streaming bulk importer for CSV/TSV files and Anki decks
+"""
+
+import csv
+import html
+import json
+import os
+import re
+import shutil
+import sqlite3
+import tempfile
+import time
+import zipfile
+from datetime import date
+from typing import Callable, Dict, Iterator, List, Optional
+from services.google_sheets import PartialAppendError
+
+Row = List  # One worksheet row in the A-E layout: front, back, date, stage, failed
+
+class SheetsImportTarget:
+    """Appends imported rows to the connected worksheet"""
+
+    commits_each_batch = True  # Every append is durable, so checkpoints are safe
+
+    def __init__(self, sheets_service):
+        self.sheets_service = sheets_service
+
+    def prepare(self):
+        self.sheets_service.ensure_header()
+
+    def append(self, rows: List[Row]):
+        self.sheets_service.append_rows(rows)
+
+    def finish(self):
+        pass
+
+class LocalImportTarget:
+    """Collects imported rows into a local deck snapshot file"""
+
+    commits_each_batch = False  # Rows are only persisted by finish()
+
+    def __init__(self, path: str, source_key: str = 'local:'):
+        from services.deck_snapshot import DeckSnapshot
+
+        self.path = path
+        self.source_key = source_key
+        self.words = []
+        snapshot = DeckSnapshot(path)
+        if snapshot.open():
+            try:
+                self.words = snapshot.to_words()
+            finally:
+                snapshot.close()
+
+    def prepare(self):
+        pass
+
+    def append(self, rows: List[Row]):
+        next_row = self.words[-1]['row_index'] + 1 if self.words else 2
+        for offset, row in enumerate(rows):
+            self.words.append({
+                'row_index': next_row + offset,
+                'front': row[0],
+                'back': row[1],
+                'last_practice_date': row[2],
+                'srs_stage': row[3],
+                'failed_count': row[4]
+            })
+
+    def finish(self):
+        from services.deck_snapshot import DeckSnapshot
+        DeckSnapshot.save(self.words, self.source_key, self.path)
+
+class DeckImporter:
+    """Streams rows from a source file and appends them in large batches
+
+    Progress is checkpointed after every committed batch, so an interrupted
+    import resumes where it stopped instead of duplicating rows.
+    """
+
+    BATCH_SIZE = 5000
+    MAX_RETRIES = 3
+    CHECKPOINT_FILE = 'config/import_checkpoint.json'
+    HEADER_WORDS = {'front', 'question', 'word', 'term'}
+    MAX_STAGE = 8
+
+    def __init__(self, target, batch_size: Optional[int] = None,
+                 progress_callback: Optional[Callable[[Dict], None]] = None,
+                 checkpoint_file: Optional[str] = None,
+                 duplicate_index=None):
+        """Initialize the importer
+
+        duplicate_index: optional DuplicateIndex of cards already in the deck;
+        rows matching it (or an earlier row of the same import) are skipped
+        """
+        self.target = target
+        self.duplicate_index = duplicate_index
+        self.batch_size = batch_size or self.BATCH_SIZE
+        self.progress_callback = progress_callback
+        self.checkpoint_file = checkpoint_file or self.CHECKPOINT_FILE
+
+    # Sources
+
+    def read_rows(self, path: str) -> Iterator[Row]:
+        """Yield normalized A-E rows from a CSV, TSV or Anki .apkg file"""
+        extension = os.path.splitext(path)[1].lower()
+        if extension in ('.apkg', '.colpkg'):
+            rows = self._read_anki(path)
+        else:
+            rows = self._read_delimited(path, extension)
+
+        for fields in rows:
+            row = self.normalize_row(fields)
+            if row:
+                yield row
+
+    def _read_delimited(self, path: str, extension: str) -> Iterator[List[str]]:
+        with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+            if extension in ('.tsv', '.tab'):
+                delimiter = '\t'
+            else:
+                sample = f.read(4096)
+                f.seek(0)
+                try:
+                    delimiter = csv.Sniffer().sniff(sample, delimiters=',;\t').delimiter
+                except csv.Error:
+                    delimiter = ','
+
+            reader = csv.reader(f, delimiter=delimiter)
+            first = next(reader, None)
+            if first is None:
+                return
+            if not (first and first[0].strip().lower() in self.HEADER_WORDS):
+                yield first
+            yield from reader
+
+    def _read_anki(self, path: str) -> Iterator[List[str]]:
+        with zipfile.ZipFile(path) as archive:
+            names = set(archive.namelist())
+            # Anki 2.1.50+ packs a zstd-compressed collection.anki21b, next to a
+            # collection.anki2 that only holds an "update Anki" placeholder note
+            if 'collection.anki21b' in names and 'collection.anki21' not in names:
+                raise Exception("Unsupported Anki package: export it again with "
+                                "'Support older Anki versions' checked")
+            collection = next((n for n in ('collection.anki21', 'collection.anki2') if n in names), None)
+            if collection is None:
+                raise Exception("Unsupported Anki package: no collection.anki2/anki21 database found")
+
+            # SQLite needs a real file, copy it out in chunks rather than into memory
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                db_path = os.path.join(tmp_dir, 'collection.db')
+                with archive.open(collection) as src, open(db_path, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+
+                connection = sqlite3.connect(db_path)
+                try:
+                    cursor = connection.execute('SELECT flds FROM notes ORDER BY id')
+                    while True:
+                        chunk = cursor.fetchmany(self.batch_size)
+                        if not chunk:
+                            break
+                        for (flds,) in chunk:
+                            yield [self._strip_html(field) for field in flds.split('\x1f')]
+                finally:
+                    connection.close()
+
+    @staticmethod
+    def _strip_html(text: str) -> str:
+        text = re.sub(r'<br\s*/?>', ' ', text, flags=re.IGNORECASE)
+        text = re.sub(r'<[^>]+>', '', text)
+        text = re.sub(r'\[sound:[^\]]*\]', '', text)
+        return html.unescape(text).strip()
+
+    def normalize_row(self, fields: List[str]) -> Optional[Row]:
+        """Map raw source fields onto the A-E worksheet layout"""
+        if len(fields) < 2 or not fields[0].strip():
+            return None
+
+        front = fields[0].strip()
+        back = fields[1].strip()
+
+        practice_date = fields[2].strip() if len(fields) > 2 else ''
+        if practice_date:
+            try:
+                date.fromisoformat(practice_date)
+            except ValueError:
+                practice_date = ''
+
+        stage = fields[3].strip() if len(fields) > 3 else ''
+        stage = min(int(stage), self.MAX_STAGE) if stage.isdigit() else 0
+
+        failed = fields[4].strip() if len(fields) > 4 else ''
+        failed = int(failed) if failed.isdigit() else 0
+
+        return [front, back, practice_date, stage, failed]
+
+    # Checkpoints
+
+    @staticmethod
+    def _source_signature(path: str) -> Dict:
+        stat = os.stat(path)
+        return {'source': os.path.abspath(path), 'size': stat.st_size, 'mtime': stat.st_mtime}
+
+    def load_checkpoint(self, path: str) -> int:
+        """Return how many source rows a previous run already committed"""
+        if not os.path.exists(self.checkpoint_file):
+            return 0
+        try:
+            with open(self.checkpoint_file, 'r') as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            return 0
+
+        signature = self._source_signature(path)
+        if all(checkpoint.get(key) == value for key, value in signature.items()):
+            return checkpoint.get('rows_consumed', 0)
+        return 0
+
+    def _save_checkpoint(self, path: str, rows_consumed: int):
+        checkpoint = {**self._source_signature(path), 'rows_consumed': rows_consumed}
+        tmp_path = self.checkpoint_file + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, self.checkpoint_file)
+
+    def clear_checkpoint(self):
+        if os.path.exists(self.checkpoint_file):
+            os.remove(self.checkpoint_file)
+
+    # Import
+
+    def _append_with_retry(self, rows: List[Row]):
+        for attempt in range(self.MAX_RETRIES):
+            try:
+                self.target.append(rows)
+                return
+            except Exception as e:
+                if attempt == self.MAX_RETRIES - 1:
+                    raise
+                if isinstance(e, PartialAppendError):
+                    rows = e.rows  # The other rows landed, don't write them twice
+                time.sleep(2 ** attempt)  # Back off on rate limits
+
+    def run(self, path: str, resume: bool = True) -> Dict:
+        """Import a file, returns throughput metrics"""
+        started = time.perf_counter()
+        skip = self.load_checkpoint(path) if resume else 0
+        stats = {
+            'rows_read': 0,
+            'rows_written': 0,
+            'rows_skipped': 0,
+            'rows_resumed': skip,
+            'batches': 0,
+            'write_seconds': 0.0,
+            'elapsed_seconds': 0.0,
+            'rows_per_second': 0.0
+        }
+
+        self.target.prepare()
+        batch = []
+
+        def flush():
+            write_started = time.perf_counter()
+            self._append_with_retry(batch)
+            stats['write_seconds'] += time.perf_counter() - write_started
+            stats['rows_written'] += len(batch)
+            stats['batches'] += 1
+            if getattr(self.target, 'commits_each_batch', True):
+                self._save_checkpoint(path, stats['rows_read'])
+            batch.clear()
+            self._report(stats, started)
+
+        for row in self.read_rows(path):
+            stats['rows_read'] += 1
+            if self.duplicate_index is not None:
+                # Resumed rows are indexed too, they may repeat later in the file
+                if self.duplicate_index.add(row[0], row[1]) is not None:
+                    if stats['rows_read'] > skip:
+                        stats['rows_skipped'] += 1
+                    continue
+            if stats['rows_read'] <= skip:
+                continue
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                flush()
+
+        if batch:
+            flush()
+
+        self.target.finish()
+        self.clear_checkpoint()
+        self._report(stats, started)
+        return stats
+
+    def _report(self, stats: Dict, started: float):
+        elapsed = time.perf_counter() - started
+        stats['elapsed_seconds'] = elapsed
+        stats['rows_per_second'] = stats['rows_written'] / elapsed if elapsed > 0 else 0.0
+        if self.progress_callback:
+            self.progress_callback(dict(stats))
@@ -0,0 +1,85 @@
+"""
+Image references in card text and the local media cache
+"""
+
+import hashlib
+import os
+import re
+import threading
+import urllib.request
+from typing import Optional, Tuple
+from urllib.parse import urlparse
+from services import metrics
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.webp', '.bmp')
+_MARKER = re.compile(r'\[img:\s*([^\]]+?)\s*\]', re.IGNORECASE)
+
+def _is_remote(source: str) -> bool:
+    return source.startswith(('http://', 'https://'))
+
+def _looks_like_image(text: str) -> bool:
+    path = urlparse(text).path if _is_remote(text) else text
+    return path.lower().endswith(IMAGE_EXTENSIONS)
+
+def parse_media(text: str) -> Tuple[str, Optional[str]]:
+    """Split a card side into its text and image source (None without image)
+
+    A side shows an image when it contains an [img:SOURCE] marker, the rest
+    of the cell being its caption, or when the whole cell is an image path
+    or URL. SOURCE is a local path or an http(s) URL.
+    """
+    match = _MARKER.search(text)
+    if match:
+        return (text[:match.start()] + text[match.end():]).strip(), match.group(1)
+    stripped = text.strip()
+    if stripped and not any(c.isspace() for c in stripped) and _looks_like_image(stripped):
+        return '', stripped
+    return text, None
+
+class MediaCache:
+    """Resolves image sources to local files
+
+    Local paths are used in place. URLs are downloaded once into the cache
+    directory, named by a hash of the URL, and served from disk afterwards.
+    Downloads go through a per-thread temporary file, so several worker
+    threads may fetch at once.
+    """
+
+    CACHE_DIR = 'config/media'
+    TIMEOUT_SECONDS = 10
+
+    def __init__(self, cache_dir: str = CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def cached_path(self, source: str) -> str:
+        """Path the image of a source is read from"""
+        if not _is_remote(source):
+            return os.path.expanduser(source)
+        extension = os.path.splitext(urlparse(source).path)[1].lower()
+        if extension not in IMAGE_EXTENSIONS:
+            extension = ''
+        name = hashlib.sha1(source.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, name + extension)
+
+    @metrics.instrumented('media.fetch')
+    def fetch(self, source: str) -> str:
+        """Local file of a source, downloading remote images on first use"""
+        path = self.cached_path(source)
+        if os.path.exists(path):
+            return path
+        if not _is_remote(source):
+            raise Exception(f"Image not found: {source}")
+
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with urllib.request.urlopen(source, timeout=self.TIMEOUT_SECONDS) as response:
+                data = response.read()
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise Exception(f"Failed to download image {source}: {str(e)}")
+        return path
@@ -0,0 +1,247 @@
+"""
+Lightweight metrics: counters, error counts, byte totals and latency histograms
+
+Disabled by default. While disabled an instrumented call costs two
+attribute checks before calling straight through to the wrapped function.
+Instrumented functions and timed blocks also emit trace spans while
+services.tracing is enabled.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from services.tracing import tracer
+
+# Latency bucket upper bounds in seconds (Prometheus "le" labels)
+BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+           0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float('inf'))
+
+class Histogram:
+    """Fixed-bucket latency histogram"""
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float):
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.total += seconds
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile (upper bound of the bucket it falls in)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound if bound != float('inf') else BUCKETS[-2]
+        return BUCKETS[-2]
+
+class OperationStats:
+    """Everything recorded for one named operation"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.bytes = 0
+        self.latency = Histogram()
+
+class MetricsRegistry:
+    """Process-wide collection of per-operation statistics"""
+
+    def __init__(self):
+        self.enabled = False
+        self._operations: Dict[str, OperationStats] = {}
+        self._counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _operation(self, name: str) -> OperationStats:
+        stats = self._operations.get(name)
+        if stats is None:
+            stats = self._operations.setdefault(name, OperationStats())
+        return stats
+
+    def observe(self, name: str, seconds: float, error: bool = False, nbytes: int = 0):
+        """Record one completed call of an operation"""
+        with self._lock:
+            stats = self._operation(name)
+            stats.calls += 1
+            stats.errors += 1 if error else 0
+            stats.bytes += nbytes
+            stats.latency.observe(seconds)
+
+    def add_bytes(self, name: str, nbytes: int):
+        """Attribute transferred bytes to an operation"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._operation(name).bytes += nbytes
+
+    def inc(self, name: str, value: float = 1):
+        """Increment a free-standing counter"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def timer(self, name: str):
+        """Context manager timing a block as an operation"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def reset(self):
+        with self._lock:
+            self._operations.clear()
+            self._counters.clear()
+
+    def snapshot(self) -> Dict:
+        """Plain-dict copy of all metrics"""
+        with self._lock:
+            operations = {}
+            for name, stats in sorted(self._operations.items()):
+                latency = stats.latency
+                operations[name] = {
+                    'calls': stats.calls,
+                    'errors': stats.errors,
+                    'bytes': stats.bytes,
+                    'latency_seconds': {
+                        'sum': latency.total,
+                        'mean': latency.total / latency.count if latency.count else 0.0,
+                        'p50': latency.quantile(0.50),
+                        'p95': latency.quantile(0.95),
+                        'p99': latency.quantile(0.99),
+                        'buckets': {('+Inf' if b == float('inf') else repr(b)): c
+                                    for b, c in zip(BUCKETS, latency.counts)}
+                    }
+                }
+            return {'operations': operations, 'counters': dict(sorted(self._counters.items()))}
+
+    def to_json(self) -> str:
+        return json.dumps({'timestamp': time.time(), **self.snapshot()}, indent=2)
+
+    def to_prometheus(self) -> str:
+        """Render metrics in the Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        lines: List[str] = []
+
+        def family(metric: str, kind: str, help_text: str):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+
+        operations = snapshot['operations']
+        family('flashtick_operation_calls_total', 'counter', 'Calls per operation')
+        for name, stats in operations.items():
+            lines.append(f'flashtick_operation_calls_total{{operation="{name}"}} {stats["calls"]}')
+        family('flashtick_operation_errors_total', 'counter', 'Failed calls per operation')
+        for name, stats in operations.items():
+            lines.append(f'flashtick_operation_errors_total{{operation="{name}"}} {stats["errors"]}')
+        family('flashtick_operation_bytes_total', 'counter', 'Bytes transferred per operation')
+        for name, stats in operations.items():
+            lines.append(f'flashtick_operation_bytes_total{{operation="{name}"}} {stats["bytes"]}')
+
+        family('flashtick_operation_duration_seconds', 'histogram', 'Operation latency')
+        for name, stats in operations.items():
+            cumulative = 0
+            for bound, count in stats['latency_seconds']['buckets'].items():
+                cumulative += count
+                lines.append(f'flashtick_operation_duration_seconds_bucket{{operation="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'flashtick_operation_duration_seconds_sum{{operation="{name}"}} {stats["latency_seconds"]["sum"]}')
+            lines.append(f'flashtick_operation_duration_seconds_count{{operation="{name}"}} {stats["calls"]}')
+
+        for name, value in snapshot['counters'].items():
+            metric = 'flashtick_' + ''.join(c if c.isalnum() else '_' for c in name)
+            family(metric, 'counter', name)
+            lines.append(f"{metric} {value}")
+
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str):
+        """Export to a file, Prometheus text for .prom/.txt, JSON otherwise"""
+        content = self.to_prometheus() if os.path.splitext(path)[1] in ('.prom', '.txt') else self.to_json()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+
+class _Timer:
+    __slots__ = ('registry', 'name', 'started', 'nbytes', 'span')
+
+    def __init__(self, registry: MetricsRegistry, name: str):
+        self.registry = registry
+        self.name = name
+        self.nbytes = 0
+        self.span = tracer.span(name)
+
+    def __enter__(self):
+        self.span.__enter__()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.registry.enabled:
+            self.registry.observe(self.name, time.perf_counter() - self.started,
+                                  error=exc_type is not None, nbytes=self.nbytes)
+        self.span.__exit__(exc_type, exc, tb)
+        return False
+
+class _NullTimer:
+    __slots__ = ()
+    nbytes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def __setattr__(self, name, value):
+        pass  # Ignore nbytes assignments while disabled
+
+_NULL_TIMER = _NullTimer()
+
+registry = MetricsRegistry()
+
+def timer(name: str):
+    """Time a block against the process-wide registry and tracer"""
+    if not (registry.enabled or tracer.enabled):
+        return _NULL_TIMER
+    return _Timer(registry, name)
+
+def instrumented(name: str, bytes_of: Optional[Callable] = None):
+    """Decorator recording calls, errors, latency (and optionally bytes) of a function
+
+    Also traces each call as a span while the tracer is enabled.
+
+    bytes_of: optional callable computing transferred bytes from the result,
+    only evaluated while metrics are enabled
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not (registry.enabled or tracer.enabled):
+                return func(*args, **kwargs)
+
+            with tracer.span(name):
+                started = time.perf_counter()
+                try:
+                    result = func(*args, **kwargs)
+                except Exception:
+                    if registry.enabled:
+                        registry.observe(name, time.perf_counter() - started, error=True)
+                    raise
+                if registry.enabled:
+                    registry.observe(name, time.perf_counter() - started,
+                                     nbytes=bytes_of(result) if bytes_of else 0)
+                return result
+        return wrapper
+    return decorator
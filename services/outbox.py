@@ -0,0 +1,143 @@
+"""
+Persistent write-behind queue for sheet cell updates
+"""
+
+import json
+import os
+import threading
+from typing import Dict, List, Tuple, Union
+from services import metrics
+
+Cell = Tuple[Union[str, int], int]  # (card ID, or row_index without one; 1-based column)
+
+class Outbox:
+    """Coalescing write-behind queue of cell updates for one sheet
+
+    Answers are queued locally and written in a single values.batchUpdate
+    per flush instead of several requests per answer; a later write to the
+    same cell replaces the queued one. The queue is saved to disk on every
+    change, so updates that were not written yet survive a crash or an
+    offline session and go out with the next flush. Safe to fill from the
+    GUI thread while a worker flushes.
+
+    Cells are keyed by card ID, and a flush looks up the rows the cards are
+    in at that moment, so queued answers still land on the right cards
+    after rows were inserted, deleted or sorted in the sheet. Cards without
+    an ID are keyed by row.
+    """
+
+    OUTBOX_FILE = 'config/outbox.json'
+
+    def __init__(self, source_key: str, path: str = None):
+        """source_key: DeckSnapshot.source_key_for() of the sheet the cells belong to"""
+        self.path = path or self.OUTBOX_FILE
+        self.source_key = source_key
+        self._pending: Dict[Cell, object] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            cells = data.get('cells', [])
+            if data.get('source_key') != self.source_key:
+                if cells:
+                    print(f"Warning: Discarding {len(cells)} unsent cell updates of another sheet")
+                return
+            self._pending = {(key, col): value for key, col, value in cells}
+        except (OSError, ValueError, TypeError) as e:
+            print(f"Warning: Ignoring outbox file: {str(e)}")
+
+    def _save(self):
+        """Persist the queue atomically, caller holds the lock"""
+        tmp_path = self.path + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump({
+                    'source_key': self.source_key,
+                    'cells': [[key, col, value] for (key, col), value in self._pending.items()]
+                }, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Warning: Failed to save outbox: {str(e)}")
+
+    def put(self, cells: Dict[Cell, object]):
+        """Queue cell updates"""
+        if not cells:
+            return
+        with self._lock:
+            self._pending.update(cells)
+            self._save()
+
+    def pending_count(self) -> int:
+        """Number of queued cells"""
+        with self._lock:
+            return len(self._pending)
+
+    def apply_to(self, words: List[Dict], columns: Dict[str, int]) -> int:
+        """Overlay queued cells on freshly fetched words, returns cells applied
+
+        columns: word field -> sheet column of the cells to apply
+        """
+        fields = {column: field for field, column in columns.items()}
+        with self._lock:
+            pending = dict(self._pending)
+        if not pending:
+            return 0
+        by_key = {word['row_index']: word for word in words}
+        by_key.update((word['id'], word) for word in words if word.get('id'))
+        applied = 0
+        for (key, col), value in pending.items():
+            if key in by_key and col in fields:
+                by_key[key][fields[col]] = value
+                applied += 1
+        return applied
+
+    def discard_missing(self, words: List[Dict]) -> int:
+        """Drop cells of card IDs not among words, the whole current deck
+
+        Those cards were deleted from the sheet, so their cells can never be
+        written. Returns the number of cells dropped.
+        """
+        ids = {word['id'] for word in words if word.get('id')}
+        with self._lock:
+            missing = [cell for cell in self._pending if isinstance(cell[0], str) and cell[0] not in ids]
+            for cell in missing:
+                del self._pending[cell]
+            if missing:
+                self._save()
+        if missing:
+            print(f"Warning: Discarded {len(missing)} unsent cell updates of cards no longer in the sheet")
+        return len(missing)
+
+    @metrics.instrumented('outbox.flush')
+    def flush(self, sheets_service) -> int:
+        """Write every queued cell in one batch, returns how many were written
+
+        Raises if the write fails; the cells then stay queued. Cells queued
+        again while the batch was in flight are kept for the next flush, and
+        so are cells of card IDs the sheet no longer has (see discard_missing()).
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch = dict(self._pending)
+            if not batch:
+                return 0
+            if sheets_service is None or not sheets_service.is_connected():
+                raise Exception("Not connected to a Google Sheet")
+
+            unwritten = sheets_service.update_card_cells(batch)
+
+            with self._lock:
+                for cell, value in batch.items():
+                    if cell not in unwritten and cell in self._pending and self._pending[cell] == value:
+                        del self._pending[cell]
+                self._save()
+            if unwritten:
+                print(f"Warning: {len(unwritten)} sheet updates of cards not found in the sheet kept in {self.path}")
+            return len(batch) - len(unwritten)
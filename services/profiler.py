@@ -0,0 +1,158 @@
+"""
+Opt-in cProfile + tracemalloc profiling of startup and practice sessions
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+# Packages that get their own line in the per-module attribution
+PACKAGES = ('services', 'models', 'ui')
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def package_of(filename: str) -> str:
+    """Attribute a source file to services/models/ui, or 'other'"""
+    path = os.path.abspath(filename)
+    if not path.startswith(_REPO_ROOT + os.sep):
+        return 'other'
+    top = os.path.relpath(path, _REPO_ROOT).split(os.sep)[0]
+    return top if top in PACKAGES else 'other'
+
+class SessionProfiler:
+    """Profiles one labelled phase at a time (startup, a practice session)
+
+    Each finished phase writes two files to the output directory:
+    - <stamp>-<label>.prof: cProfile stats, open with pstats or snakeviz
+    - <stamp>-<label>.txt: hottest functions, top allocations and per-package
+      attribution of CPU time and memory
+    """
+
+    PROFILE_DIR = 'config/profiles'
+
+    def __init__(self, output_dir: str = PROFILE_DIR, top: int = 25, traceback_frames: int = 16):
+        self.enabled = False
+        self.output_dir = output_dir
+        self.top = top
+        self.traceback_frames = traceback_frames
+        self.label: Optional[str] = None
+        self._profile = None
+        self._started = 0.0
+        self._owns_tracemalloc = False
+
+    def is_active(self) -> bool:
+        return self._profile is not None
+
+    def start(self, label: str) -> bool:
+        """Start profiling a phase, returns False when disabled or already running"""
+        if not self.enabled or self.is_active():
+            return False
+
+        self.label = label
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.traceback_frames)
+            self._owns_tracemalloc = True
+        self._started = time.perf_counter()
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+        return True
+
+    def stop(self, label: Optional[str] = None) -> Optional[Tuple[str, str]]:
+        """Stop the running phase and write its reports
+
+        label: only stop if the running phase has this label
+        Returns (stats path, report path), or None if nothing was running.
+        """
+        if not self.is_active() or (label and label != self.label):
+            return None
+
+        self._profile.disable()
+        elapsed = time.perf_counter() - self._started
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+        profile, self._profile = self._profile, None
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            base = os.path.join(self.output_dir, f"{datetime.now():%Y%m%d-%H%M%S}-{self.label}")
+            stats_path = base + '.prof'
+            report_path = base + '.txt'
+            profile.dump_stats(stats_path)
+            with open(report_path, 'w') as f:
+                f.write(self._report(profile, snapshot, elapsed, current, peak))
+        except OSError as e:
+            print(f"Warning: Failed to write profile: {str(e)}")
+            return None
+
+        print(f"Profile of {self.label} written to {report_path}")
+        return stats_path, report_path
+
+    def _report(self, profile: cProfile.Profile, snapshot: tracemalloc.Snapshot,
+                elapsed: float, current: int, peak: int) -> str:
+        out = io.StringIO()
+        out.write(f"FlashTick profile: {self.label}\n")
+        out.write(f"Wall time: {elapsed * 1000:.1f} ms\n")
+        out.write(f"Traced memory: {current / 1024:.1f} KiB current, {peak / 1024:.1f} KiB peak\n\n")
+
+        stats = pstats.Stats(profile, stream=out)
+
+        out.write("CPU time by package (own time)\n")
+        cpu = self._cpu_by_package(stats)
+        total_cpu = sum(cpu.values()) or 1.0
+        for package, seconds in sorted(cpu.items(), key=lambda item: -item[1]):
+            out.write(f"  {package:<10} {seconds * 1000:10.1f} ms  {seconds / total_cpu:6.1%}\n")
+
+        out.write("\nMemory allocated by package (live at end of phase)\n")
+        allocations, by_package = self._allocations(snapshot)
+        total_memory = sum(by_package.values()) or 1
+        for package, size in sorted(by_package.items(), key=lambda item: -item[1]):
+            out.write(f"  {package:<10} {size / 1024:10.1f} KiB  {size / total_memory:6.1%}\n")
+
+        out.write(f"\nTop {self.top} allocation sites\n")
+        for size, count, where in allocations[:self.top]:
+            out.write(f"  {size / 1024:10.1f} KiB {count:8} blocks  {where}\n")
+
+        out.write(f"\nTop {self.top} functions by cumulative time\n")
+        stats.sort_stats('cumulative').print_stats(self.top)
+        return out.getvalue()
+
+    @staticmethod
+    def _cpu_by_package(stats: pstats.Stats) -> Dict[str, float]:
+        totals = {package: 0.0 for package in PACKAGES + ('other',)}
+        for (filename, _, _), (_, _, own_time, _, _) in stats.stats.items():
+            totals[package_of(filename)] += own_time
+        return totals
+
+    def _allocations(self, snapshot: tracemalloc.Snapshot) -> Tuple[List[Tuple[int, int, str]], Dict[str, int]]:
+        """Allocation sites plus totals attributed to the innermost FlashTick frame"""
+        snapshot = snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+        ])
+        by_package = {package: 0 for package in PACKAGES + ('other',)}
+        sites: Dict[str, List[int]] = {}
+
+        for stat in snapshot.statistics('traceback'):
+            frames = list(stat.traceback)  # Oldest first
+            owner = next((frame for frame in reversed(frames) if package_of(frame.filename) != 'other'),
+                         frames[-1])
+            package = package_of(owner.filename)
+            by_package[package] += stat.size
+            filename = owner.filename if package == 'other' else os.path.relpath(owner.filename, _REPO_ROOT)
+            where = f"{filename}:{owner.lineno}"
+            site = sites.setdefault(where, [0, 0])
+            site[0] += stat.size
+            site[1] += stat.count
+
+        allocations = sorted(((size, count, where) for where, (size, count) in sites.items()), reverse=True)
+        return allocations, by_package
+
+profiler = SessionProfiler()
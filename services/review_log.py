@@ -0,0 +1,202 @@
+"""
+Append-only binary log of every review
+"""
+
+import mmap
+import os
+import struct
+import threading
+import time
+from datetime import date
+from typing import Callable, Iterator, List, NamedTuple, Optional
+
+# Outcome codes stored in each record
+INCORRECT = 0
+CORRECT = 1
+SKIPPED = 2
+
+class ReviewRecord(NamedTuple):
+    """One answered or skipped card"""
+    card_id: int        # dedup.review_id() of the card
+    timestamp: float    # Unix time of the answer
+    epoch_day: int      # date.toordinal() of the answer
+    response_ms: int    # Time from showing the card to revealing/skipping it
+    outcome: int        # INCORRECT, CORRECT or SKIPPED
+    old_stage: int
+    new_stage: int
+
+class ReviewLog:
+    """Fixed-width binary review log
+
+    File layout (little-endian):
+    - Header: magic, version, record size, last compaction time
+    - Records: card_id (uint64), timestamp (float64), epoch_day (int32),
+      response_ms (uint32), outcome, old_stage, new_stage (uint8), padding
+
+    Appends are buffered in memory and written in blocks. Replay maps the file
+    read-only; a torn record at the end (e.g. after a crash) is ignored and
+    dropped by the next compaction. Compaction may run on a worker while
+    another thread appends.
+    """
+
+    LOG_FILE = 'config/review_log.bin'
+    MAGIC = b'FTREVL'
+    VERSION = 1
+    HEADER = struct.Struct('<6sHH6xd')
+    RECORD = struct.Struct('<QdiIBBBx')
+    COMPACT_INTERVAL_DAYS = 7
+
+    def __init__(self, path: Optional[str] = None, buffer_records: int = 64):
+        self.path = path or self.LOG_FILE
+        self.buffer_records = buffer_records
+        self._buffer = bytearray()
+        self._file = None
+        self._lock = threading.RLock()  # Guards the buffer and the file open for appending
+
+    def append(self, card_id: int, outcome: int, old_stage: int, new_stage: int,
+               response_ms: int = 0, timestamp: Optional[float] = None):
+        """Buffer one review record"""
+        timestamp = timestamp if timestamp is not None else time.time()
+        epoch_day = date.fromtimestamp(timestamp).toordinal()
+        record = self.RECORD.pack(
+            card_id, timestamp, epoch_day,
+            min(max(int(response_ms), 0), 0xFFFFFFFF),
+            outcome, old_stage, new_stage
+        )
+        with self._lock:
+            self._buffer += record
+            if len(self._buffer) >= self.buffer_records * self.RECORD.size:
+                self.flush()
+
+    def flush(self):
+        """Write buffered records to disk"""
+        with self._lock:
+            if not self._buffer:
+                return
+            try:
+                if self._file is None:
+                    self._file = self._open_for_append()
+                self._file.write(self._buffer)
+                self._file.flush()
+                self._buffer.clear()
+            except OSError as e:
+                print(f"Warning: Failed to write review log: {str(e)}")
+
+    def close(self):
+        """Flush and close the log file"""
+        with self._lock:
+            self.flush()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _open_for_append(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        f = open(self.path, 'ab')
+        if f.tell() == 0:
+            f.write(self.HEADER.pack(self.MAGIC, self.VERSION, self.RECORD.size, time.time()))
+        else:
+            # Start at a record boundary, dropping a torn record left by a crash
+            f.truncate(self._valid_size(f.tell()))
+        return f
+
+    def _valid_size(self, size: int) -> int:
+        if size < self.HEADER.size:
+            return size
+        return self.HEADER.size + (size - self.HEADER.size) // self.RECORD.size * self.RECORD.size
+
+    def _read_header(self, mapped) -> Optional[float]:
+        """Validate the header, returns the last compaction time"""
+        magic, version, record_size, compacted_at = self.HEADER.unpack_from(mapped, 0)
+        if magic != self.MAGIC or version != self.VERSION or record_size != self.RECORD.size:
+            return None
+        return compacted_at
+
+    def replay(self, end: Optional[int] = None) -> Iterator[ReviewRecord]:
+        """Yield every record, oldest first, from a read-only memory map
+
+        end: file offset to stop at, the end of the file if None
+        """
+        self.flush()
+        if not os.path.exists(self.path) or os.path.getsize(self.path) <= self.HEADER.size:
+            return
+
+        with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if self._read_header(mapped) is None:
+                print(f"Warning: Ignoring review log with unknown format: {self.path}")
+                return
+            end = self._valid_size(len(mapped) if end is None else min(end, len(mapped)))
+            for offset in range(self.HEADER.size, end, self.RECORD.size):
+                yield ReviewRecord(*self.RECORD.unpack_from(mapped, offset))
+
+    def records(self) -> List[ReviewRecord]:
+        """All records as a list"""
+        return list(self.replay())
+
+    def count(self) -> int:
+        """Number of complete records, including buffered ones"""
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        on_disk = max(self._valid_size(size) - self.HEADER.size, 0) // self.RECORD.size
+        return on_disk + len(self._buffer) // self.RECORD.size
+
+    def last_compacted(self) -> float:
+        """Unix time of the last compaction (or creation), 0 if unknown"""
+        if not os.path.exists(self.path) or os.path.getsize(self.path) < self.HEADER.size:
+            return 0.0
+        with open(self.path, 'rb') as f:
+            header = f.read(self.HEADER.size)
+        magic, version, record_size, compacted_at = self.HEADER.unpack(header)
+        return compacted_at if magic == self.MAGIC else 0.0
+
+    def compact(self, keep: Optional[Callable[[ReviewRecord], bool]] = None) -> int:
+        """Rewrite the log atomically, sorted by time, without torn or unwanted records
+
+        keep: optional predicate, records it rejects are dropped
+        Returns the number of records removed. Records appended while the
+        log is rewritten are carried over unfiltered.
+        """
+        with self._lock:
+            self.flush()
+            end = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        records = list(self.replay(end))
+
+        kept = [record for record in records if keep is None or keep(record)]
+        kept.sort(key=lambda record: record.timestamp)
+
+        tmp_path = self.path + '.tmp'
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            f.write(self.HEADER.pack(self.MAGIC, self.VERSION, self.RECORD.size, time.time()))
+            for record in kept:
+                f.write(self.RECORD.pack(*record))
+
+        with self._lock:
+            self.close()  # The rewritten file replaces the one open for appending
+            start = self._valid_size(end)
+            if start >= self.HEADER.size:
+                with open(self.path, 'rb') as src, open(tmp_path, 'ab') as dst:
+                    src.seek(start)
+                    appended = src.read()
+                    dst.write(appended[:len(appended) // self.RECORD.size * self.RECORD.size])
+            os.replace(tmp_path, self.path)
+        return len(records) - len(kept)
+
+    def compaction_due(self, interval_days: int = COMPACT_INTERVAL_DAYS) -> bool:
+        """Whether the last compaction is older than interval_days"""
+        if not os.path.exists(self.path):
+            return False
+        return time.time() - self.last_compacted() >= interval_days * 86400
+
+    def maybe_compact(self, keep: Optional[Callable[[ReviewRecord], bool]] = None,
+                      interval_days: int = COMPACT_INTERVAL_DAYS) -> bool:
+        """Compact if the last compaction is older than interval_days"""
+        if not self.compaction_due(interval_days):
+            return False
+        try:
+            removed = self.compact(keep)
+        except OSError as e:
+            print(f"Warning: Failed to compact review log: {str(e)}")
+            return False
+        if removed:
+            print(f"Review log compacted, {removed} records removed")
+        return True
@@ -0,0 +1,319 @@
+"""
+Pluggable spaced-repetition schedulers (Tick-8, SM-2, FSRS)
+"""
+
+import math
+from datetime import date
+from typing import Dict, Optional, Sequence, Tuple
+from services.deck_snapshot import DeckSnapshot
+
+MAX_STAGE = 8
+MAX_INTERVAL_DAYS = 36500
+NEVER = DeckSnapshot.NEVER
+
+class Scheduler:
+    """Owns due computation, priority and answer transitions of one algorithm
+
+    Every operation exists per card (on fetch_words dictionaries) and as a
+    batch method on a models.deck.DeckColumns, so deck-wide work (due counts,
+    session selection, forecasting) stays vectorized for every algorithm.
+    Days are epoch days (date.toordinal()).
+
+    Algorithms with per-card state store it in the Scheduler State column as
+    "<name>:<value>,<value>,..."; cards without state of this scheduler (new
+    cards, or cards last reviewed by another one) start from initial_state().
+    NumPy is only imported by the batch methods, so the per-card due check
+    stays cheap at startup.
+    """
+
+    name = ''
+    label = ''
+    STATE_FIELDS: Tuple[str, ...] = ()
+
+    # State
+
+    def initial_state(self, stage: int) -> Tuple[float, ...]:
+        """State of a card without state of its own, derived from its stage"""
+        return ()
+
+    def parse_state(self, text: str, stage: int = 0) -> Tuple[float, ...]:
+        """Decode a Scheduler State cell"""
+        prefix = self.name + ':'
+        if self.STATE_FIELDS and text and text.startswith(prefix):
+            try:
+                values = tuple(float(value) for value in text[len(prefix):].split(','))
+            except ValueError:
+                values = ()
+            if len(values) == len(self.STATE_FIELDS):
+                return values
+        return self.initial_state(stage)
+
+    def format_state(self, values: Sequence[float]) -> str:
+        """Encode state for the Scheduler State cell"""
+        if not self.STATE_FIELDS:
+            return ''
+        return self.name + ':' + ','.join(f"{float(value):.4g}" for value in values)
+
+    # Per card
+
+    def is_due_values(self, stage: int, last_day: int, due_day: int, today: int) -> bool:
+        """Due check on raw column values"""
+        raise NotImplementedError
+
+    def is_due(self, word: Dict, today: int) -> bool:
+        """Check if a card is due on the given day (never when suspended)"""
+        return not word.get('suspended') and self.is_due_values(
+            word.get('srs_stage', 0),
+            DeckSnapshot.to_epoch_day(word.get('last_practice_date', '')),
+            DeckSnapshot.to_epoch_day(word.get('due_date', '')),
+            today
+        )
+
+    def priority(self, word: Dict, today: int) -> float:
+        """Selection priority of a single card (higher is reviewed first)"""
+        from models.deck import DeckColumns
+        return float(self.priorities(DeckColumns.from_words([word], self), today)[0])
+
+    def answer(self, word: Dict, correct: bool, today: int) -> Dict:
+        """Fields of a card that change when it is answered on the given day"""
+        from models.deck import DeckColumns
+        deck = DeckColumns.from_words([word], self)
+        self.answer_batch(deck, [0], [correct], today)
+        return deck.row_updates(0, self)
+
+    # Batch
+
+    def due_mask(self, deck, today: int):
+        """Boolean array of the cards due on the given day"""
+        raise NotImplementedError
+
+    def retired_mask(self, deck):
+        """Boolean array of the cards this scheduler never shows again
+
+        Those can be archived out of the deck. None by default: interval
+        schedulers keep reviewing mastered cards at growing intervals.
+        """
+        import numpy as np
+        return np.zeros(len(deck), dtype=bool)
+
+    def review_mask(self, deck, today: int):
+        """Boolean array of the cards due on the given day and not suspended"""
+        return self.due_mask(deck, today) & ~deck.suspended
+
+    def priorities(self, deck, today: int):
+        """Selection priority of every card"""
+        raise NotImplementedError
+
+    def answer_batch(self, deck, indices, correct, today: int):
+        """Apply answers to the cards at indices (unique) in place"""
+        import numpy as np
+        indices = np.asarray(indices, dtype=np.int64)
+        correct = np.asarray(correct, dtype=bool)
+        self._transition(deck, indices, correct, today)
+        deck.failed[indices[~correct]] += 1
+        deck.last_day[indices] = today
+
+    def _transition(self, deck, indices, correct, today: int):
+        """Update stage and scheduler state; last_day still holds the previous review"""
+        raise NotImplementedError
+
+    def select(self, deck, today: int, limit: int):
+        """Indices of up to limit due cards, highest priority first
+
+        Ties keep deck order.
+        """
+        import numpy as np
+        due = np.flatnonzero(self.review_mask(deck, today))
+        if not len(due):
+            return due
+        order = np.argsort(-self.priorities(deck, today)[due], kind='stable')
+        return due[order[:limit]]
+
+class Tick8Scheduler(Scheduler):
+    """Tick-8: a card is due every day until it has been answered correctly
+    on eight consecutive reviews, a wrong answer starts it over
+    """
+
+    name = 'tick8'
+    label = 'Tick-8'
+
+    def is_due_values(self, stage: int, last_day: int, due_day: int, today: int) -> bool:
+        # New cards (NEVER) and cards practiced before today, unless mastered
+        return stage < MAX_STAGE and last_day < today
+
+    def due_mask(self, deck, today: int):
+        return (deck.stage < MAX_STAGE) & (deck.last_day < today)
+
+    def retired_mask(self, deck):
+        """Mastered cards are never due again"""
+        return deck.stage >= MAX_STAGE
+
+    def priorities(self, deck, today: int):
+        """Failed cards (stage 0, practiced before) first, then new cards, then
+        lower stages; more failures raise the priority
+        """
+        import numpy as np
+        is_new = deck.last_day == NEVER
+        score = np.where(deck.stage == 0, np.where(is_new, 1000, 2000), (10 - deck.stage) * 10)
+        return (score + deck.failed * 50).astype(np.float64)
+
+    def _transition(self, deck, indices, correct, today: int):
+        import numpy as np
+        stage = deck.stage[indices]
+        deck.stage[indices] = np.where(correct, np.minimum(stage + 1, MAX_STAGE), 0)
+
+class IntervalScheduler(Scheduler):
+    """Base for schedulers that store a due day per card
+
+    Cards without a due day (new, or coming from Tick-8) are due the day after
+    their last practice. Priority ranks failed cards, then new cards, then
+    the most urgent reviews by the algorithm's urgency (0 to 1).
+    """
+
+    def is_due_values(self, stage: int, last_day: int, due_day: int, today: int) -> bool:
+        if due_day != NEVER:
+            return due_day <= today
+        return last_day < today
+
+    def due_days(self, deck, today: int):
+        """Effective due day of every card"""
+        import numpy as np
+        return np.where(deck.due_day != NEVER, deck.due_day,
+                        np.where(deck.last_day == NEVER, today, deck.last_day + 1))
+
+    def due_mask(self, deck, today: int):
+        return self.due_days(deck, today) <= today
+
+    def priorities(self, deck, today: int):
+        import numpy as np
+        is_new = deck.last_day == NEVER
+        score = np.where(deck.stage == 0, np.where(is_new, 1000, 2000), self._urgency(deck, today) * 999)
+        return score + deck.failed * 50
+
+    def _urgency(self, deck, today: int):
+        raise NotImplementedError
+
+    def _schedule(self, deck, indices, intervals, today: int):
+        import numpy as np
+        intervals = np.clip(np.round(intervals), 1, MAX_INTERVAL_DAYS).astype(np.int64)
+        deck.due_day[indices] = today + intervals
+        return intervals
+
+class SM2Scheduler(IntervalScheduler):
+    """SuperMemo-2 with binary grading (correct = 4, wrong = 1)
+
+    Intervals go 1, 6, then grow by the card's ease factor, which drops on
+    every wrong answer (not below 1.3). A wrong answer restarts the intervals.
+    The stage shown in the app counts consecutive correct answers.
+    """
+
+    name = 'sm2'
+    label = 'SM-2'
+    STATE_FIELDS = ('ease', 'interval', 'repetitions')
+    INITIAL_EASE = 2.5
+    MIN_EASE = 1.3
+    PASS_GRADE = 4
+    FAIL_GRADE = 1
+
+    def initial_state(self, stage: int) -> Tuple[float, ...]:
+        # Tick-8 stage n means n correct days in a row
+        return (self.INITIAL_EASE, float(2 ** (stage - 1)) if stage > 0 else 0.0, float(stage))
+
+    def _urgency(self, deck, today: int):
+        import numpy as np
+        overdue = np.maximum(today - self.due_days(deck, today), 0)
+        return overdue / (overdue + np.maximum(deck.state[:, 1], 1))
+
+    def _transition(self, deck, indices, correct, today: int):
+        import numpy as np
+        ease, interval, repetitions = deck.state[indices].T
+        grade = np.where(correct, self.PASS_GRADE, self.FAIL_GRADE)
+
+        repetitions = np.where(correct, repetitions + 1, 0)
+        interval = np.where(repetitions <= 1, 1,
+                            np.where(repetitions == 2, 6, np.maximum(interval, 1) * ease))
+        ease = np.maximum(ease + 0.1 - (5 - grade) * (0.08 + (5 - grade) * 0.02), self.MIN_EASE)
+
+        interval = self._schedule(deck, indices, interval, today)
+        deck.state[indices] = np.stack([ease, interval, repetitions], axis=1)
+        deck.stage[indices] = np.minimum(repetitions, MAX_STAGE)
+
+class FSRSScheduler(IntervalScheduler):
+    """FSRS-4.5 style scheduler with binary grading (correct = Good, wrong = Again)
+
+    Each card carries a memory stability (days until recall probability
+    drops to 90%) and a difficulty (1-10). Reviews are scheduled for the day
+    the predicted recall probability reaches DESIRED_RETENTION, and the most
+    forgotten cards are reviewed first.
+    """
+
+    name = 'fsrs'
+    label = 'FSRS'
+    STATE_FIELDS = ('stability', 'difficulty')
+    WEIGHTS = (0.4872, 1.4003, 3.7145, 13.8206, 5.1618, 1.2298, 0.8975, 0.031, 1.6474,
+               0.1367, 1.0461, 2.1072, 0.0793, 0.3246, 1.587, 0.2272, 2.8755)
+    DESIRED_RETENTION = 0.9
+    DECAY = -0.5
+    FACTOR = 19 / 81  # Makes retrievability 0.9 after `stability` days
+    AGAIN = 1
+    GOOD = 3
+
+    def initial_state(self, stage: int) -> Tuple[float, ...]:
+        # Stability 0 marks a card FSRS has not seen yet
+        return (float(2 ** (stage - 1)), 5.0) if stage > 0 else (0.0, 0.0)
+
+    def _retrievability(self, elapsed, stability):
+        import numpy as np
+        return (1 + self.FACTOR * np.maximum(elapsed, 0) / np.maximum(stability, 0.01)) ** self.DECAY
+
+    def _initial_difficulty(self, grade):
+        w = self.WEIGHTS
+        return w[4] - (grade - 3) * w[5]
+
+    def _urgency(self, deck, today: int):
+        import numpy as np
+        stability = deck.state[:, 0]
+        elapsed = np.where(deck.last_day == NEVER, 0, today - deck.last_day)
+        return np.where(stability > 0, 1 - self._retrievability(elapsed, stability), 1.0)
+
+    def _transition(self, deck, indices, correct, today: int):
+        import numpy as np
+        w = self.WEIGHTS
+        stability, difficulty = deck.state[indices].T
+        grade = np.where(correct, self.GOOD, self.AGAIN)
+        first = stability <= 0
+
+        last_day = deck.last_day[indices]
+        retrievability = self._retrievability(np.where(last_day == NEVER, 0, today - last_day), stability)
+        s = np.maximum(stability, 0.01)
+        d = np.clip(difficulty, 1, 10)
+
+        recalled = s * (1 + math.exp(w[8]) * (11 - d) * s ** -w[9] *
+                        (np.exp(w[10] * (1 - retrievability)) - 1))
+        forgot = np.minimum(w[11] * d ** -w[12] * ((s + 1) ** w[13] - 1) *
+                            np.exp(w[14] * (1 - retrievability)), s)
+        next_difficulty = d - w[6] * (grade - 3)
+        next_difficulty = w[7] * self._initial_difficulty(4) + (1 - w[7]) * next_difficulty
+
+        stability = np.where(first, np.where(correct, w[2], w[0]), np.where(correct, recalled, forgot))
+        difficulty = np.clip(np.where(first, self._initial_difficulty(grade), next_difficulty), 1, 10)
+
+        intervals = stability / self.FACTOR * (self.DESIRED_RETENTION ** (1 / self.DECAY) - 1)
+        self._schedule(deck, indices, intervals, today)
+        deck.state[indices] = np.stack([stability, difficulty], axis=1)
+        deck.stage[indices] = np.where(correct, np.minimum(deck.stage[indices] + 1, MAX_STAGE), 0)
+
+SCHEDULERS = {cls.name: cls for cls in (Tick8Scheduler, SM2Scheduler, FSRSScheduler)}
+DEFAULT_SCHEDULER = Tick8Scheduler.name
+
+def get_scheduler(name: Optional[str] = None) -> Scheduler:
+    """Scheduler registered under name, Tick-8 by default"""
+    scheduler_class = SCHEDULERS.get(name or DEFAULT_SCHEDULER)
+    if scheduler_class is None:
+        print(f"Warning: Unknown scheduler '{name}', using {Tick8Scheduler.label}")
+        scheduler_class = Tick8Scheduler
+    return scheduler_class()
+
+def today_day() -> int:
+    """Today's epoch day"""
+    return date.today().toordinal()
@@ -0,0 +1,193 @@
+"""
+Trigram index for instant substring search over card text
+"""
+
+from typing import Dict, Iterable, List, Tuple
+import numpy as np
+
+class TrigramIndex:
+    """Positional trigram index over the front and back of every card
+
+    Card texts are packed into one code point array. For every distinct
+    trigram the index keeps the offsets where it occurs, so a query only
+    looks at the occurrences of its rarest trigram and confirms each one by
+    comparing the code points that follow, all vectorized. Queries shorter
+    than a trigram compare the code point array directly. Matching is
+    case-insensitive.
+
+    Keys are any ints (the deck browser uses positions in words_data).
+    Cards added, changed or removed after packing are kept in a small
+    pending set that is searched by scanning, and folded into the packed
+    arrays once it grows past MERGE_AT or 1/MERGE_FRACTION of the deck.
+    """
+
+    N = 3
+    MERGE_AT = 1024
+    MERGE_FRACTION = 16
+    _BITS = 21  # Unicode code points fit 21 bits, three of them one int64
+
+    def __init__(self, items: Iterable[Tuple[int, str]] = ()):
+        self._pending: Dict[int, str] = {}  # key -> normalized text, not packed yet
+        self._stale = set()                 # Packed keys removed or re-added since packing
+        self._pack([(key, self.normalize(text)) for key, text in items])
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return text.casefold().replace('\x00', '')
+
+    @staticmethod
+    def card_text(word: Dict) -> str:
+        """Searchable text of a card, front and back"""
+        return f"{word.get('front', '')}\n{word.get('back', '')}"
+
+    @classmethod
+    def from_words(cls, words: List[Dict], start: int = 0) -> 'TrigramIndex':
+        """Index fetch_words-style dictionaries by their position"""
+        return cls((i, cls.card_text(word)) for i, word in enumerate(words, start))
+
+    def _pack(self, items: List[Tuple[int, str]]):
+        """Build the packed arrays from (key, normalized text) pairs"""
+        items = sorted(items)
+        self._keys = np.fromiter((key for key, _ in items), dtype=np.int64, count=len(items))
+        self._slots = {key: slot for slot, key in enumerate(self._keys.tolist())}
+        # Every text is followed by a NUL, so no trigram spans two cards
+        self._corpus = ''.join(f"{text}\x00" for _, text in items)
+        lengths = np.fromiter((len(text) + 1 for _, text in items), dtype=np.int64, count=len(items))
+        self._starts = np.concatenate(([0], np.cumsum(lengths)))
+        self._chars = np.frombuffer(self._corpus.encode('utf-32-le'), dtype=np.uint32)
+        self._slot_of = np.repeat(np.arange(len(items), dtype=np.int32), lengths)
+
+        chars = self._chars
+        offsets = np.flatnonzero((chars[:-2] != 0) & (chars[1:-1] != 0) & (chars[2:] != 0)).astype(np.int32)
+        # Built in place, this is the peak of memory use for a large deck
+        codes = chars[offsets].astype(np.int64)
+        codes <<= self._BITS
+        codes |= chars[offsets + 1]
+        codes <<= self._BITS
+        codes |= chars[offsets + 2]
+        order = np.argsort(codes)
+        self._offsets = offsets[order]
+        del offsets
+        codes = codes[order]
+        del order
+        bounds = np.flatnonzero(np.diff(codes)) + 1
+        self._grams = codes[np.concatenate(([0], bounds))] if len(codes) else codes
+        self._bounds = np.concatenate(([0], bounds, [len(codes)]))
+        self._pending.clear()
+        self._stale.clear()
+
+    def _packed_text(self, slot: int) -> str:
+        return self._corpus[self._starts[slot]:self._starts[slot + 1] - 1]
+
+    def _merge(self):
+        """Fold pending changes into the packed arrays"""
+        items = [(key, self._packed_text(slot)) for key, slot in self._slots.items() if key not in self._stale]
+        items.extend(self._pending.items())
+        self._pack(items)
+
+    def __len__(self) -> int:
+        return len(self._slots) - len(self._stale) + len(self._pending)
+
+    def __contains__(self, key: int) -> bool:
+        return key in self._pending or (key in self._slots and key not in self._stale)
+
+    def add(self, key: int, text: str):
+        """Index a card, replacing its previous text if it was indexed"""
+        self.add_many([(key, text)])
+
+    def add_many(self, items: Iterable[Tuple[int, str]]):
+        """Index (key, text) pairs, e.g. cards appended to the deck"""
+        for key, text in items:
+            if key in self._slots:
+                self._stale.add(key)
+            self._pending[key] = self.normalize(text)
+        if len(self._pending) > max(self.MERGE_AT, len(self._slots) // self.MERGE_FRACTION):
+            self._merge()
+
+    def remove(self, key: int):
+        """Drop a card from the index, if indexed"""
+        self._pending.pop(key, None)
+        if key in self._slots:
+            self._stale.add(key)
+
+    def update(self, key: int, text: str):
+        """Re-index a card whose text changed"""
+        if key in self._pending:
+            current = self._pending[key]
+        elif key in self._slots and key not in self._stale:
+            current = self._packed_text(self._slots[key])
+        else:
+            current = None
+        if current != self.normalize(text):
+            self.add(key, text)
+
+    def _code(self, gram: str) -> int:
+        return (ord(gram[0]) << (2 * self._BITS)) | (ord(gram[1]) << self._BITS) | ord(gram[2])
+
+    def _short_hits(self, query: str) -> np.ndarray:
+        """Per-slot match mask of a query shorter than a trigram
+        
+        Occurrences are the offsets of all trigrams starting with the query,
+        one contiguous run of the sorted index, plus the last characters of
+        each text where no trigram starts.
+        """
+        pad = self.N - len(query)
+        low = int(np.searchsorted(self._grams, self._code(query + '\x00' * pad)))
+        high = int(np.searchsorted(self._grams, self._code(query + '\U0010ffff' * pad), side='right'))
+        hit = np.zeros(len(self._keys), dtype=bool)
+        hit[self._slot_of[self._offsets[self._bounds[low]:self._bounds[high]]]] = True
+        
+        ends = self._starts[1:] - 1  # Offsets of the NUL after each text
+        for back in range(len(query), self.N):
+            starts = ends - back
+            tail = starts >= self._starts[:-1]
+            for j, char in enumerate(query):
+                tail &= self._chars[np.maximum(starts + j, 0)] == ord(char)
+            hit |= tail
+        return hit
+
+    def _match_offsets(self, query: str) -> np.ndarray:
+        """Corpus offsets where query starts"""
+        chars = self._chars
+
+        rarest = None
+        for shift in range(len(query) - self.N + 1):
+            code = self._code(query[shift:shift + self.N])
+            i = int(np.searchsorted(self._grams, code))
+            if i == len(self._grams) or self._grams[i] != code:
+                return np.zeros(0, dtype=np.int64)
+            count = self._bounds[i + 1] - self._bounds[i]
+            if rarest is None or count < rarest[0]:
+                rarest = (count, shift, i)
+
+        # Occurrences of the rarest trigram are the only candidate starts,
+        # keep those followed by the rest of the query
+        _, shift, i = rarest
+        starts = self._offsets[self._bounds[i]:self._bounds[i + 1]] - shift
+        starts = starts[(starts >= 0) & (starts + len(query) <= len(chars))]
+        for j, char in enumerate(query):
+            if not len(starts):
+                break
+            if shift <= j < shift + self.N:
+                continue
+            starts = starts[chars[starts + j] == ord(char)]
+        return starts
+
+    def search(self, query: str) -> np.ndarray:
+        """Sorted keys of the cards whose text contains query (all cards if empty)"""
+        query = self.normalize(query.strip())
+        if query and self._keys.size:
+            if len(query) < self.N:
+                hit = self._short_hits(query)
+            else:
+                hit = np.zeros(len(self._keys), dtype=bool)
+                hit[self._slot_of[self._match_offsets(query)]] = True
+            keys = self._keys[hit]
+        else:
+            keys = self._keys.copy()
+        if self._stale:
+            keys = keys[~np.isin(keys, np.fromiter(self._stale, dtype=np.int64, count=len(self._stale)))]
+        pending = [key for key, text in self._pending.items() if query in text]
+        if pending:
+            keys = np.union1d(keys, np.array(pending, dtype=np.int64))
+        return keys
@@ -0,0 +1,318 @@
+"""
+One deck sharded across several worksheets and spreadsheets
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence
+from services.dedup import DuplicateIndex
+from services.google_sheets import GoogleSheetsService, PartialAppendError
+from services import metrics
+
+class ShardedSheetsService(GoogleSheetsService):
+    """GoogleSheetsService over a deck split into several worksheets ("shards")
+
+    Shard 1 is the connected worksheet; shard N > 1 is the worksheet titled
+    "<title> Shard N" in its spreadsheet or in one of the extra shard
+    spreadsheets (each spreadsheet has its own cell limit). Rows get one
+    deck-wide number, (N - 1) * ROW_STRIDE + sheet row, so the rows of shard
+    1 keep their plain sheet numbers and everything that still falls back to
+    rows (cards without an ID, merges, archiving) works on a sharded deck.
+
+    Fetches run in parallel, one request per shard. Cell writes and row
+    deletions are grouped and batched per shard. New cards fill the first
+    shard (in shard order) with fewer than max_rows used rows; once every
+    shard is full, the next one is created in the last spreadsheet.
+    """
+
+    ROW_STRIDE = 10_000_000  # More rows than a spreadsheet can hold
+    MAX_SHARD_ROWS = 50000
+    MAX_PARALLEL_REQUESTS = 8
+    SHARD_SUFFIX = ' Shard '
+
+    def __init__(self, spreadsheet_id: Optional[str] = None, sheet_gid: Optional[str] = None,
+                 shard_spreadsheets: Sequence[str] = (), max_rows: int = MAX_SHARD_ROWS):
+        """shard_spreadsheets: ids of extra spreadsheets holding shards
+        max_rows: rows per shard before new cards go to another one
+        """
+        self.shard_spreadsheets = list(shard_spreadsheets)
+        self.max_rows = max(max_rows or self.MAX_SHARD_ROWS, 2)  # Header plus a card
+        self.extra_sheets = []
+        self.shards: Dict[int, GoogleSheetsService] = {}  # Shard number -> service
+        self._row_counts: Dict[int, int] = {}  # Shard number -> used rows, header included
+        super().__init__(spreadsheet_id, sheet_gid)
+
+    @classmethod
+    def from_config(cls, spreadsheet_id: str, sheet_gid: Optional[str], config) -> GoogleSheetsService:
+        """Connect to a deck with the shard settings of the configuration
+
+        A plain GoogleSheetsService unless shard spreadsheets are configured
+        or the spreadsheet has shard worksheets of the deck, so a deck on a
+        single worksheet pays nothing for sharding.
+        """
+        service = GoogleSheetsService(spreadsheet_id, sheet_gid or None)
+        shard_spreadsheets = config.get('shard_spreadsheets', [])
+        title = service.worksheet.title
+        if not shard_spreadsheets and not any(cls.shard_number(title, ws) for ws in service.worksheet_list):
+            return service
+        try:
+            extra_sheets = [service.client.open_by_key(key) for key in shard_spreadsheets]
+        except Exception as e:
+            raise Exception(f"Failed to open shard spreadsheets: {str(e)}")
+        sharded = cls.wrap(service, extra_sheets, config.get('shard_max_rows', cls.MAX_SHARD_ROWS))
+        sharded.shard_spreadsheets = list(shard_spreadsheets)
+        return sharded
+
+    @classmethod
+    def wrap(cls, service: GoogleSheetsService, extra_sheets: Sequence = (),
+             max_rows: int = MAX_SHARD_ROWS) -> 'ShardedSheetsService':
+        """Shard the deck of a connected service, e.g. one over an in-memory sheet"""
+        sharded = cls(max_rows=max_rows)
+        sharded.client, sharded.sheet, sharded.worksheet = service.client, service.sheet, service.worksheet
+        sharded.spreadsheet_id, sharded.sheet_gid = service.spreadsheet_id, service.sheet_gid
+        sharded.worksheet_list = service.worksheet_list
+        sharded.extra_sheets = list(extra_sheets)
+        sharded.discover_shards()
+        return sharded
+
+    def _connect(self):
+        super()._connect()
+        try:
+            self.extra_sheets = [self.client.open_by_key(spreadsheet_id)
+                                 for spreadsheet_id in self.shard_spreadsheets]
+        except Exception as e:
+            raise Exception(f"Failed to open shard spreadsheets: {str(e)}")
+        self.discover_shards()
+
+    @classmethod
+    def shard_number(cls, title: str, worksheet) -> int:
+        """N of a worksheet titled "<title> Shard N" with N > 1, 0 for any other"""
+        prefix = title + cls.SHARD_SUFFIX
+        number = worksheet.title[len(prefix):]
+        if worksheet.title.startswith(prefix) and number.isdigit() and int(number) > 1:
+            return int(number)
+        return 0
+
+    @metrics.instrumented('sheets.discover_shards')
+    def discover_shards(self):
+        """Find the shard worksheets of the connected one
+
+        Rows are counted later, by fetch_words() or the first append.
+        """
+        self.shards = {1: self._shard_service(self.sheet, self.worksheet)}
+        self._row_counts = {}
+        for sheet in [self.sheet] + self.extra_sheets:
+            # The connected spreadsheet was listed on connect
+            worksheets = self.worksheet_list if sheet is self.sheet and self.worksheet_list else sheet.worksheets()
+            for worksheet in worksheets:
+                number = self.shard_number(self.worksheet.title, worksheet)
+                if number:
+                    self.shards.setdefault(number, self._shard_service(sheet, worksheet))
+
+    def _count_missing_rows(self):
+        """Count the used rows of the shards no fetch or append counted yet"""
+        missing = [number for number in self.shards if number not in self._row_counts]
+        if missing:
+            self._row_counts.update(self._each(lambda shard, _: shard.used_rows(), dict.fromkeys(missing)))
+
+    def _shard_service(self, sheet, worksheet) -> GoogleSheetsService:
+        return GoogleSheetsService.for_worksheet(self.client, sheet, worksheet)
+
+    def _add_shard(self) -> int:
+        """Create the next shard worksheet in the last spreadsheet"""
+        number = max(self.shards) + 1
+        sheet = self.extra_sheets[-1] if self.extra_sheets else self.sheet
+        title = f"{self.worksheet.title}{self.SHARD_SUFFIX}{number}"
+        try:
+            worksheet = sheet.add_worksheet(title=title, rows=1, cols=len(self.HEADER))
+            worksheet.update([self.HEADER], 'A1', value_input_option='RAW')
+        except Exception as e:
+            raise Exception(f"Failed to create shard worksheet {title}: {str(e)}")
+        self.shards[number] = self._shard_service(sheet, worksheet)
+        self._row_counts[number] = 1
+        return number
+
+    # Row numbers
+
+    def row_base(self, row_index: int) -> int:
+        return row_index - row_index % self.ROW_STRIDE
+
+    def _split(self, row_index: int):
+        """Deck-wide row number -> (shard number, sheet row)"""
+        shard, row = divmod(row_index, self.ROW_STRIDE)
+        return shard + 1, row
+
+    def _group_rows(self, row_indices) -> Dict[int, List[int]]:
+        groups = {}
+        for row_index in row_indices:
+            number, row = self._split(row_index)
+            groups.setdefault(number, []).append(row)
+        return groups
+
+    def _group_words(self, words: List[Dict]) -> Dict[int, List[Dict]]:
+        """Copies of words with sheet rows, grouped by shard"""
+        groups = {}
+        for word in words:
+            number, row = self._split(word['row_index'])
+            groups.setdefault(number, []).append({**word, 'row_index': row})
+        return groups
+
+    def _each(self, func: Callable, items: Dict[int, object]) -> Dict[int, object]:
+        """Run func(shard service, item) for every shard number -> item, in parallel"""
+        results, errors = self._each_settled(func, items)
+        if errors:
+            raise next(iter(errors.values()))
+        return results
+
+    def _each_settled(self, func: Callable, items: Dict[int, object]):
+        """Like _each(), but every shard runs to the end: (results, exceptions) by shard number"""
+        results, errors = {}, {}
+        if len(items) <= 1:
+            for number, item in items.items():
+                try:
+                    results[number] = func(self.shards[number], item)
+                except Exception as e:
+                    errors[number] = e
+            return results, errors
+        with ThreadPoolExecutor(max_workers=min(len(items), self.MAX_PARALLEL_REQUESTS)) as pool:
+            futures = {number: pool.submit(func, self.shards[number], item) for number, item in items.items()}
+            for number, future in futures.items():
+                try:
+                    results[number] = future.result()
+                except Exception as e:
+                    errors[number] = e
+        return results, errors
+
+    def _count_rows(self, groups: Dict[int, list], done, sign: int):
+        """Adjust the row counts of the shards in done by the rows of their group"""
+        for number in done:
+            if number in self._row_counts:
+                self._row_counts[number] += sign * len(groups[number])
+
+    # GoogleSheetsService
+
+    @metrics.instrumented('sheets.fetch_shards')
+    def fetch_words(self) -> List[Dict]:
+        """Fetch the words of every shard in parallel, as one deck"""
+        if not self.is_connected():
+            raise Exception("Not connected to a Google Sheet")
+
+        results = self._each(lambda shard, _: shard.fetch_words(), dict.fromkeys(self.shards))
+        words = []
+        duplicate_index = DuplicateIndex()
+        for number in sorted(results):
+            base = (number - 1) * self.ROW_STRIDE
+            for word in results[number]:
+                word['row_index'] += base
+                duplicate_index.add(word['front'], word['back'], word['row_index'])
+                words.append(word)
+            if results[number]:
+                self._row_counts[number] = results[number][-1]['row_index'] - base
+        self.duplicate_index = duplicate_index
+        self.ids_labeled = self.shards[1].ids_labeled
+        # IDs are unique per shard, a card copied to another shard kept its one
+        self._drop_copied_ids(words)
+        return words
+
+    def fetch_row_map(self) -> Dict[str, int]:
+        """Deck-wide row of every card ID, the ID columns of all shards read in parallel"""
+        if not self.is_connected():
+            raise Exception("Not connected to a Google Sheet")
+        results = self._each(lambda shard, _: shard.fetch_row_map(), dict.fromkeys(self.shards))
+        rows = {}
+        for number in sorted(results):
+            base = (number - 1) * self.ROW_STRIDE
+            rows.update((card, base + row) for card, row in results[number].items())
+        return rows
+
+    def update_word_stats(self, row_index: int, correct: bool, new_stage: int,
+                          due_date: Optional[str] = None, scheduler_state: Optional[str] = None):
+        number, row = self._split(row_index)
+        self.shards[number].update_word_stats(row, correct, new_stage, due_date, scheduler_state)
+
+    def update_cells(self, cells: Dict[tuple, object]):
+        """Write cells with one batch per shard"""
+        if not self.is_connected() or not cells:
+            return
+        groups = {}
+        for (row_index, col), value in cells.items():
+            number, row = self._split(row_index)
+            groups.setdefault(number, {})[(row, col)] = value
+        self._each(lambda shard, shard_cells: shard.update_cells(shard_cells), groups)
+
+    def delete_rows(self, row_indices: List[int], worksheet=None):
+        """Delete rows with batched requests per shard"""
+        if not self.is_connected():
+            raise Exception("Not connected to a Google Sheet")
+        if worksheet is not None:
+            return super().delete_rows(row_indices, worksheet)
+        groups = {number: sorted(set(rows)) for number, rows in self._group_rows(row_indices).items()}
+        results, errors = self._each_settled(lambda shard, rows: shard.delete_rows(rows), groups)
+        self._count_rows(groups, results, -1)
+        if errors:
+            raise next(iter(errors.values()))
+
+    def ensure_header(self):
+        if not self.is_connected():
+            raise Exception("Not connected to a Google Sheet")
+        self._each(lambda shard, _: shard.ensure_header(), dict.fromkeys(self.shards))
+
+    @metrics.instrumented('sheets.append_shards')
+    def append_rows(self, rows: List[List]):
+        """Append rows to the first shards with room, in shard order
+
+        Shards whose append fails don't count the rows; if some shards wrote
+        their rows, raises PartialAppendError with the rest to retry.
+        """
+        if not self.is_connected():
+            raise Exception("Not connected to a Google Sheet")
+        if not rows:
+            return
+
+        self._count_missing_rows()
+        groups = {}
+        start = 0
+        for number in sorted(self.shards):
+            room = self.max_rows - self._row_counts[number]
+            if room > 0 and start < len(rows):
+                groups[number] = rows[start:start + room]
+                start += len(groups[number])
+        while start < len(rows):
+            number = self._add_shard()
+            groups[number] = rows[start:start + self.max_rows - self._row_counts[number]]
+            start += len(groups[number])
+
+        results, errors = self._each_settled(lambda shard, shard_rows: shard.append_rows(shard_rows), groups)
+        self._count_rows(groups, results, 1)
+        if errors:
+            error = next(iter(errors.values()))
+            if not results:
+                raise error
+            unwritten = [row for number in sorted(errors) for row in groups[number]]
+            raise PartialAppendError(f"Failed to append {len(unwritten)} rows to {len(errors)} shards: {str(error)}",
+                                     unwritten)
+
+    # Archive, one archive worksheet per shard
+
+    def fetch_archive(self) -> List[Dict]:
+        results = self._each(lambda shard, _: shard.fetch_archive(), dict.fromkeys(self.shards))
+        words = []
+        for number in sorted(results):
+            for word in results[number]:
+                word['row_index'] += (number - 1) * self.ROW_STRIDE
+                words.append(word)
+        return words
+
+    def archive_rows(self, words: List[Dict]):
+        groups = self._group_words(words)
+        results, errors = self._each_settled(lambda shard, shard_words: shard.archive_rows(shard_words), groups)
+        self._count_rows(groups, results, -1)
+        if errors:
+            raise next(iter(errors.values()))
+
+    def restore_rows(self, words: List[Dict]):
+        """Move archived words back to the shards they were archived from"""
+        groups = self._group_words(words)
+        results, errors = self._each_settled(lambda shard, shard_words: shard.restore_rows(shard_words), groups)
+        self._count_rows(groups, results, 1)
+        if errors:
+            raise next(iter(errors.values()))
@@ -0,0 +1,51 @@
+"""
+Per-phase startup timing
+"""
+
+import time
+from typing import List, Tuple, Optional
+
+class StartupTimer:
+    """Records how long each startup phase takes"""
+
+    def __init__(self, started_at: Optional[float] = None, budget_ms: int = 0):
+        """Initialize the timer
+
+        budget_ms: startup budget in milliseconds, 0 disables budget checks
+        """
+        self.started_at = started_at if started_at is not None else time.perf_counter()
+        self.budget_ms = budget_ms
+        self.phases: List[Tuple[str, float]] = []
+        self._last = self.started_at
+        self.reported = False
+
+    def mark(self, phase: str):
+        """Close the current phase under the given name"""
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self._last) * 1000))
+        self._last = now
+
+    def elapsed_ms(self) -> float:
+        """Total time since the process started"""
+        return (self._last - self.started_at) * 1000
+
+    def report(self, detail: str = ''):
+        """Print the phase breakdown, warning when over budget"""
+        if self.reported:
+            return
+        self.reported = True
+
+        total = self.elapsed_ms()
+        suffix = f" ({detail})" if detail else ''
+        print(f"Startup: home screen interactive in {total:.0f} ms{suffix}")
+
+        if not self.budget_ms:
+            return
+
+        for phase, duration in self.phases:
+            print(f"  {phase:<20} {duration:8.1f} ms")
+
+        if total > self.budget_ms:
+            slowest, slowest_ms = max(self.phases, key=lambda p: p[1])
+            print(f"Warning: Startup exceeded budget of {self.budget_ms} ms "
+                  f"by {total - self.budget_ms:.0f} ms (slowest phase: {slowest}, {slowest_ms:.0f} ms)")
@@ -0,0 +1,181 @@
+"""
+Span tracing exported in the Chrome trace event format
+
+Traces open in chrome://tracing or https://ui.perfetto.dev and show one
+timeline row per thread. Disabled by default; while disabled span() returns
+a shared no-op object.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+class Span:
+    """One timed region, recorded as a complete ("X") event when finished"""
+
+    __slots__ = ('tracer', 'name', 'category', 'args', 'started', 'tid', 'finished')
+
+    def __init__(self, tracer: 'Tracer', name: str, category: str, args: Optional[Dict]):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.started = 0.0
+        self.tid = 0
+        self.finished = False
+
+    def start(self) -> 'Span':
+        self.tid = threading.get_native_id()
+        self.started = time.perf_counter()
+        return self
+
+    def finish(self, **args):
+        """End the span, extra keyword arguments are attached to the event"""
+        if self.finished:
+            return
+        self.finished = True
+        ended = time.perf_counter()
+        if args:
+            self.args = {**(self.args or {}), **args}
+        self.tracer._record_span(self, ended)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.finish(error=exc_type.__name__)
+        else:
+            self.finish()
+        return False
+
+class _NullSpan:
+    __slots__ = ()
+
+    def start(self):
+        return self
+
+    def finish(self, **args):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class Tracer:
+    """Process-wide span recorder"""
+
+    def __init__(self, max_events: int = 500000):
+        self.enabled = False
+        self.max_events = max_events
+        self.dropped = 0
+        self._events: List[Dict] = []
+        self._thread_names: Dict[int, str] = {}
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def span(self, name: str, category: Optional[str] = None, **args):
+        """Context manager tracing a block (category defaults to the name prefix)"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, category or name.split('.')[0], args or None)
+
+    def start_span(self, name: str, category: Optional[str] = None, **args):
+        """Start a span that is finished later, e.g. from an animation callback"""
+        return self.span(name, category, **args).start()
+
+    def instant(self, name: str, category: Optional[str] = None, **args):
+        """Record a zero-length marker"""
+        if not self.enabled:
+            return
+        event = {
+            'name': name,
+            'cat': category or name.split('.')[0],
+            'ph': 'i',
+            's': 't',
+            'ts': self._micros(time.perf_counter()),
+            'pid': self._pid,
+            'tid': threading.get_native_id()
+        }
+        if args:
+            event['args'] = args
+        self._append(event)
+
+    def name_thread(self, name: str):
+        """Label the calling thread in the timeline (Qt threads show up as Dummy-N otherwise)"""
+        with self._lock:
+            self._thread_names[threading.get_native_id()] = name
+
+    def _micros(self, perf_time: float) -> float:
+        return round((perf_time - self._origin) * 1000000, 3)
+
+    def _record_span(self, span: Span, ended: float):
+        event = {
+            'name': span.name,
+            'cat': span.category,
+            'ph': 'X',
+            'ts': self._micros(span.started),
+            'dur': round((ended - span.started) * 1000000, 3),
+            'pid': self._pid,
+            'tid': span.tid
+        }
+        if span.args:
+            event['args'] = span.args
+        self._append(event)
+
+    def _append(self, event: Dict):
+        with self._lock:
+            if len(self._events) >= self.max_events:
+                self.dropped += 1
+                return
+            self._events.append(event)
+            tid = event['tid']
+            if tid not in self._thread_names:
+                self._thread_names[tid] = threading.current_thread().name
+
+    def clear(self):
+        with self._lock:
+            self._events.clear()
+            self._thread_names.clear()
+            self.dropped = 0
+
+    def event_count(self) -> int:
+        return len(self._events)
+
+    def to_chrome_trace(self) -> Dict:
+        """Trace events plus process/thread name metadata"""
+        with self._lock:
+            events = list(self._events)
+            thread_names = dict(self._thread_names)
+            dropped = self.dropped
+
+        metadata = [{'name': 'process_name', 'ph': 'M', 'pid': self._pid, 'tid': 0,
+                     'args': {'name': 'FlashTick'}}]
+        for tid, thread_name in thread_names.items():
+            metadata.append({'name': 'thread_name', 'ph': 'M', 'pid': self._pid, 'tid': tid,
+                             'args': {'name': thread_name}})
+
+        return {
+            'traceEvents': metadata + events,
+            'displayTimeUnit': 'ms',
+            'otherData': {'dropped_events': dropped}
+        }
+
+    def write(self, path: str):
+        """Write the trace as Chrome/Perfetto-compatible JSON"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.to_chrome_trace(), f)
+
+tracer = Tracer()
+
+def span(name: str, category: Optional[str] = None, **args):
+    """Trace a block with the process-wide tracer"""
+    return tracer.span(name, category, **args)
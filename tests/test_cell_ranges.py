@@ -0,0 +1,42 @@
+"""
+Coalescing of cell writes into values.batchUpdate ranges
+"""
+
+from benchmarks.fake_sheets import FakeSheetsService
+from services.google_sheets import GoogleSheetsService
+
+HEADER = ['Front', 'Back', 'Last Practice Date', 'SRS Stage', 'Number of Failed']
+
+def test_block_becomes_one_rectangle():
+    cells = {(row, col): f"{row}:{col}" for row in range(2, 5) for col in (3, 4, 5)}
+    assert GoogleSheetsService.cell_ranges(cells) == [{
+        'range': 'C2:E4',
+        'values': [['2:3', '2:4', '2:5'], ['3:3', '3:4', '3:5'], ['4:3', '4:4', '4:5']]
+    }]
+
+def test_single_cell_has_no_span():
+    assert GoogleSheetsService.cell_ranges({(7, 2): 'x'}) == [{'range': 'B7', 'values': [['x']]}]
+
+def test_gaps_split_runs():
+    cells = {(2, 4): 1, (3, 4): 2, (5, 4): 3}
+    assert GoogleSheetsService.cell_ranges(cells) == [
+        {'range': 'D2:D3', 'values': [[1], [2]]},
+        {'range': 'D5', 'values': [[3]]}
+    ]
+
+def test_columns_merge_only_over_the_same_rows():
+    cells = {(2, 3): 'a', (3, 3): 'b', (2, 4): 'c', (3, 4): 'd', (4, 4): 'e'}
+    ranges = GoogleSheetsService.cell_ranges(cells)
+    assert sorted(cell_range['range'] for cell_range in ranges) == ['C2:C3', 'D2:D4']
+
+def test_separate_columns_are_not_merged():
+    cells = {(2, 3): 'a', (2, 5): 'b'}
+    assert [cell_range['range'] for cell_range in GoogleSheetsService.cell_ranges(cells)] == ['C2', 'E2']
+
+def test_update_cells_writes_block_in_one_request():
+    rows = [HEADER] + [[f"front {i}", f"back {i}", '', '0', '0'] for i in range(10)]
+    service = FakeSheetsService(rows)
+    service.update_cells({(row, col): 'x' for row in range(3, 8) for col in (3, 4)})
+    assert service.worksheet.request_count == 1
+    assert [row[2:4] for row in service.worksheet.rows[2:7]] == [['x', 'x']] * 5
+    assert service.worksheet.rows[1][2:4] == ['', '0']
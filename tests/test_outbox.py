@@ -0,0 +1,91 @@
+"""
+Write-behind outbox: ID-to-row resolution, unplaced cells and persistence
+"""
+
+import pytest
+
+from benchmarks.fake_sheets import FakeSheetsService
+from services.google_sheets import GoogleSheetsService
+from services.outbox import Outbox
+
+STAGE = 4  # SRS Stage column
+
+def make_sheet(count: int = 4) -> FakeSheetsService:
+    rows = [list(GoogleSheetsService.HEADER)]
+    rows += [[f"front {i}", f"back {i}", '', '0', '0', '', '', '', f"id{i}"] for i in range(count)]
+    return FakeSheetsService(rows)
+
+def stage_of(sheet: FakeSheetsService, card_id: str) -> str:
+    return next(row[STAGE - 1] for row in sheet.worksheet.rows if row[8] == card_id)
+
+def make_outbox(tmp_path, source_key: str = 'sheet:') -> Outbox:
+    return Outbox(source_key, str(tmp_path / 'outbox.json'))
+
+def test_cells_follow_cards_to_their_current_rows(tmp_path):
+    sheet = make_sheet()
+    outbox = make_outbox(tmp_path)
+    outbox.put({('id1', STAGE): 5, ('id3', STAGE): 7})
+
+    # Sorted in the sheet after the answers were queued
+    header, *rows = sheet.worksheet.rows
+    sheet.worksheet.rows[:] = [header] + rows[::-1]
+
+    assert outbox.flush(sheet) == 2
+    assert (stage_of(sheet, 'id1'), stage_of(sheet, 'id3')) == ('5', '7')
+    assert stage_of(sheet, 'id0') == '0'
+    assert outbox.pending_count() == 0
+
+def test_row_keyed_cells_are_written_by_row(tmp_path):
+    sheet = make_sheet()
+    outbox = make_outbox(tmp_path)
+    outbox.put({(3, STAGE): 2})
+    assert outbox.flush(sheet) == 1
+    assert sheet.worksheet.rows[2][STAGE - 1] == '2'
+
+def test_unplaced_cells_stay_queued_until_discarded(tmp_path):
+    sheet = make_sheet()
+    outbox = make_outbox(tmp_path)
+    outbox.put({('id0', STAGE): 1, ('gone', STAGE): 4})
+
+    assert outbox.flush(sheet) == 1
+    assert stage_of(sheet, 'id0') == '1'
+    assert outbox.pending_count() == 1
+    assert make_outbox(tmp_path).pending_count() == 1  # Saved to disk
+
+    words = sheet.fetch_words()
+    assert outbox.discard_missing(words) == 1
+    assert outbox.pending_count() == 0
+
+def test_later_write_replaces_queued_one(tmp_path):
+    sheet = make_sheet()
+    outbox = make_outbox(tmp_path)
+    outbox.put({('id2', STAGE): 1})
+    outbox.put({('id2', STAGE): 3})
+    assert outbox.pending_count() == 1
+    assert outbox.flush(sheet) == 1
+    assert stage_of(sheet, 'id2') == '3'
+
+def test_failed_flush_keeps_cells(tmp_path):
+    sheet = make_sheet()
+    outbox = make_outbox(tmp_path)
+    outbox.put({('id0', STAGE): 1})
+
+    def fail(data, **kwargs):
+        raise OSError("offline")
+    sheet.worksheet.batch_update = fail
+    with pytest.raises(Exception, match="offline"):
+        outbox.flush(sheet)
+    assert outbox.pending_count() == 1
+
+def test_apply_to_overlays_queued_cells(tmp_path):
+    sheet = make_sheet()
+    outbox = make_outbox(tmp_path)
+    outbox.put({('id1', STAGE): 6, (4, STAGE): 2})
+    words = sheet.fetch_words()
+    assert outbox.apply_to(words, {'srs_stage': STAGE}) == 2
+    assert [word['srs_stage'] for word in words] == [0, 6, 2, 0]
+
+def test_cells_of_another_sheet_are_discarded(tmp_path):
+    make_outbox(tmp_path, 'one:').put({('id0', STAGE): 1})
+    assert make_outbox(tmp_path, 'one:').pending_count() == 1
+    assert make_outbox(tmp_path, 'two:').pending_count() == 0
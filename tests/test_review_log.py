@@ -0,0 +1,91 @@
+"""
+Fixed-width review log: record format, torn records and compaction
+"""
+
+import os
+import time
+from datetime import date
+
+from services.review_log import CORRECT, INCORRECT, SKIPPED, ReviewLog
+
+T0 = 1_770_000_000.0
+
+def make_log(tmp_path, **kwargs) -> ReviewLog:
+    return ReviewLog(str(tmp_path / 'review_log.bin'), **kwargs)
+
+def test_fixed_width_layout(tmp_path):
+    log = make_log(tmp_path)
+    assert (log.HEADER.size, log.RECORD.size) == (24, 28)
+    for i in range(5):
+        log.append(i, CORRECT, 0, 1, timestamp=T0 + i)
+    log.flush()
+    assert os.path.getsize(log.path) == log.HEADER.size + 5 * log.RECORD.size
+
+    with open(log.path, 'rb') as f:
+        magic, version, record_size, compacted_at = log.HEADER.unpack(f.read(log.HEADER.size))
+    assert (magic, version, record_size) == (ReviewLog.MAGIC, ReviewLog.VERSION, log.RECORD.size)
+    assert compacted_at > 0
+
+def test_records_round_trip(tmp_path):
+    log = make_log(tmp_path)
+    log.append(2**64 - 1, INCORRECT, 3, 0, response_ms=1234, timestamp=T0)
+    log.append(7, SKIPPED, 0, 0, response_ms=-5, timestamp=T0 + 60)
+    first, second = log.records()
+    assert first.card_id == 2**64 - 1
+    assert first.timestamp == T0
+    assert first.epoch_day == date.fromtimestamp(T0).toordinal()
+    assert (first.response_ms, first.outcome, first.old_stage, first.new_stage) == (1234, INCORRECT, 3, 0)
+    assert (second.card_id, second.response_ms, second.outcome) == (7, 0, SKIPPED)
+
+def test_buffered_records_count(tmp_path):
+    log = make_log(tmp_path, buffer_records=4)
+    for i in range(3):
+        log.append(i, CORRECT, 0, 1, timestamp=T0)
+    assert not os.path.exists(log.path)
+    assert log.count() == 3
+    log.append(3, CORRECT, 0, 1, timestamp=T0)
+    assert os.path.getsize(log.path) == log.HEADER.size + 4 * log.RECORD.size
+
+def test_torn_record_is_ignored_and_dropped(tmp_path):
+    log = make_log(tmp_path)
+    log.append(1, CORRECT, 0, 1, timestamp=T0)
+    log.close()
+    with open(log.path, 'ab') as f:
+        f.write(b'\x01' * (log.RECORD.size // 2))  # Crash in the middle of a write
+    assert [record.card_id for record in log.records()] == [1]
+    assert log.count() == 1
+
+    log.append(2, CORRECT, 1, 2, timestamp=T0 + 1)
+    log.flush()
+    assert [record.card_id for record in log.records()] == [1, 2]
+    assert os.path.getsize(log.path) == log.HEADER.size + 2 * log.RECORD.size
+
+def test_compact_filters_and_sorts(tmp_path):
+    log = make_log(tmp_path)
+    for card_id, offset in [(1, 30), (2, 10), (1, 20), (3, 0)]:
+        log.append(card_id, CORRECT, 0, 1, timestamp=T0 + offset)
+    assert log.compact(lambda record: record.card_id != 2) == 1
+    assert [(record.card_id, record.timestamp) for record in log.records()] == [
+        (3, T0), (1, T0 + 20), (1, T0 + 30)
+    ]
+    assert os.path.getsize(log.path) == log.HEADER.size + 3 * log.RECORD.size
+
+def test_appends_continue_after_compaction(tmp_path):
+    log = make_log(tmp_path, buffer_records=1)
+    log.append(1, CORRECT, 0, 1, timestamp=T0)
+    log.compact()
+    log.append(2, CORRECT, 1, 2, timestamp=T0 + 1)
+    log.close()
+    assert [record.card_id for record in make_log(tmp_path).records()] == [1, 2]
+
+def test_maybe_compact_follows_the_interval(tmp_path):
+    log = make_log(tmp_path)
+    assert not log.compaction_due()
+    log.append(1, CORRECT, 0, 1, timestamp=T0)
+    log.flush()
+    assert not log.maybe_compact(interval_days=1)
+
+    before = time.time()
+    assert log.maybe_compact(interval_days=0)
+    assert log.last_compacted() >= before
+    assert not log.compaction_due(interval_days=1)
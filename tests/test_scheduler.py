@@ -0,0 +1,100 @@
+"""
+Due checks and answer transitions of the schedulers
+"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from services.scheduler import MAX_STAGE, Tick8Scheduler, get_scheduler
+
+TODAY = date(2026, 3, 2)
+DAY = TODAY.toordinal()
+
+def new_word(**fields) -> dict:
+    word = {'row_index': 2, 'front': 'hallo', 'back': 'hello', 'last_practice_date': '',
+            'srs_stage': 0, 'failed_count': 0, 'due_date': '', 'scheduler_state': ''}
+    word.update(fields)
+    return word
+
+def answer(scheduler, word: dict, correct: bool, day: int = DAY) -> dict:
+    word.update(scheduler.answer(word, correct, day))
+    return word
+
+def days_until(word: dict, day: int = DAY) -> int:
+    return date.fromisoformat(word['due_date']).toordinal() - day
+
+def test_unknown_name_falls_back_to_tick8():
+    assert isinstance(get_scheduler('nope'), Tick8Scheduler)
+    assert isinstance(get_scheduler(), Tick8Scheduler)
+
+def test_tick8_due_every_day_until_mastered():
+    scheduler = get_scheduler('tick8')
+    yesterday = (TODAY - timedelta(days=1)).isoformat()
+    assert scheduler.is_due(new_word(), DAY)
+    assert scheduler.is_due(new_word(last_practice_date=yesterday, srs_stage=3), DAY)
+    assert not scheduler.is_due(new_word(last_practice_date=TODAY.isoformat(), srs_stage=3), DAY)
+    assert not scheduler.is_due(new_word(last_practice_date=yesterday, srs_stage=MAX_STAGE), DAY)
+    assert not scheduler.is_due(new_word(suspended=True), DAY)
+
+def test_tick8_transitions():
+    scheduler = get_scheduler('tick8')
+    word = new_word()
+    for stage in range(1, MAX_STAGE + 2):
+        answer(scheduler, word, True)
+        assert word['srs_stage'] == min(stage, MAX_STAGE)
+    assert word['last_practice_date'] == TODAY.isoformat()
+    answer(scheduler, word, False)
+    assert (word['srs_stage'], word['failed_count']) == (0, 1)
+
+def test_sm2_intervals_and_ease():
+    scheduler = get_scheduler('sm2')
+    word = new_word()
+    answer(scheduler, word, True)
+    assert days_until(word) == 1
+    answer(scheduler, word, True)
+    assert days_until(word) == 6
+    answer(scheduler, word, True)
+    assert days_until(word) == 15  # 6 days at ease 2.5
+    assert word['srs_stage'] == 3
+
+    answer(scheduler, word, False)
+    assert (word['srs_stage'], word['failed_count'], days_until(word)) == (0, 1, 1)
+    ease = scheduler.parse_state(word['scheduler_state'])[0]
+    assert ease == pytest.approx(2.5 - 0.54)
+
+def test_sm2_ease_has_a_floor():
+    scheduler = get_scheduler('sm2')
+    word = new_word()
+    for _ in range(10):
+        answer(scheduler, word, False)
+    assert scheduler.parse_state(word['scheduler_state'])[0] == pytest.approx(scheduler.MIN_EASE)
+
+def test_sm2_due_on_due_date():
+    scheduler = get_scheduler('sm2')
+    word = answer(scheduler, new_word(), True)
+    due = date.fromisoformat(word['due_date']).toordinal()
+    assert not scheduler.is_due(word, due - 1)
+    assert scheduler.is_due(word, due)
+
+def test_fsrs_intervals_grow_when_reviewed_on_time():
+    scheduler = get_scheduler('fsrs')
+    word = answer(scheduler, new_word(), True)
+    day, intervals = DAY, []
+    for _ in range(3):
+        intervals.append(days_until(word, day))
+        day += intervals[-1]
+        answer(scheduler, word, True, day)
+    assert intervals[0] >= 1
+    assert intervals == sorted(intervals) and intervals[-1] > intervals[0]
+    assert word['srs_stage'] == 4
+
+def test_fsrs_lapse_shrinks_stability():
+    scheduler = get_scheduler('fsrs')
+    word = answer(scheduler, new_word(), True)
+    day = DAY + days_until(word)
+    stability = scheduler.parse_state(word['scheduler_state'])[0]
+    answer(scheduler, word, False, day)
+    assert word['srs_stage'] == 0 and word['failed_count'] == 1
+    assert scheduler.parse_state(word['scheduler_state'])[0] < stability
+    assert days_until(word, day) == 1
@@ -0,0 +1,107 @@
+"""
+Row numbers of a deck spread over several shard worksheets
+"""
+
+import pytest
+
+from benchmarks.fake_sheets import FakeSheetsService, FakeWorksheet
+from services.flashcard_logic import FlashcardManager
+from services.google_sheets import GoogleSheetsService, PartialAppendError
+from services.sharded_sheets import ShardedSheetsService
+
+STRIDE = ShardedSheetsService.ROW_STRIDE
+
+def card_rows(prefix: str, count: int) -> list:
+    return [[f"{prefix} {i}", f"back {i}", '', '0', '0', '', '', '', f"{prefix}{i}"] for i in range(count)]
+
+def make_deck(shard_sizes, max_rows: int = 100) -> ShardedSheetsService:
+    """Sharded service over fake worksheets, cards of shard N named "sN i" """
+    header = list(GoogleSheetsService.HEADER)
+    service = FakeSheetsService([header] + card_rows('s1', shard_sizes[0]))
+    for number, size in enumerate(shard_sizes[1:], start=2):
+        service.sheet._worksheets.append(
+            FakeWorksheet([list(header)] + card_rows(f"s{number}", size), number, f"Sheet1 Shard {number}"))
+    return ShardedSheetsService.wrap(service, max_rows=max_rows)
+
+def worksheet(deck: ShardedSheetsService, number: int) -> FakeWorksheet:
+    return deck.shards[number].worksheet
+
+def test_shards_are_discovered_by_title():
+    deck = make_deck([2, 2])
+    deck.sheet._worksheets.append(FakeWorksheet([], 9, 'Other Shard 3'))
+    deck.discover_shards()
+    assert sorted(deck.shards) == [1, 2]
+    assert ShardedSheetsService.shard_number('Sheet1', FakeWorksheet([], 0, 'Sheet1 Shard 12')) == 12
+    assert ShardedSheetsService.shard_number('Sheet1', FakeWorksheet([], 0, 'Sheet1 Shard 1')) == 0
+
+def test_deck_rows_are_offset_by_shard():
+    deck = make_deck([2, 3, 1])
+    rows = {word['front']: word['row_index'] for word in deck.fetch_words()}
+    assert rows['s1 0'] == 2
+    assert rows['s2 0'] == STRIDE + 2
+    assert rows['s2 2'] == STRIDE + 4
+    assert rows['s3 0'] == 2 * STRIDE + 2
+
+def test_row_base():
+    deck = make_deck([1])
+    assert deck.row_base(7) == 0
+    assert deck.row_base(STRIDE + 7) == STRIDE
+    assert deck.row_base(3 * STRIDE + 2) == 3 * STRIDE
+
+def test_cells_are_written_to_their_shard():
+    deck = make_deck([2, 2])
+    deck.update_cells({(3, 4): 5, (STRIDE + 2, 4): 6})
+    assert worksheet(deck, 1).rows[2][3] == '5'
+    assert worksheet(deck, 2).rows[1][3] == '6'
+    assert worksheet(deck, 2).rows[2][3] == '0'
+
+def test_row_map_is_deck_wide():
+    deck = make_deck([1, 2])
+    assert deck.fetch_row_map() == {'s10': 2, 's20': STRIDE + 2, 's21': STRIDE + 3}
+
+def test_drop_rows_shifts_only_rows_of_the_same_shard():
+    deck = make_deck([4, 4])
+    manager = FlashcardManager(deck.fetch_words(), deck, {})
+    removed = [3, STRIDE + 2, STRIDE + 3]
+    deck.delete_rows(removed)
+    manager._drop_rows(removed)
+
+    rows = {word['front']: word['row_index'] for word in manager.words_data}
+    assert rows == {
+        's1 0': 2, 's1 2': 3, 's1 3': 4,
+        's2 2': STRIDE + 2, 's2 3': STRIDE + 3
+    }
+    # Same numbers as a fresh fetch
+    assert rows == {word['front']: word['row_index'] for word in deck.fetch_words()}
+
+def test_new_cards_fill_first_shard_with_room():
+    deck = make_deck([3, 1], max_rows=5)  # Header and 4 cards per shard
+    deck.append_rows(card_rows('new', 6))
+    assert [row[0] for row in worksheet(deck, 1).rows[4:]] == ['new 0']
+    assert [row[0] for row in worksheet(deck, 2).rows[2:]] == ['new 1', 'new 2', 'new 3']
+    assert [row[0] for row in worksheet(deck, 3).rows[1:]] == ['new 4', 'new 5']
+    assert worksheet(deck, 3).title == 'Sheet1 Shard 3'
+    assert deck._row_counts == {1: 5, 2: 5, 3: 3}
+
+def test_rows_are_counted_by_fetch_not_on_connect():
+    deck = make_deck([2, 2])
+    assert deck._row_counts == {}
+    deck.fetch_words()
+    assert deck._row_counts == {1: 3, 2: 3}
+
+def test_failed_shard_returns_its_rows_and_is_not_counted():
+    deck = make_deck([3, 1], max_rows=5)
+
+    def fail(values, **kwargs):
+        raise OSError("quota exceeded")
+    worksheet(deck, 2).append_rows = fail
+
+    with pytest.raises(PartialAppendError) as raised:
+        deck.append_rows(card_rows('new', 3))
+    assert [row[0] for row in raised.value.rows] == ['new 1', 'new 2']
+    assert deck._row_counts == {1: 5, 2: 2}
+
+    del worksheet(deck, 2).append_rows
+    deck.append_rows(raised.value.rows)  # Shard 2 still has room
+    assert [row[0] for row in worksheet(deck, 2).rows[2:]] == ['new 1', 'new 2']
+    assert deck._row_counts == {1: 5, 2: 4}
@@ -0,0 +1,404 @@
+"""
+Deck browser: a searchable, sortable table of every card
+"""
+
+from typing import List
+import numpy as np
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                             QLineEdit, QTableView, QHeaderView, QAbstractItemView,
+                             QMessageBox, QInputDialog, QProgressDialog)
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PySide6.QtGui import QFont
+from services import metrics
+from ui.text_fit import FrameDebouncer
+from ui.workers import SearchIndexWorker
+
+class DeckTableModel(QAbstractTableModel):
+    """Cards of a deck as table rows, read straight from words_data
+
+    The view only asks for the rows it paints, so the deck is never copied
+    into the model. Sorting and searching produce an array of positions in
+    words_data; the numeric columns sort on the deck's column copy.
+    """
+
+    COLUMNS = (
+        ("Front", 'front'),
+        ("Back", 'back'),
+        ("Stage", 'srs_stage'),
+        ("Last Practice", 'last_practice_date'),
+        ("Failed", 'failed_count'),
+        ("Suspended", 'suspended'),
+    )
+    FRONT, BACK, STAGE, LAST_PRACTICE, FAILED, SUSPENDED = range(len(COLUMNS))
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.words: List[dict] = []
+        self.deck = None         # DeckColumns of words
+        self.search_index = None        # TrigramIndex of words, None while it is built
+        self.query = ''
+        self.sort_column = -1    # Deck order
+        self.sort_order = Qt.SortOrder.AscendingOrder
+        self._order = np.zeros(0, dtype=np.int64)  # Positions in sort order
+        self._rows = self._order                   # Positions shown
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.COLUMNS[section][0]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole or role == Qt.ItemDataRole.ToolTipRole:
+            if role == Qt.ItemDataRole.ToolTipRole and column > self.BACK:
+                return None
+            value = self.words[self._rows[index.row()]].get(self.COLUMNS[column][1], '')
+            if column == self.LAST_PRACTICE:
+                return value or "Never"
+            if column == self.SUSPENDED:
+                return "Yes" if value else ""
+            return value
+        if role == Qt.ItemDataRole.TextAlignmentRole and column > self.BACK:
+            return int(Qt.AlignmentFlag.AlignCenter)
+        return None
+
+    def position(self, row: int) -> int:
+        """Position in words_data of a table row"""
+        return int(self._rows[row])
+
+    def positions(self, rows: List[int]) -> List[int]:
+        """Positions in words_data of table rows"""
+        return self._rows[np.asarray(rows, dtype=np.int64)].tolist()
+
+    def visible_positions(self) -> List[int]:
+        """Positions of all rows the current search shows"""
+        return self._rows.tolist()
+
+    def refresh(self):
+        """Repaint the rows after cards changed in place"""
+        if len(self._rows):
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self._rows) - 1, len(self.COLUMNS) - 1))
+
+    def load(self, words: List[dict], deck):
+        """Show a deck, keeping the sort order and search"""
+        self.beginResetModel()
+        if words is not self.words:
+            self.search_index = None
+        self.words = words
+        self.deck = deck
+        self._order = self._sorted(self.sort_column, self.sort_order)
+        self._rows = self._filtered()
+        self.endResetModel()
+
+    def set_index(self, index):
+        """Use a search index built for the current words"""
+        self.beginResetModel()
+        self.search_index = index
+        self._rows = self._filtered()
+        self.endResetModel()
+
+    @metrics.instrumented('browser.search')
+    def set_query(self, query: str):
+        """Show only the cards whose front or back contains query"""
+        self.beginResetModel()
+        self.query = query
+        self._rows = self._filtered()
+        self.endResetModel()
+
+    def sort(self, column: int, order=Qt.SortOrder.AscendingOrder):
+        """Order rows by a column, ties keep deck order"""
+        self.beginResetModel()
+        self.sort_column, self.sort_order = column, order
+        self._order = self._sorted(column, order)
+        self._rows = self._filtered()
+        self.endResetModel()
+
+    def _sorted(self, column: int, order) -> np.ndarray:
+        count = len(self.words)
+        descending = order == Qt.SortOrder.DescendingOrder
+        if column in (self.FRONT, self.BACK):
+            key = self.COLUMNS[column][1]
+            words = self.words
+            return np.array(sorted(range(count), key=lambda i: words[i][key].casefold(), reverse=descending),
+                            dtype=np.int64)
+        if column == self.STAGE:
+            values = self.deck.stage.astype(np.int64)
+        elif column == self.LAST_PRACTICE:
+            values = self.deck.last_day
+        elif column == self.FAILED:
+            values = self.deck.failed
+        elif column == self.SUSPENDED:
+            values = self.deck.suspended.astype(np.int64)
+        else:
+            return np.arange(count, dtype=np.int64)
+        return np.argsort(-values if descending else values, kind='stable')
+
+    def _filtered(self) -> np.ndarray:
+        if not self.query.strip() or self.search_index is None:
+            return self._order
+        matches = np.zeros(len(self.words), dtype=bool)
+        matches[self.search_index.search(self.query)] = True
+        return self._order[matches[self._order]]
+
+class DeckBrowserView(QWidget):
+    """Browse and search the whole deck"""
+
+    def __init__(self, main_window):
+        super().__init__()
+        self.main_window = main_window
+        self.manager = None
+        self.index_worker = None
+        self.search_debouncer = FrameDebouncer(self.apply_search, parent=self)
+        self.init_ui()
+
+    def init_ui(self):
+        """Initialize the UI components"""
+        layout = QVBoxLayout(self)
+        layout.setSpacing(20)
+        layout.setContentsMargins(40, 30, 40, 30)
+
+        # Header
+        header_layout = QHBoxLayout()
+
+        back_btn = QPushButton("← Home")
+        back_btn.setProperty('variant', 'secondary')
+        back_btn.setMaximumWidth(120)
+        back_btn.clicked.connect(self.main_window.show_home)
+
+        title = QLabel("Deck")
+        title.setFont(QFont("Arial", 24, QFont.Weight.Bold))
+        title.setProperty('role', 'heading')
+
+        # Create a spacer widget for symmetry
+        spacer = QWidget()
+        spacer.setMaximumWidth(120)
+
+        header_layout.addWidget(back_btn)
+        header_layout.addStretch()
+        header_layout.addWidget(title)
+        header_layout.addStretch()
+        header_layout.addWidget(spacer)
+
+        layout.addLayout(header_layout)
+
+        # Search, applied once per frame while typing
+        search_layout = QHBoxLayout()
+
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("🔍 Search front and back")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.textChanged.connect(self.search_debouncer.schedule)
+
+        self.count_label = QLabel("")
+        self.count_label.setFont(QFont("Arial", 12))
+        self.count_label.setProperty('role', 'muted')
+
+        search_layout.addWidget(self.search_input)
+        search_layout.addWidget(self.count_label)
+        layout.addLayout(search_layout)
+
+        # Bulk operations on the selected cards, or every card shown
+        actions_layout = QHBoxLayout()
+        self.action_buttons = []
+        for text, handler in (("Reset Stage", self.reset_stage),
+                              ("Set Stage…", self.set_stage),
+                              ("Clear History", self.clear_history),
+                              ("Suspend", lambda: self.set_suspended(True)),
+                              ("Unsuspend", lambda: self.set_suspended(False))):
+            button = QPushButton(text)
+            button.setProperty('variant', 'secondary')
+            button.clicked.connect(handler)
+            actions_layout.addWidget(button)
+            self.action_buttons.append(button)
+        actions_layout.addStretch()
+
+        self.undo_btn = QPushButton("↶ Undo")
+        self.undo_btn.setProperty('variant', 'secondary')
+        self.undo_btn.clicked.connect(self.undo)
+        actions_layout.addWidget(self.undo_btn)
+        layout.addLayout(actions_layout)
+
+        # Card table, rows are fetched from the model only when painted
+        self.model = DeckTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setAlternatingRowColors(True)
+        self.table.setWordWrap(False)
+        self.table.setShowGrid(False)
+
+        # Fixed row heights and column widths, so nothing measures every row
+        rows = self.table.verticalHeader()
+        rows.setVisible(False)
+        rows.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        rows.setDefaultSectionSize(30)
+
+        columns = self.table.horizontalHeader()
+        columns.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        columns.setSectionResizeMode(DeckTableModel.FRONT, QHeaderView.ResizeMode.Stretch)
+        columns.setSectionResizeMode(DeckTableModel.BACK, QHeaderView.ResizeMode.Stretch)
+        for column in (DeckTableModel.STAGE, DeckTableModel.LAST_PRACTICE, DeckTableModel.FAILED,
+                       DeckTableModel.SUSPENDED):
+            self.table.setColumnWidth(column, 120)
+        columns.setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.table.setSortingEnabled(True)
+        self.table.selectionModel().selectionChanged.connect(self.update_actions)
+
+        layout.addWidget(self.table)
+
+    def load_deck(self, manager):
+        """Show the cards of a flashcard manager's deck"""
+        self.manager = manager
+        self.model.load(manager.words_data, manager.deck_columns())
+        if manager.has_search_index():
+            self.model.set_index(manager.search_index())
+        else:
+            self.build_index()
+        self.update_count()
+        self.update_actions()
+
+    def build_index(self):
+        """Index the deck for search in the background"""
+        if self.index_worker and self.index_worker.isRunning():
+            return
+        self.search_input.setPlaceholderText("🔍 Indexing cards…")
+        worker = SearchIndexWorker(self.manager, self)
+        worker.ready.connect(lambda index: worker.manager.install_search_index(index, worker.layout_version))
+        self.index_worker = worker
+        self.index_worker.failed.connect(lambda error: print(f"Warning: Failed to index the deck: {error}"))
+        self.index_worker.finished.connect(self.on_index_built)
+        self.index_worker.start()
+
+    def on_index_built(self):
+        """Apply the search once the index is ready"""
+        self.search_input.setPlaceholderText("🔍 Search front and back")
+        if self.manager.has_search_index():
+            self.model.set_index(self.manager.search_index())
+            self.update_count()
+        elif (self.index_worker.manager is not self.manager
+              or self.index_worker.layout_version != self.manager.layout_version):
+            # Another deck was loaded, or cards moved, while the copy was indexed
+            self.build_index()
+
+    def apply_search(self):
+        """Filter the table by the search text"""
+        self.model.set_query(self.search_input.text())
+        self.update_count()
+        self.table.scrollToTop()
+
+    def is_editable(self) -> bool:
+        """The offline snapshot deck can only be browsed"""
+        return self.manager is not None and self.manager.sheets_service is not None
+
+    def update_actions(self):
+        """Enable the bulk actions and name their target"""
+        editable = self.is_editable()
+        for button in self.action_buttons:
+            button.setEnabled(editable and self.model.rowCount() > 0)
+        self.undo_btn.setEnabled(editable and self.manager.can_undo())
+        label = self.manager.undo_label() if editable else None
+        self.undo_btn.setToolTip(f"Undo {label}" if label else "")
+
+    def target_positions(self) -> List[int]:
+        """Positions of the selected cards, or of every card shown without a selection"""
+        rows = [index.row() for index in self.table.selectionModel().selectedRows()]
+        if rows:
+            return self.model.positions(rows)
+        return self.model.visible_positions()
+
+    def confirm(self, action: str, count: int) -> bool:
+        reply = QMessageBox.question(
+            self,
+            action,
+            f"{action}: apply to {count} card{'s' if count != 1 else ''}?\nYou can undo this afterwards.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No
+        )
+        return reply == QMessageBox.StandardButton.Yes
+
+    def reset_stage(self):
+        positions = self.target_positions()
+        if positions and self.confirm("Reset Stage", len(positions)):
+            self.run_bulk("Resetting stages…", len(positions),
+                          lambda progress: self.manager.reset_stage(positions, progress))
+
+    def set_stage(self):
+        positions = self.target_positions()
+        if not positions:
+            return
+        stage, ok = QInputDialog.getInt(self, "Set Stage", f"SRS stage for {len(positions)} cards:",
+                                        0, 0, self.manager.MAX_STAGE)
+        if ok:
+            self.run_bulk("Setting stages…", len(positions),
+                          lambda progress: self.manager.set_stage(positions, stage, progress))
+
+    def clear_history(self):
+        positions = self.target_positions()
+        if positions and self.confirm("Clear History", len(positions)):
+            self.run_bulk("Clearing history…", len(positions),
+                          lambda progress: self.manager.clear_history(positions, progress))
+
+    def set_suspended(self, suspended: bool):
+        positions = self.target_positions()
+        action = "Suspend" if suspended else "Unsuspend"
+        if positions and self.confirm(action, len(positions)):
+            self.run_bulk(f"{action}ing cards…", len(positions),
+                          lambda progress: self.manager.set_suspended(positions, suspended, progress))
+
+    def undo(self):
+        if self.manager.can_undo():
+            self.run_bulk(f"Undoing {self.manager.undo_label()}…", None, self.manager.undo_bulk)
+
+    def run_bulk(self, label: str, total, operation):
+        """Run a bulk operation with a progress dialog, then push it to the sheet
+
+        operation: callable taking a progress(done, total) callback
+        """
+        dialog = QProgressDialog(label, None, 0, total or 0, self)
+        dialog.setWindowTitle("Deck")
+        dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        dialog.setMinimumDuration(300)
+
+        def progress(done, count):
+            dialog.setMaximum(count)
+            dialog.setValue(done)
+
+        try:
+            operation(progress)
+        except Exception as e:
+            QMessageBox.warning(self, "Deck", f"Failed to update cards: {str(e)}")
+        finally:
+            dialog.reset()
+
+        # Re-sort if the sorted column may have changed, otherwise repaint in
+        # place so the selection stays on the same cards
+        if self.model.sort_column > DeckTableModel.BACK:
+            self.model.load(self.manager.words_data, self.manager.deck_columns())
+        else:
+            self.model.refresh()
+        self.update_count()
+        self.update_actions()
+        self.main_window.flush_outbox()
+
+    def update_count(self):
+        total = len(self.model.words)
+        shown = self.model.rowCount()
+        if shown == total:
+            self.count_label.setText(f"{total} cards")
+        else:
+            self.count_label.setText(f"{shown} of {total} cards")
+
+    def wait_for_workers(self):
+        """Let a running index build finish, e.g. before the window closes"""
+        if self.index_worker and self.index_worker.isRunning():
+            self.index_worker.wait()
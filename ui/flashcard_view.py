@@ -1,15 +1,187 @@
 """
-Flashcard display view with fade animation and skip functionality
+Flashcard display view with fade animation, skip functionality and a
+keyboard-driven rapid review mode
 """
 
-from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, 
+import time
+from collections import deque
+from typing import Tuple
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QStackedWidget,
                              QPushButton, QLabel, QProgressBar, QScrollArea, QGraphicsOpacityEffect)
-from PySide6.QtCore import Qt, QPropertyAnimation, QEasingCurve
-from PySide6.QtGui import QFont
-from ui.styles import Styles
+from PySide6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QSize, QTimer
+from PySide6.QtGui import QFont, QKeySequence, QShortcut
+from services import metrics
+from services.tracing import tracer
+from services.media_cache import parse_media
+from ui.image_loader import ImageLoader
+from ui.text_fit import FrameDebouncer, fitted_font, set_fitted_font
+
+class CardFace(QWidget):
+    """One side of the flashcard: image, text, side and stage labels in a scroll area
+    
+    side ('front' or 'back') selects the face's style in the application
+    stylesheet. set_card() fills and lays out the face, and is a no-op if it
+    already shows the same content.
+    """
+    
+    MAX_POINT_SIZE = 32
+    MIN_POINT_SIZE = 14  # Longer texts scroll
+    CAPTIONED_IMAGE_SHARE = 0.6  # Of the height, when an image has a caption
+    
+    def __init__(self, side: str, side_text: str, image_loader: ImageLoader, parent=None):
+        super().__init__(parent)
+        self.setProperty('side', side)
+        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.image_loader = image_loader
+        self.content_key = None
+        self.text = None
+        self.stage_text = ''
+        self.image_source = None
+        self.image_pending = False
+        
+        # Scroll area for card content
+        self.scroll_area = QScrollArea()
+        self.scroll_area.setWidgetResizable(True)
+        self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        self.scroll_area.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        
+        self.scroll_content = QWidget()
+        self.scroll_content.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        scroll_layout = QVBoxLayout(self.scroll_content)
+        scroll_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        
+        # Card image, for sides that reference one
+        self.image_label = QLabel()
+        self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.image_label.setProperty('role', 'card-image')
+        self.image_label.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.image_label.setVisible(False)
+        
+        # Card text
+        self.card_text = QLabel()
+        self.card_text.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.card_text.setWordWrap(True)
+        self.card_text.setFont(QFont("Arial", 32, QFont.Weight.Bold))
+        self.card_text.setProperty('role', 'card-text')
+        self.card_text.setScaledContents(False)
+        self.card_text.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        
+        # Side indicator
+        self.side_indicator = QLabel(side_text)
+        self.side_indicator.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.side_indicator.setFont(QFont("Arial", 12))
+        self.side_indicator.setProperty('role', 'side')
+        self.side_indicator.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        
+        # SRS stage indicator
+        self.stage_indicator = QLabel()
+        self.stage_indicator.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.stage_indicator.setFont(QFont("Arial", 10))
+        self.stage_indicator.setProperty('role', 'stage')
+        self.stage_indicator.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        
+        scroll_layout.addStretch()
+        scroll_layout.addWidget(self.image_label, 0, Qt.AlignmentFlag.AlignHCenter)
+        scroll_layout.addWidget(self.card_text)
+        scroll_layout.addWidget(self.side_indicator)
+        scroll_layout.addWidget(self.stage_indicator)
+        scroll_layout.addStretch()
+        
+        self.scroll_area.setWidget(self.scroll_content)
+        
+        face_layout = QVBoxLayout(self)
+        face_layout.setContentsMargins(0, 0, 0, 0)
+        face_layout.addWidget(self.scroll_area)
+    
+    def content_box(self) -> Tuple[int, int]:
+        """Width and height the image and text can fill without scrolling"""
+        layout = self.scroll_content.layout()
+        area = layout.contentsRect()
+        # Content padding and layout margins around the area, from the viewport
+        height = (self.scroll_area.viewport().height() - (self.scroll_content.height() - area.height())
+                  - 2 * layout.spacing()
+                  - self.side_indicator.sizeHint().height() - self.stage_indicator.sizeHint().height())
+        return area.width(), height
+    
+    def image_box(self, captioned: bool) -> QSize:
+        """Size an image is scaled to fit, leaving room for a caption"""
+        width, height = self.content_box()
+        return QSize(width, int(height * self.CAPTIONED_IMAGE_SHARE) if captioned else height)
+    
+    def set_card(self, text: str, stage_text: str, size: QSize) -> bool:
+        """Fill the face and lay it out at size, returns False if already showing it
+        
+        The text gets the largest font that fits the face without scrolling.
+        An image the loader has not decoded yet shows a placeholder until
+        refresh_image() is called for it.
+        """
+        key = (text, stage_text, size.width(), size.height())
+        if key == self.content_key and not self.image_pending:
+            return False
+        self.text, self.stage_text = text, stage_text
+        
+        # A hidden stacked page is only resized and laid out when shown,
+        # do it now so showing it later costs no layout pass
+        if self.size() != size:
+            self.resize(size)
+        self.layout().activate()
+        self.scroll_content.layout().activate()
+        
+        caption, self.image_source = parse_media(text)
+        width, height = self.content_box()
+        if self.image_source is not None:
+            box = self.image_box(bool(caption))
+            self.show_image(box)
+            height -= box.height() + self.scroll_content.layout().spacing()
+        else:
+            self.image_pending = False
+            self.image_label.setVisible(False)
+            self.image_label.clear()
+        
+        padding = self.card_text.contentsMargins()
+        set_fitted_font(self.card_text, fitted_font(
+            caption, width - padding.left() - padding.right(), height - padding.top() - padding.bottom(),
+            max_size=self.MAX_POINT_SIZE, min_size=self.MIN_POINT_SIZE, wrap=True))
+        self.card_text.setText(caption)
+        self.card_text.setVisible(bool(caption) or self.image_source is None)
+        self.stage_indicator.setText(stage_text)
+        self.scroll_content.layout().activate()
+        self.scroll_area.verticalScrollBar().setValue(0)
+        self.content_key = key
+        return True
+    
+    def show_image(self, box: QSize):
+        """Show the cached image of image_source, or a placeholder while it loads"""
+        self.image_label.setFixedSize(box)
+        pixmap = self.image_loader.pixmap(self.image_source, box)
+        if pixmap is not None:
+            self.image_label.setPixmap(pixmap)
+            self.image_pending = False
+        elif self.image_loader.error(self.image_source, box):
+            self.image_label.setText("🖼 Image unavailable")
+            self.image_pending = False
+        else:
+            self.image_label.setText("Loading image…")
+            self.image_pending = True
+        self.image_label.setVisible(True)
 
 class FlashcardView(QWidget):
-    """View for displaying and interacting with flashcards"""
+    """View for displaying and interacting with flashcards
+    
+    Keyboard: Space/Enter reveals the card and then marks it correct,
+    Right/K/2 correct, Left/J/1 incorrect, S/Down skip. Rapid mode drops the
+    fade animations and the opacity effect so every key acts immediately,
+    and shows the answer rate.
+    """
+    
+    REVEAL_KEYS = ('Space', 'Return', 'Enter')
+    CORRECT_KEYS = ('Right', 'K', '2')
+    INCORRECT_KEYS = ('Left', 'J', '1')
+    SKIP_KEYS = ('S', 'Down')
+    THROUGHPUT_WINDOW = 20  # Answers the cards/s rate is averaged over
+    PREFETCH_DELAY_MS = 20  # Lets the swap paint before the next face is laid out
+    PREFETCH_IMAGE_CARDS = 3  # Upcoming cards whose images are decoded ahead
     
     def __init__(self, main_window):
         super().__init__()
@@ -17,8 +189,17 @@ class FlashcardView(QWidget):
         self.manager = None
         self.is_revealed = False
         self.animation_running = False
+        self.rapid_mode = False
+        self.card_shown_at = 0.0
+        self.response_ms = 0  # Time from showing the card to revealing it
+        self.answer_times = deque(maxlen=self.THROUGHPUT_WINDOW)
+        self.fit_debouncer = FrameDebouncer(self.refit_card, parent=self)
+        cache_mb = int(main_window.config.get('image_cache_mb', 64))
+        self.image_loader = ImageLoader(max_bytes=cache_mb * 1024 * 1024, parent=self)
+        self.image_loader.loaded.connect(self.on_image_loaded)
         
         self.init_ui()
+        self.init_shortcuts()
         
     def init_ui(self):
         """Initialize the UI components"""
@@ -31,24 +212,41 @@ class FlashcardView(QWidget):
         
         # Back button
         back_btn = QPushButton("← Home")
-        back_btn.setStyleSheet(Styles.SECONDARY_BUTTON)
+        back_btn.setProperty('variant', 'secondary')
         back_btn.setMaximumWidth(120)
         back_btn.clicked.connect(self.main_window.show_home)
         
         header_layout.addWidget(back_btn)
+        
+        # Rapid mode toggle
+        self.rapid_btn = QPushButton("⚡ Rapid")
+        self.rapid_btn.setCheckable(True)
+        self.rapid_btn.setProperty('variant', 'secondary')
+        self.rapid_btn.setMaximumWidth(120)
+        self.rapid_btn.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.rapid_btn.setToolTip("Keyboard review without animations\n"
+                                  "Space: reveal, then correct  ←/J/1: incorrect  →/K/2: correct  S/↓: skip")
+        self.rapid_btn.toggled.connect(self.toggle_rapid_mode)
+        header_layout.addWidget(self.rapid_btn)
         header_layout.addStretch()
         
+        # Live answer rate, rapid mode only
+        self.throughput_label = QLabel()
+        self.throughput_label.setFont(QFont("Arial", 14))
+        self.throughput_label.setProperty('tone', 'ok')
+        self.throughput_label.setVisible(False)
+        header_layout.addWidget(self.throughput_label)
+        
         # Progress label
         self.progress_label = QLabel("Card 1 / 20")
         self.progress_label.setFont(QFont("Arial", 14))
-        self.progress_label.setStyleSheet("color: #7f8c8d;")
+        self.progress_label.setProperty('role', 'muted')
         
         header_layout.addWidget(self.progress_label)
         layout.addLayout(header_layout)
         
         # Progress bar
         self.progress_bar = QProgressBar()
-        self.progress_bar.setStyleSheet(Styles.PROGRESS_BAR)
         self.progress_bar.setTextVisible(False)
         self.progress_bar.setMaximumHeight(8)
         layout.addWidget(self.progress_bar)
@@ -65,35 +263,34 @@ class FlashcardView(QWidget):
         card_wrapper_layout.setContentsMargins(0, 0, 0, 0)
         card_wrapper_layout.setSpacing(0)
         
-        # Card widget with scroll area
-        self.card = QWidget()
-        self.card.setStyleSheet(Styles.FLASHCARD)
+        # Card: one pre-styled face per side. The back of the current card
+        # and the front of the next one are laid out while the user thinks,
+        # so flipping and advancing only swap the visible face
+        self.card = QStackedWidget()
         self.card.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.front_face = CardFace("front", "Front - Click or press Space to reveal", self.image_loader)
+        self.back_face = CardFace("back", "Back", self.image_loader)
+        self.card.addWidget(self.front_face)
+        self.card.addWidget(self.back_face)
+        
+        self.prefetch_timer = QTimer(self)
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.setInterval(self.PREFETCH_DELAY_MS)
+        self.prefetch_timer.timeout.connect(self.prefetch)
         
-        # Opacity effect for animation
-        self.opacity_effect = QGraphicsOpacityEffect()
-        self.opacity_effect.setOpacity(1.0)
-        self.card.setGraphicsEffect(self.opacity_effect)
+        # Opacity effect for animation (removed in rapid mode)
+        self.opacity_effect = None
+        self.set_opacity_effect(True)
         
         # New badge - positioned in top-right corner
         badge_container = QWidget()
-        badge_container.setStyleSheet("background: transparent;")
+        badge_container.setProperty('role', 'overlay')
         badge_layout = QHBoxLayout(badge_container)
         badge_layout.setContentsMargins(0, 15, 15, 0)
         badge_layout.addStretch()
         
         self.new_badge = QLabel("NEW")
-        self.new_badge.setStyleSheet("""
-            QLabel {
-                background-color: #1CB0F6;
-                color: white;
-                padding: 6px 14px;
-                border-radius: 12px;
-                font-size: 11px;
-                font-weight: bold;
-                border: none;
-            }
-        """)
+        self.new_badge.setProperty('role', 'badge')
         self.new_badge.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.new_badge.setFixedHeight(26)
         self.new_badge.hide()
@@ -103,78 +300,6 @@ class FlashcardView(QWidget):
         badge_container.setGeometry(0, 0, 700, 50)
         badge_container.raise_()  # Ensure badge is on top
         
-        # Scroll area for card content
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        self.scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-        self.scroll_area.setFocusPolicy(Qt.FocusPolicy.NoFocus)
-        self.scroll_area.setStyleSheet("""
-            QScrollArea {
-                border: none;
-                background-color: transparent;
-            }
-            QScrollBar:vertical {
-                border: none;
-                background: #f0f0f0;
-                width: 10px;
-                margin: 0px;
-                border-radius: 5px;
-            }
-            QScrollBar::handle:vertical {
-                background: #3498db;
-                min-height: 20px;
-                border-radius: 5px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background: #2980b9;
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                height: 0px;
-            }
-        """)
-        
-        scroll_content = QWidget()
-        scroll_content.setFocusPolicy(Qt.FocusPolicy.NoFocus)
-        scroll_layout = QVBoxLayout(scroll_content)
-        scroll_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        # Card text
-        self.card_text = QLabel()
-        self.card_text.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.card_text.setWordWrap(True)
-        self.card_text.setFont(QFont("Arial", 32, QFont.Weight.Bold))
-        self.card_text.setStyleSheet("color: #2c3e50; padding: 20px; background: transparent;")
-        self.card_text.setScaledContents(False)
-        self.card_text.setFocusPolicy(Qt.FocusPolicy.NoFocus)
-        
-        # Side indicator
-        self.side_indicator = QLabel("Front - Click to reveal")
-        self.side_indicator.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.side_indicator.setFont(QFont("Arial", 12))
-        self.side_indicator.setStyleSheet("color: #95a5a6; margin-top: 20px; background: transparent;")
-        self.side_indicator.setFocusPolicy(Qt.FocusPolicy.NoFocus)
-        
-        # SRS stage indicator
-        self.stage_indicator = QLabel()
-        self.stage_indicator.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.stage_indicator.setFont(QFont("Arial", 10))
-        self.stage_indicator.setStyleSheet("color: #bdc3c7; margin-top: 10px; background: transparent;")
-        self.stage_indicator.setFocusPolicy(Qt.FocusPolicy.NoFocus)
-        
-        scroll_layout.addStretch()
-        scroll_layout.addWidget(self.card_text)
-        scroll_layout.addWidget(self.side_indicator)
-        scroll_layout.addWidget(self.stage_indicator)
-        scroll_layout.addStretch()
-        
-        self.scroll_area.setWidget(scroll_content)
-        
-        # Add scroll area to card
-        card_layout = QVBoxLayout(self.card)
-        card_layout.setContentsMargins(0, 0, 0, 0)
-        card_layout.addWidget(self.scroll_area)
-        
         # Make card clickable
         self.card.mousePressEvent = self.reveal_card
         
@@ -183,7 +308,6 @@ class FlashcardView(QWidget):
         badge_container.setParent(card_wrapper)
         badge_container.setGeometry(0, 0, 700, 50)
         badge_container.raise_()
-        badge_container.setStyleSheet("background: transparent;")
 
         # Add wrapper to container
         card_container_layout.addWidget(card_wrapper)
@@ -197,20 +321,23 @@ class FlashcardView(QWidget):
         self.incorrect_btn = QPushButton("✗ Incorrect")
         self.incorrect_btn.setFont(QFont("Arial", 16, QFont.Weight.Bold))
         self.incorrect_btn.setMinimumSize(150, 60)
-        self.incorrect_btn.setStyleSheet(Styles.INCORRECT_BUTTON)
+        self.incorrect_btn.setProperty('variant', 'incorrect')
+        self.incorrect_btn.setFocusPolicy(Qt.FocusPolicy.NoFocus)  # Keys go to the shortcuts
         self.incorrect_btn.clicked.connect(lambda: self.handle_answer(False))
         
         self.correct_btn = QPushButton("✓ Correct")
         self.correct_btn.setFont(QFont("Arial", 16, QFont.Weight.Bold))
         self.correct_btn.setMinimumSize(150, 60)
-        self.correct_btn.setStyleSheet(Styles.CORRECT_BUTTON)
+        self.correct_btn.setProperty('variant', 'correct')
+        self.correct_btn.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         self.correct_btn.clicked.connect(lambda: self.handle_answer(True))
         
         # Skip button
         self.skip_btn = QPushButton("⏭ Skip")
         self.skip_btn.setFont(QFont("Arial", 14, QFont.Weight.Bold))
         self.skip_btn.setMinimumSize(120, 60)
-        self.skip_btn.setStyleSheet(Styles.SKIP_BUTTON)
+        self.skip_btn.setProperty('variant', 'skip')
+        self.skip_btn.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         self.skip_btn.clicked.connect(self.handle_skip)
         
         self.action_layout.addWidget(self.incorrect_btn)
@@ -224,11 +351,88 @@ class FlashcardView(QWidget):
         layout.addWidget(self.action_widget)
         layout.addStretch()
         
+    def init_shortcuts(self):
+        """Keyboard shortcuts, active while this view is shown"""
+        bindings = [
+            (self.REVEAL_KEYS, self.on_reveal_key),
+            (self.CORRECT_KEYS, lambda: self.on_answer_key(True)),
+            (self.INCORRECT_KEYS, lambda: self.on_answer_key(False)),
+            (self.SKIP_KEYS, self.on_skip_key),
+        ]
+        self.shortcuts = []
+        for keys, handler in bindings:
+            for key in keys:
+                shortcut = QShortcut(QKeySequence(key), self)
+                shortcut.activated.connect(handler)
+                self.shortcuts.append(shortcut)
+        
     def load_session(self, manager):
         """Load a new practice session"""
         self.manager = manager
+        self.answer_times.clear()
+        self.rapid_btn.setChecked(bool(self.main_window.config.get('rapid_mode', False)))
+        self.update_throughput()
         self.show_current_card()
+    
+    def set_opacity_effect(self, enabled: bool):
+        """Attach or drop the card's opacity effect (Qt deletes a replaced effect)"""
+        if enabled and self.opacity_effect is None:
+            self.opacity_effect = QGraphicsOpacityEffect()
+            self.opacity_effect.setOpacity(1.0)
+            self.card.setGraphicsEffect(self.opacity_effect)
+        elif not enabled and self.opacity_effect is not None:
+            self.card.setGraphicsEffect(None)
+            self.opacity_effect = None
+    
+    def toggle_rapid_mode(self, enabled: bool):
+        """Switch rapid mode on or off and remember the choice"""
+        if self.animation_running:
+            # The running fade still needs the opacity effect
+            self.rapid_btn.blockSignals(True)
+            self.rapid_btn.setChecked(self.rapid_mode)
+            self.rapid_btn.blockSignals(False)
+            return
+        
+        self.rapid_mode = enabled
+        self.set_opacity_effect(not enabled)
+        self.throughput_label.setVisible(enabled)
+        
+        config = self.main_window.config
+        if config.get('rapid_mode', False) != enabled:
+            config.set('rapid_mode', enabled)
+            config.save()
+    
+    def on_reveal_key(self):
+        """Space/Enter: reveal the card, or mark a revealed card correct"""
+        if self.is_revealed:
+            self.on_answer_key(True)
+        else:
+            self.reveal_card()
+    
+    def on_answer_key(self, is_correct: bool):
+        if self.manager and self.is_revealed and not self.animation_running:
+            self.handle_answer(is_correct)
+    
+    def on_skip_key(self):
+        if self.manager and not self.animation_running:
+            self.handle_skip()
+    
+    def record_throughput(self):
+        """Stamp an answer or skip for the cards/s rate"""
+        self.answer_times.append(time.perf_counter())
+        if self.rapid_mode:
+            self.update_throughput()
+    
+    def update_throughput(self):
+        """Show the answer rate over the last THROUGHPUT_WINDOW cards"""
+        if len(self.answer_times) < 2:
+            self.throughput_label.setText("⚡ – cards/s")
+            return
+        elapsed = self.answer_times[-1] - self.answer_times[0]
+        rate = (len(self.answer_times) - 1) / elapsed if elapsed > 0 else 0.0
+        self.throughput_label.setText(f"⚡ {rate:.1f} cards/s")
         
+    @metrics.instrumented('view.show_current_card')
     def show_current_card(self):
         """Display the current flashcard"""
         if not self.manager or not self.manager.has_next_card():
@@ -236,6 +440,8 @@ class FlashcardView(QWidget):
             
         self.is_revealed = False
         self.action_widget.setVisible(False)
+        self.card_shown_at = time.perf_counter()
+        self.response_ms = 0
         
         # Update progress
         current = self.manager.current_index + 1
@@ -244,18 +450,10 @@ class FlashcardView(QWidget):
         self.progress_bar.setMaximum(total)
         self.progress_bar.setValue(current)
         
-        # Show front of the card
+        # Show front of the card, normally laid out already by prefetch()
         card = self.manager.get_current_card()
-        self.update_card_text(card.front)
-        self.side_indicator.setText("Front - Click to reveal")
-        
-        # Show SRS stage
-        stage_text = f"Stage {card.srs_stage}/8"
-        if card.srs_stage == 0:
-            stage_text += " (Learning)"
-        elif card.srs_stage >= 6:
-            stage_text += " (Mastered)"
-        self.stage_indicator.setText(stage_text)
+        self.update_card_text(self.front_face, card.front, self.stage_text(card))
+        self.card.setCurrentWidget(self.front_face)
         
         # Show NEW badge if card is new
         if card.is_new():
@@ -263,40 +461,93 @@ class FlashcardView(QWidget):
         else:
             self.new_badge.hide()
         
-        self.card.setStyleSheet(Styles.FLASHCARD)
-        
         # Reset opacity
-        self.opacity_effect.setOpacity(1.0)
-        
-        # Reset scroll position
-        self.scroll_area.verticalScrollBar().setValue(0)
+        if self.opacity_effect is not None:
+            self.opacity_effect.setOpacity(1.0)
         
-    def update_card_text(self, text):
-        """Update card text with dynamic font sizing"""
-        self.card_text.setText(text)
+        self.prefetch_timer.start()
+        self.prefetch_images()
         
-        text_length = len(text)
+    def elapsed_ms(self) -> int:
+        """Milliseconds since the current card was shown"""
+        return int((time.perf_counter() - self.card_shown_at) * 1000)
         
-        if text_length < 20:
-            font_size = 32
-        elif text_length < 40:
-            font_size = 28
-        elif text_length < 60:
-            font_size = 24
-        elif text_length < 100:
-            font_size = 20
-        else:
-            font_size = 18
-            
-        self.card_text.setFont(QFont("Arial", font_size, QFont.Weight.Bold))
-        
-    def reveal_card(self, event):
+    @staticmethod
+    def stage_text(card) -> str:
+        """SRS stage line of a card"""
+        stage_text = f"Stage {card.srs_stage}/8"
+        if card.srs_stage == 0:
+            stage_text += " (Learning)"
+        elif card.srs_stage >= 6:
+            stage_text += " (Mastered)"
+        return stage_text
+    
+    @metrics.instrumented('view.update_card_text')
+    def update_card_text(self, face: CardFace, text: str, stage_text: str):
+        """Fill and lay out a card face, free if it was prefetched"""
+        face.set_card(text, stage_text, self.card.contentsRect().size())
+        
+    def resizeEvent(self, event):
+        """Refit the visible face to the new card size, once per frame"""
+        super().resizeEvent(event)
+        self.fit_debouncer.schedule()
+        
+    def refit_card(self):
+        """Lay out the visible face again at the current card size"""
+        face = self.card.currentWidget()
+        if face.text is not None:
+            self.update_card_text(face, face.text, face.stage_text)
+        
+    def on_image_loaded(self, source: str):
+        """Lay out again the faces that were waiting for an image"""
+        for face in (self.front_face, self.back_face):
+            if face.image_pending and face.image_source == source:
+                self.update_card_text(face, face.text, face.stage_text)
+        
+    def prefetch_images(self):
+        """Start decoding the images of the next few cards at their display size"""
+        images = []
+        for card in [self.manager.get_current_card()] + self.manager.upcoming_cards(self.PREFETCH_IMAGE_CARDS):
+            for text in (card.front, card.back):
+                caption, source = parse_media(text)
+                if source is not None:
+                    images.append((source, self.front_face.image_box(bool(caption))))
+        if images:
+            self.image_loader.prefetch(images)
+        
+    def prefetch(self):
+        """Lay out the face that is shown next while the user is thinking
+        
+        On the front that is the current card's back, on the back the next
+        card's front.
+        """
+        if not self.manager or not self.manager.has_next_card():
+            return
+        with tracer.span('view.prefetch', revealed=self.is_revealed):
+            if self.is_revealed:
+                card = self.manager.peek_next_card()
+                if card is not None:
+                    self.update_card_text(self.front_face, card.front, self.stage_text(card))
+            else:
+                card = self.manager.get_current_card()
+                self.update_card_text(self.back_face, card.back, self.stage_text(card))
+        
+    def reveal_card(self, event=None):
         """Animate card reveal to show the back side"""
         if self.animation_running or self.is_revealed or not self.manager:
             return
+        
+        self.response_ms = self.elapsed_ms()
+        card = self.manager.get_current_card()
+        if self.rapid_mode:
+            with tracer.span('view.reveal', card=self.manager.current_index, rapid=True):
+                self.show_back(card)
+                self.action_widget.setVisible(True)
+            return
             
         self.animation_running = True
-        card = self.manager.get_current_card()
+        self.reveal_span = tracer.start_span('view.reveal', card=self.manager.current_index)
+        self.fade_span = tracer.start_span('view.fade_out')
         
         # Create fade out animation
         self.animation = QPropertyAnimation(self.opacity_effect, b"opacity")
@@ -307,17 +558,20 @@ class FlashcardView(QWidget):
         self.animation.finished.connect(lambda: self.reveal_complete(card))
         self.animation.start()
         
-    def reveal_complete(self, card):
-        """Complete the reveal by showing the back side"""
-        self.update_card_text(card.back)
-        self.side_indicator.setText("Back")
-        self.card.setStyleSheet(Styles.FLASHCARD_REVEALED)
+    def show_back(self, card):
+        """Switch the card to its back side"""
+        self.update_card_text(self.back_face, card.back, self.stage_text(card))
+        self.card.setCurrentWidget(self.back_face)
         self.is_revealed = True
+        self.prefetch_timer.start()
         
-        # Reset scroll position for new content
-        self.scroll_area.verticalScrollBar().setValue(0)
+    def reveal_complete(self, card):
+        """Complete the reveal by showing the back side"""
+        self.fade_span.finish()
+        self.show_back(card)
         
         # Create fade in animation
+        self.fade_span = tracer.start_span('view.fade_in')
         self.animation = QPropertyAnimation(self.opacity_effect, b"opacity")
         self.animation.setDuration(250)
         self.animation.setStartValue(0.0)
@@ -330,14 +584,18 @@ class FlashcardView(QWidget):
         """Show correct/incorrect buttons after reveal"""
         self.animation_running = False
         self.action_widget.setVisible(True)
+        self.fade_span.finish()
+        self.reveal_span.finish()
         
+    @metrics.instrumented('view.handle_answer')
     def handle_answer(self, is_correct):
         """Handle user's answer (correct/incorrect)"""
         if not self.manager:
             return
             
         # Record answer
-        self.manager.record_answer(is_correct)
+        self.manager.record_answer(is_correct, self.response_ms)
+        self.record_throughput()
         
         # Move to next card or finish session
         if self.manager.has_next_card():
@@ -347,13 +605,15 @@ class FlashcardView(QWidget):
             stats = self.manager.get_session_stats()
             self.main_window.show_session_complete(stats)
     
+    @metrics.instrumented('view.handle_skip')
     def handle_skip(self):
         """Handle skip button click"""
         if not self.manager:
             return
         
         # Skip card (adds it back to queue)
-        self.manager.skip_card()
+        self.manager.skip_card(self.response_ms or self.elapsed_ms())
+        self.record_throughput()
         
         # Show next card or finish
         if self.manager.has_next_card():
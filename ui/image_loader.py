@@ -0,0 +1,153 @@
+"""
+Asynchronous card image decoding into a memory-bounded pixmap cache
+"""
+
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+from PySide6.QtCore import QObject, QRunnable, QSize, QThreadPool, Qt, Signal
+from PySide6.QtGui import QImage, QImageReader, QPixmap
+from services.media_cache import MediaCache
+from services.tracing import tracer
+
+ImageKey = Tuple[str, int, int]  # (source, box width, box height)
+
+class PixmapCache:
+    """LRU of decoded pixmaps bounded by their memory size"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.bytes_used = 0
+        self._pixmaps: 'OrderedDict[ImageKey, QPixmap]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._pixmaps)
+
+    def __contains__(self, key: ImageKey) -> bool:
+        return key in self._pixmaps
+
+    @staticmethod
+    def cost(pixmap: QPixmap) -> int:
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    def get(self, key: ImageKey) -> Optional[QPixmap]:
+        """Cached pixmap, marked as most recently used"""
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+        return pixmap
+
+    def put(self, key: ImageKey, pixmap: QPixmap):
+        """Cache a pixmap, evicting the least recently used ones over the limit"""
+        cost = self.cost(pixmap)
+        if cost > self.max_bytes:
+            return
+        if key in self._pixmaps:
+            self.bytes_used -= self.cost(self._pixmaps.pop(key))
+        self._pixmaps[key] = pixmap
+        self.bytes_used += cost
+        while self.bytes_used > self.max_bytes:
+            _, evicted = self._pixmaps.popitem(last=False)
+            self.bytes_used -= self.cost(evicted)
+
+    def clear(self):
+        self._pixmaps.clear()
+        self.bytes_used = 0
+
+class _DecodeSignals(QObject):
+    decoded = Signal(object, QImage)  # (key, image)
+    failed = Signal(object, str)      # (key, error)
+
+class _DecodeTask(QRunnable):
+    """Fetches and decodes one image at its display size on a pool thread"""
+
+    def __init__(self, key: ImageKey, media_cache: MediaCache, signals: _DecodeSignals):
+        super().__init__()
+        self.key = key
+        self.media_cache = media_cache
+        self.signals = signals
+
+    def run(self):
+        source, width, height = self.key
+        try:
+            with tracer.span('image.decode', source=source):
+                reader = QImageReader(self.media_cache.fetch(source))
+                reader.setAutoTransform(True)
+                # Decode straight to the box size, never upscaled
+                size = reader.size()
+                if size.isValid() and (size.width() > width or size.height() > height):
+                    reader.setScaledSize(size.scaled(width, height, Qt.AspectRatioMode.KeepAspectRatio))
+                image = reader.read()
+                if image.isNull():
+                    raise Exception(reader.errorString())
+            self.signals.decoded.emit(self.key, image)
+        except Exception as e:
+            self.signals.failed.emit(self.key, str(e))
+
+class ImageLoader(QObject):
+    """Loads card images off the GUI thread
+
+    Images are fetched (MediaCache), decoded and scaled to the box they are
+    shown in on a small thread pool; the GUI thread only turns the finished
+    QImage into a QPixmap for the cache. pixmap() never blocks: it returns
+    the cached pixmap or None and starts loading, then `loaded` fires with
+    the source once it is ready (or failed).
+    """
+
+    loaded = Signal(str)  # source
+    MAX_THREADS = 2
+
+    def __init__(self, media_cache: MediaCache = None, max_bytes: int = 64 * 1024 * 1024, parent=None):
+        super().__init__(parent)
+        self.media_cache = media_cache or MediaCache()
+        self.cache = PixmapCache(max_bytes)
+        self.errors: Dict[ImageKey, str] = {}
+        self._pending = set()
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(self.MAX_THREADS)
+        self._signals = _DecodeSignals(self)
+        self._signals.decoded.connect(self.on_decoded)
+        self._signals.failed.connect(self.on_failed)
+
+    @staticmethod
+    def key(source: str, box: QSize) -> ImageKey:
+        return (source, box.width(), box.height())
+
+    def pixmap(self, source: str, box: QSize) -> Optional[QPixmap]:
+        """Cached pixmap of source scaled to fit box, None while it loads"""
+        key = self.key(source, box)
+        pixmap = self.cache.get(key)
+        if pixmap is None:
+            self._request(key)
+        return pixmap
+
+    def error(self, source: str, box: QSize) -> Optional[str]:
+        """Why source could not be loaded, None if it did not fail"""
+        return self.errors.get(self.key(source, box))
+
+    def prefetch(self, images: Iterable[Tuple[str, QSize]]):
+        """Start loading (source, box) pairs that are not cached yet"""
+        for source, box in images:
+            key = self.key(source, box)
+            if key not in self.cache:
+                self._request(key)
+
+    def _request(self, key: ImageKey):
+        if key in self._pending or key in self.errors or key[1] <= 0 or key[2] <= 0:
+            return
+        self._pending.add(key)
+        self.pool.start(_DecodeTask(key, self.media_cache, self._signals))
+
+    def on_decoded(self, key: ImageKey, image: QImage):
+        self._pending.discard(key)
+        self.cache.put(key, QPixmap.fromImage(image))
+        self.loaded.emit(key[0])
+
+    def on_failed(self, key: ImageKey, error: str):
+        self._pending.discard(key)
+        self.errors[key] = error
+        print(f"Warning: Failed to load image: {error}")
+        self.loaded.emit(key[0])
+
+    def wait(self, timeout_ms: int = -1) -> bool:
+        """Wait for running decodes, e.g. before the window closes"""
+        return self.pool.waitForDone(timeout_ms)
@@ -4,9 +4,9 @@ Session complete view showing statistics with skip count
 
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                              QPushButton, QFrame, QGridLayout)
-from PySide6.QtCore import Qt, QTimer
-from PySide6.QtGui import QFont, QFontMetrics
-from ui.styles import Styles
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QFont
+from ui.text_fit import FrameDebouncer, fitted_font, set_fitted_font
 
 class SessionCompleteView(QWidget):
     """View displayed when practice session is complete"""
@@ -14,6 +14,7 @@ class SessionCompleteView(QWidget):
     def __init__(self, main_window):
         super().__init__()
         self.main_window = main_window
+        self.fit_debouncer = FrameDebouncer(self.adjust_font_sizes, parent=self)
         self.init_ui()
         
     def init_ui(self):
@@ -27,19 +28,12 @@ class SessionCompleteView(QWidget):
         self.title = QLabel("🎉 Session Complete!")
         self.title.setFont(QFont("Arial", 28, QFont.Weight.Bold))
         self.title.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.title.setStyleSheet("color: #2c3e50; margin-bottom: 15px;")
+        self.title.setProperty('role', 'title')
         self.title.setWordWrap(True)
         
         # Stats container
         self.stats_frame = QFrame()
-        self.stats_frame.setStyleSheet("""
-            QFrame {
-                background-color: white;
-                border-radius: 15px;
-                padding: 30px;
-                border: 2px solid #e5e5e5;
-            }
-        """)
+        self.stats_frame.setProperty('role', 'stats')
         
         stats_grid = QGridLayout(self.stats_frame)
         stats_grid.setSpacing(20)
@@ -49,65 +43,65 @@ class SessionCompleteView(QWidget):
         self.total_header = QLabel("Total Cards")
         self.total_header.setFont(QFont("Arial", 11, QFont.Weight.Bold))
         self.total_header.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.total_header.setStyleSheet("color: #7f8c8d; text-transform: uppercase;")
+        self.total_header.setProperty('role', 'stat-header')
         self.total_header.setWordWrap(True)
         
         self.total_cards_label = QLabel("0")
         self.total_cards_label.setFont(QFont("Arial", 24, QFont.Weight.Bold))
         self.total_cards_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.total_cards_label.setStyleSheet("color: #34495e;")
+        self.total_cards_label.setProperty('tone', 'strong')
         self.total_cards_label.setWordWrap(True)
         
         # Correct
         self.correct_header = QLabel("Correct")
         self.correct_header.setFont(QFont("Arial", 11, QFont.Weight.Bold))
         self.correct_header.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.correct_header.setStyleSheet("color: #7f8c8d; text-transform: uppercase;")
+        self.correct_header.setProperty('role', 'stat-header')
         self.correct_header.setWordWrap(True)
         
         self.correct_label = QLabel("0")
         self.correct_label.setFont(QFont("Arial", 24, QFont.Weight.Bold))
         self.correct_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.correct_label.setStyleSheet("color: #27ae60;")
+        self.correct_label.setProperty('tone', 'ok')
         self.correct_label.setWordWrap(True)
         
         # Incorrect
         self.incorrect_header = QLabel("Incorrect")
         self.incorrect_header.setFont(QFont("Arial", 11, QFont.Weight.Bold))
         self.incorrect_header.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.incorrect_header.setStyleSheet("color: #7f8c8d; text-transform: uppercase;")
+        self.incorrect_header.setProperty('role', 'stat-header')
         self.incorrect_header.setWordWrap(True)
         
         self.incorrect_label = QLabel("0")
         self.incorrect_label.setFont(QFont("Arial", 24, QFont.Weight.Bold))
         self.incorrect_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.incorrect_label.setStyleSheet("color: #e74c3c;")
+        self.incorrect_label.setProperty('tone', 'error')
         self.incorrect_label.setWordWrap(True)
         
         # Skipped
         self.skipped_header = QLabel("Skipped")
         self.skipped_header.setFont(QFont("Arial", 11, QFont.Weight.Bold))
         self.skipped_header.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.skipped_header.setStyleSheet("color: #7f8c8d; text-transform: uppercase;")
+        self.skipped_header.setProperty('role', 'stat-header')
         self.skipped_header.setWordWrap(True)
         
         self.skipped_label = QLabel("0")
         self.skipped_label.setFont(QFont("Arial", 24, QFont.Weight.Bold))
         self.skipped_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.skipped_label.setStyleSheet("color: #f39c12;")
+        self.skipped_label.setProperty('tone', 'warning')
         self.skipped_label.setWordWrap(True)
         
         # Accuracy
         self.accuracy_header = QLabel("Accuracy")
         self.accuracy_header.setFont(QFont("Arial", 11, QFont.Weight.Bold))
         self.accuracy_header.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.accuracy_header.setStyleSheet("color: #7f8c8d; text-transform: uppercase;")
+        self.accuracy_header.setProperty('role', 'stat-header')
         self.accuracy_header.setWordWrap(True)
         
         self.accuracy_label = QLabel("0%")
         self.accuracy_label.setFont(QFont("Arial", 24, QFont.Weight.Bold))
         self.accuracy_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.accuracy_label.setStyleSheet("color: #3498db;")
+        self.accuracy_label.setProperty('tone', 'accent')
         self.accuracy_label.setWordWrap(True)
         
         # Store all value labels for dynamic resizing
@@ -138,17 +132,25 @@ class SessionCompleteView(QWidget):
         for col in range(5):
             stats_grid.setColumnStretch(col, 1)
         
+        # Learning history from the review log
+        self.history_label = QLabel("")
+        self.history_label.setFont(QFont("Arial", 12))
+        self.history_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.history_label.setProperty('role', 'muted')
+        self.history_label.setWordWrap(True)
+        self.history_label.setVisible(False)
+        
         # Buttons
         button_layout = QHBoxLayout()
         button_layout.setSpacing(15)
         
         home_btn = QPushButton("Home")
-        home_btn.setStyleSheet(Styles.SECONDARY_BUTTON)
+        home_btn.setProperty('variant', 'secondary')
         home_btn.setMinimumSize(150, 50)
         home_btn.clicked.connect(self.go_home)
         
         practice_again_btn = QPushButton("Practice Again")
-        practice_again_btn.setStyleSheet(Styles.PRIMARY_BUTTON)
+        practice_again_btn.setProperty('variant', 'primary')
         practice_again_btn.setMinimumSize(150, 50)
         practice_again_btn.clicked.connect(self.start_new_session)
         
@@ -161,6 +163,7 @@ class SessionCompleteView(QWidget):
         layout.addStretch()
         layout.addWidget(self.title)
         layout.addWidget(self.stats_frame)
+        layout.addWidget(self.history_label)
         layout.addLayout(button_layout)
         layout.addStretch()
         
@@ -181,8 +184,28 @@ class SessionCompleteView(QWidget):
         self.skipped_label.setText(str(skipped))
         self.accuracy_label.setText(f"{accuracy:.1f}%")
         
-        # Adjust font sizes after a short delay to ensure widgets are rendered
-        QTimer.singleShot(50, self.adjust_font_sizes)
+        # Adjust font sizes once the new texts are laid out
+        self.fit_debouncer.schedule()
+    
+    def show_history(self, summary):
+        """Display all-time statistics computed from the review log"""
+        if not summary['answered']:
+            self.history_label.setVisible(False)
+            return
+        
+        streak = summary['streak']
+        lines = [
+            f"All time: {summary['retention'] * 100:.0f}% retention · "
+            f"{summary['lapse_rate'] * 100:.0f}% lapse rate · "
+            f"{summary['reviews_today']} reviews today",
+            f"🔥 {streak['current']} day streak (best {streak['longest']})"
+        ]
+        if summary['hardest_cards']:
+            hardest = ', '.join(card['front'] for card in summary['hardest_cards'])
+            lines.append(f"Hardest cards: {hardest}")
+        
+        self.history_label.setText('\n'.join(lines))
+        self.history_label.setVisible(True)
     
     def adjust_font_sizes(self):
         """Dynamically adjust font sizes to fit available space"""
@@ -193,28 +216,9 @@ class SessionCompleteView(QWidget):
         if column_width <= 0:
             return
         
-        # Adjust each value label
+        # Largest size from 24 down to 12 that fits, with 10px padding on each side
         for label in self.value_labels:
-            text = label.text()
-            current_font_size = 24  # Starting font size
-            min_font_size = 12       # Minimum readable size
-            
-            # Try decreasing font sizes until text fits
-            while current_font_size >= min_font_size:
-                font = QFont("Arial", current_font_size, QFont.Weight.Bold)
-                metrics = QFontMetrics(font)
-                text_width = metrics.horizontalAdvance(text)
-                
-                # Add some padding (10px on each side)
-                if text_width <= column_width - 20:
-                    label.setFont(font)
-                    break
-                
-                current_font_size -= 1
-            
-            # If still too large, use minimum size
-            if current_font_size < min_font_size:
-                label.setFont(QFont("Arial", min_font_size, QFont.Weight.Bold))
+            set_fitted_font(label, fitted_font(label.text(), column_width - 20, max_size=24, min_size=12))
         
         # Also adjust title if needed
         self.adjust_title_font()
@@ -225,29 +229,13 @@ class SessionCompleteView(QWidget):
         if available_width <= 0:
             return
         
-        text = self.title.text()
-        current_font_size = 28
-        min_font_size = 18
-        
-        while current_font_size >= min_font_size:
-            font = QFont("Arial", current_font_size, QFont.Weight.Bold)
-            metrics = QFontMetrics(font)
-            text_width = metrics.horizontalAdvance(text)
-            
-            if text_width <= available_width:
-                self.title.setFont(font)
-                break
-            
-            current_font_size -= 1
-        
-        if current_font_size < min_font_size:
-            self.title.setFont(QFont("Arial", min_font_size, QFont.Weight.Bold))
+        set_fitted_font(self.title, fitted_font(self.title.text(), available_width, max_size=28, min_size=18))
     
     def resizeEvent(self, event):
         """Handle window resize events"""
         super().resizeEvent(event)
-        # Readjust fonts when window is resized
-        QTimer.singleShot(50, self.adjust_font_sizes)
+        # Readjust fonts once per frame however many resize events arrive
+        self.fit_debouncer.schedule()
     
     def go_home(self):
         """Return to home screen"""
@@ -4,10 +4,14 @@ Settings view for configuring the application
 
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                              QPushButton, QSpinBox, QGroupBox, QFormLayout,
-                             QLineEdit, QMessageBox, QTextEdit)
+                             QLineEdit, QMessageBox, QTextEdit, QCheckBox, QComboBox)
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont
-from ui.styles import Styles
+from ui.styles import Styles, apply_theme, set_state
+from services import metrics
+from services.tracing import tracer
+from services.profiler import profiler
+from services.scheduler import SCHEDULERS, DEFAULT_SCHEDULER
 
 class SettingsView(QWidget):
     """Settings configuration view"""
@@ -27,13 +31,13 @@ class SettingsView(QWidget):
         header_layout = QHBoxLayout()
         
         back_btn = QPushButton("← Back")
-        back_btn.setStyleSheet(Styles.SECONDARY_BUTTON)
+        back_btn.setProperty('variant', 'secondary')
         back_btn.setMaximumWidth(120)
         back_btn.clicked.connect(self.save_and_return)
         
         title = QLabel("Settings")
         title.setFont(QFont("Arial", 24, QFont.Weight.Bold))
-        title.setStyleSheet("color: #2c3e50;")
+        title.setProperty('role', 'heading')
         
         # Create a spacer widget for symmetry
         spacer = QWidget()
@@ -49,30 +53,16 @@ class SettingsView(QWidget):
         
         # Google Sheets Configuration
         sheets_group = QGroupBox("Google Sheets Configuration")
-        sheets_group.setStyleSheet(Styles.GROUP_BOX)
         sheets_layout = QVBoxLayout()
         sheets_layout.setSpacing(15)
         
         # Spreadsheet ID
         sheet_id_layout = QFormLayout()
         sheet_id_label = QLabel("Spreadsheet ID:")
-        sheet_id_label.setStyleSheet("color: #2c3e50; font-size: 14px; background: transparent;")
+        sheet_id_label.setProperty('role', 'field')
         
         self.spreadsheet_id_input = QLineEdit()
         self.spreadsheet_id_input.setPlaceholderText("Enter your Google Sheets ID")
-        self.spreadsheet_id_input.setStyleSheet("""
-            QLineEdit {
-                padding: 8px;
-                border: 2px solid #bdc3c7;
-                border-radius: 5px;
-                background-color: white;
-                color: #2c3e50;
-                font-size: 13px;
-            }
-            QLineEdit:focus {
-                border: 2px solid #3498db;
-            }
-        """)
         
         sheet_id_layout.addRow(sheet_id_label, self.spreadsheet_id_input)
         sheets_layout.addLayout(sheet_id_layout)
@@ -80,23 +70,10 @@ class SettingsView(QWidget):
         # Sheet GID (optional)
         sheet_gid_layout = QFormLayout()
         sheet_gid_label = QLabel("Sheet GID (optional):")
-        sheet_gid_label.setStyleSheet("color: #2c3e50; font-size: 14px; background: transparent;")
+        sheet_gid_label.setProperty('role', 'field')
         
         self.sheet_gid_input = QLineEdit()
         self.sheet_gid_input.setPlaceholderText("Enter Sheet GID (leave empty for first sheet)")
-        self.sheet_gid_input.setStyleSheet("""
-            QLineEdit {
-                padding: 8px;
-                border: 2px solid #bdc3c7;
-                border-radius: 5px;
-                background-color: white;
-                color: #2c3e50;
-                font-size: 13px;
-            }
-            QLineEdit:focus {
-                border: 2px solid #3498db;
-            }
-        """)
         
         sheet_gid_layout.addRow(sheet_gid_label, self.sheet_gid_input)
         sheets_layout.addLayout(sheet_gid_layout)
@@ -105,16 +82,7 @@ class SettingsView(QWidget):
         help_text = QTextEdit()
         help_text.setReadOnly(True)
         help_text.setMaximumHeight(100)
-        help_text.setStyleSheet("""
-            QTextEdit {
-                background-color: #ecf0f1;
-                border: 1px solid #bdc3c7;
-                border-radius: 5px;
-                padding: 10px;
-                color: #7f8c8d;
-                font-size: 12px;
-            }
-        """)
+        help_text.setProperty('role', 'help')
         help_text.setHtml("""
             <b>How to find your Spreadsheet ID:</b><br>
             Open your Google Sheet, look at the URL:<br>
@@ -125,14 +93,14 @@ class SettingsView(QWidget):
         
         # Connect button
         self.connect_btn = QPushButton("Connect to Google Sheet")
-        self.connect_btn.setStyleSheet(Styles.PRIMARY_BUTTON)
+        self.connect_btn.setProperty('variant', 'primary')
         self.connect_btn.setMinimumHeight(45)
         self.connect_btn.clicked.connect(self.connect_to_sheet)
         sheets_layout.addWidget(self.connect_btn)
         
         # Connection status
         self.connection_status = QLabel("Status: Not Connected")
-        self.connection_status.setStyleSheet("color: #95a5a6; font-size: 14px; background: transparent; padding: 5px;")
+        self.connection_status.setProperty('role', 'connection')
         self.connection_status.setAlignment(Qt.AlignmentFlag.AlignCenter)
         sheets_layout.addWidget(self.connection_status)
         
@@ -141,32 +109,103 @@ class SettingsView(QWidget):
         
         # Session settings
         session_group = QGroupBox("Session Settings")
-        session_group.setStyleSheet(Styles.GROUP_BOX)
         session_layout = QFormLayout()
         session_layout.setLabelAlignment(Qt.AlignmentFlag.AlignLeft)
         session_layout.setFormAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
         
         # Label for spin box
         cards_label = QLabel("Cards per session:")
-        cards_label.setStyleSheet("color: #2c3e50; font-size: 14px; background: transparent;")
+        cards_label.setProperty('role', 'field')
         
         self.cards_per_session = QSpinBox()
         self.cards_per_session.setMinimum(5)
         self.cards_per_session.setMaximum(100)
         self.cards_per_session.setValue(20)
-        self.cards_per_session.setStyleSheet(Styles.SPIN_BOX)
         self.cards_per_session.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
         
         session_layout.addRow(cards_label, self.cards_per_session)
+        
+        scheduler_label = QLabel("Scheduler:")
+        scheduler_label.setProperty('role', 'field')
+        
+        self.scheduler = QComboBox()
+        for name, scheduler_class in SCHEDULERS.items():
+            self.scheduler.addItem(scheduler_class.label, name)
+        self.scheduler.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        
+        session_layout.addRow(scheduler_label, self.scheduler)
+        
+        theme_label = QLabel("Theme:")
+        theme_label.setProperty('role', 'field')
+        
+        self.theme = QComboBox()
+        for name, theme in Styles.THEMES.items():
+            self.theme.addItem(theme['label'], name)
+        self.theme.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        
+        session_layout.addRow(theme_label, self.theme)
+        
+        self.auto_archive = QCheckBox("Archive mastered cards automatically")
+        self.auto_archive.setProperty('role', 'field')
+        self.auto_archive.setToolTip("Move cards that are never due again to an archive worksheet after sessions")
+        session_layout.addRow(self.auto_archive)
         session_group.setLayout(session_layout)
         
         layout.addWidget(session_group)
         
+        # Diagnostics
+        diagnostics_group = QGroupBox("Diagnostics")
+        diagnostics_layout = QVBoxLayout()
+        diagnostics_layout.setSpacing(10)
+        
+        self.metrics_enabled = QCheckBox("Collect performance metrics")
+        self.metrics_enabled.setProperty('role', 'field')
+        self.metrics_enabled.toggled.connect(self.toggle_metrics)
+        diagnostics_layout.addWidget(self.metrics_enabled)
+        
+        self.tracing_enabled = QCheckBox("Record trace spans (Chrome/Perfetto timeline)")
+        self.tracing_enabled.setProperty('role', 'field')
+        self.tracing_enabled.toggled.connect(self.toggle_tracing)
+        diagnostics_layout.addWidget(self.tracing_enabled)
+        
+        self.profiling_enabled = QCheckBox("Profile practice sessions (reports in config/profiles)")
+        self.profiling_enabled.setProperty('role', 'field')
+        self.profiling_enabled.toggled.connect(self.toggle_profiling)
+        diagnostics_layout.addWidget(self.profiling_enabled)
+        
+        self.metrics_summary = QTextEdit()
+        self.metrics_summary.setReadOnly(True)
+        self.metrics_summary.setMaximumHeight(120)
+        self.metrics_summary.setProperty('role', 'mono')
+        diagnostics_layout.addWidget(self.metrics_summary)
+        
+        metrics_buttons = QHBoxLayout()
+        refresh_btn = QPushButton("Refresh")
+        refresh_btn.setProperty('variant', 'secondary')
+        refresh_btn.clicked.connect(self.refresh_metrics)
+        prometheus_btn = QPushButton("Export Prometheus")
+        prometheus_btn.setProperty('variant', 'secondary')
+        prometheus_btn.clicked.connect(lambda: self.export_metrics('config/metrics.prom'))
+        json_btn = QPushButton("Export JSON")
+        json_btn.setProperty('variant', 'secondary')
+        json_btn.clicked.connect(lambda: self.export_metrics('config/metrics.json'))
+        metrics_buttons.addWidget(refresh_btn)
+        metrics_buttons.addWidget(prometheus_btn)
+        metrics_buttons.addWidget(json_btn)
+        trace_btn = QPushButton("Export Trace")
+        trace_btn.setProperty('variant', 'secondary')
+        trace_btn.clicked.connect(lambda: self.export_trace('config/trace.json'))
+        metrics_buttons.addWidget(trace_btn)
+        diagnostics_layout.addLayout(metrics_buttons)
+        
+        diagnostics_group.setLayout(diagnostics_layout)
+        layout.addWidget(diagnostics_group)
+        
         layout.addStretch()
         
         # Save button
         save_btn = QPushButton("Save Settings")
-        save_btn.setStyleSheet(Styles.PRIMARY_BUTTON)
+        save_btn.setProperty('variant', 'primary')
         save_btn.setMinimumHeight(50)
         save_btn.clicked.connect(self.save_and_return)
         
@@ -176,21 +215,83 @@ class SettingsView(QWidget):
         """Load current settings from config"""
         config = self.main_window.config
         self.cards_per_session.setValue(config.get('cards_per_session', 20))
+        index = self.scheduler.findData(config.get('scheduler', DEFAULT_SCHEDULER))
+        self.scheduler.setCurrentIndex(max(index, 0))
+        index = self.theme.findData(config.get('theme', Styles.DEFAULT_THEME))
+        self.theme.setCurrentIndex(max(index, 0))
         self.spreadsheet_id_input.setText(config.get('spreadsheet_id', ''))
         self.sheet_gid_input.setText(config.get('sheet_gid', ''))
+        self.auto_archive.setChecked(config.get('auto_archive', False))
+        self.metrics_enabled.setChecked(config.get('metrics_enabled', False))
+        self.tracing_enabled.setChecked(tracer.enabled)
+        self.profiling_enabled.setChecked(profiler.enabled)
+        self.refresh_metrics()
         
         # Update connection status
         self.update_connection_status()
     
+    def toggle_metrics(self, enabled: bool):
+        """Start or stop recording metrics immediately"""
+        metrics.registry.enabled = enabled
+        self.refresh_metrics()
+    
+    def toggle_tracing(self, enabled: bool):
+        """Start or stop recording trace spans, starting a fresh trace"""
+        if enabled and not tracer.enabled:
+            tracer.clear()
+        tracer.enabled = enabled
+    
+    def toggle_profiling(self, enabled: bool):
+        """Profile from the next practice session on"""
+        profiler.enabled = enabled
+        if not enabled:
+            profiler.stop()
+    
+    def export_trace(self, path: str):
+        """Write the recorded spans as a Chrome trace file"""
+        try:
+            tracer.write(path)
+            QMessageBox.information(
+                self,
+                "Trace Exported",
+                f"{tracer.event_count()} events written to {path}\nOpen it in chrome://tracing or ui.perfetto.dev"
+            )
+        except Exception as e:
+            QMessageBox.critical(self, "Export Error", f"Failed to export trace:\n{str(e)}")
+    
+    def refresh_metrics(self):
+        """Show a per-operation summary of the recorded metrics"""
+        operations = metrics.registry.snapshot()['operations']
+        if not operations:
+            state = "enabled" if metrics.registry.enabled else "disabled"
+            self.metrics_summary.setPlainText(f"No metrics recorded (collection {state}).")
+            return
+        
+        lines = [f"{'operation':<28}{'calls':>7}{'errors':>7}{'mean ms':>10}{'p95 ms':>9}{'KiB':>9}"]
+        for name, stats in operations.items():
+            latency = stats['latency_seconds']
+            lines.append(f"{name:<28}{stats['calls']:>7}{stats['errors']:>7}"
+                         f"{latency['mean'] * 1000:>10.1f}{latency['p95'] * 1000:>9.1f}"
+                         f"{stats['bytes'] / 1024:>9.1f}")
+        self.metrics_summary.setPlainText('\n'.join(lines))
+    
+    def export_metrics(self, path: str):
+        """Write the recorded metrics to a file"""
+        try:
+            metrics.registry.write(path)
+            QMessageBox.information(self, "Metrics Exported", f"Metrics written to {path}")
+        except Exception as e:
+            QMessageBox.critical(self, "Export Error", f"Failed to export metrics:\n{str(e)}")
+    
     def update_connection_status(self):
         """Update the connection status label"""
         if self.main_window.sheets_service and self.main_window.sheets_service.is_connected():
             word_count = len(self.main_window.flashcard_manager.words_data) if self.main_window.flashcard_manager else 0
             self.connection_status.setText(f"Status: Connected ✓ ({word_count} words loaded)")
-            self.connection_status.setStyleSheet("color: #27ae60; font-size: 14px; background: transparent; padding: 5px;")
+            set_state(self.connection_status, 'tone', 'ok')
         else:
             self.connection_status.setText("Status: Not Connected ✗")
-            self.connection_status.setStyleSheet("color: #e74c3c; font-size: 14px; background: transparent; padding: 5px;")
+            set_state(self.connection_status, 'tone', 'error')
     
     def connect_to_sheet(self):
         """Connect to the configured Google Sheet"""
@@ -207,35 +308,40 @@ class SettingsView(QWidget):
         
         # Show loading status
         self.connection_status.setText("Connecting...")
-        self.connection_status.setStyleSheet("color: #f39c12; font-size: 14px; background: transparent; padding: 5px;")
+        set_state(self.connection_status, 'tone', 'warning')
         self.connect_btn.setEnabled(False)
         
         try:
             # Import here to avoid circular dependency
-            from services.google_sheets import GoogleSheetsService
+            from services.sharded_sheets import ShardedSheetsService
             from services.flashcard_logic import FlashcardManager
             
             # Create new sheets service with provided ID
-            sheets_service = GoogleSheetsService(spreadsheet_id, sheet_gid if sheet_gid else None)
+            sheets_service = ShardedSheetsService.from_config(spreadsheet_id, sheet_gid, self.main_window.config)
             
             # Fetch words to test connection
             words_data = sheets_service.fetch_words()
             
             if not words_data:
                 raise Exception("No words found in the spreadsheet. Please ensure your sheet has the correct format.")
+            sheets_service.assign_ids(words_data)
             
             # Update main window's services
+            self.main_window.switch_outbox(spreadsheet_id, sheet_gid)
             self.main_window.sheets_service = sheets_service
             self.main_window.flashcard_manager = FlashcardManager(
                 words_data,
                 sheets_service,
-                self.main_window.config
+                self.main_window.config,
+                self.main_window.review_log,
+                self.main_window.outbox
             )
             
             # Save to config
             self.main_window.config.set('spreadsheet_id', spreadsheet_id)
             self.main_window.config.set('sheet_gid', sheet_gid)
             self.main_window.config.save()
+            self.main_window.save_snapshot()
             
             # Update status
             self.update_connection_status()
@@ -251,7 +357,7 @@ class SettingsView(QWidget):
             
         except Exception as e:
             self.connection_status.setText("Status: Connection Failed ✗")
-            self.connection_status.setStyleSheet("color: #e74c3c; font-size: 14px; background: transparent; padding: 5px;")
+            set_state(self.connection_status, 'tone', 'error')
             
             QMessageBox.critical(
                 self,
@@ -267,6 +373,17 @@ class SettingsView(QWidget):
         config.set('cards_per_session', self.cards_per_session.value())
         config.set('spreadsheet_id', self.spreadsheet_id_input.text().strip())
         config.set('sheet_gid', self.sheet_gid_input.text().strip())
+        config.set('auto_archive', self.auto_archive.isChecked())
+        config.set('metrics_enabled', self.metrics_enabled.isChecked())
+        config.set('profiling_enabled', self.profiling_enabled.isChecked())
+        scheduler = self.scheduler.currentData()
+        if scheduler != config.get('scheduler', DEFAULT_SCHEDULER):
+            config.set('scheduler', scheduler)
+            if self.main_window.flashcard_manager:
+                self.main_window.flashcard_manager.set_scheduler(scheduler)
+        theme = self.theme.currentData()
+        if theme != config.get('theme', Styles.DEFAULT_THEME):
+            config.set('theme', apply_theme(theme))
         config.save()
         
         self.main_window.show_home()
\ No newline at end of file
@@ -0,0 +1,140 @@
+"""
+Watchdog reporting stalls of the Qt event loop
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+from PySide6.QtCore import QObject, QTimer, Qt
+from services import metrics
+
+# Frames from these files are part of FlashTick, everything else is a library
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class StallDetector(QObject):
+    """Detects when the GUI thread stops processing events
+
+    A heartbeat QTimer on the GUI thread stamps the time of every event loop
+    pass. A monitor thread polls the stamp; once it is older than the
+    threshold, the GUI thread's Python stack is captured with
+    sys._current_frames() and the stall is reported when the loop resumes.
+    Must be created on the GUI thread.
+    """
+
+    LOG_FILE = 'config/stalls.log'
+
+    def __init__(self, threshold_ms: int = 50, heartbeat_ms: int = 10,
+                 log_file: Optional[str] = LOG_FILE, parent=None):
+        super().__init__(parent)
+        self.threshold = threshold_ms / 1000
+        self.heartbeat_interval = heartbeat_ms / 1000
+        self.log_file = log_file
+        self.stalls = deque(maxlen=100)  # Most recent stalls, newest last
+        self._gui_thread_id = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._stop = threading.Event()
+        self._monitor = None
+
+        self._heartbeat = QTimer(self)
+        self._heartbeat.setTimerType(Qt.TimerType.PreciseTimer)
+        self._heartbeat.setInterval(heartbeat_ms)
+        self._heartbeat.timeout.connect(self._beat)
+
+    def start(self):
+        """Start the heartbeat and the monitor thread"""
+        if self._monitor is not None:
+            return
+        self._last_beat = time.perf_counter()
+        self._stop.clear()
+        self._heartbeat.start()
+        self._monitor = threading.Thread(target=self._watch, name='StallDetector', daemon=True)
+        self._monitor.start()
+
+    def stop(self):
+        """Stop monitoring"""
+        self._heartbeat.stop()
+        self._stop.set()
+        if self._monitor is not None:
+            self._monitor.join()
+            self._monitor = None
+
+    def _beat(self):
+        self._last_beat = time.perf_counter()
+
+    def _watch(self):
+        """Monitor thread: poll the heartbeat and sample the GUI stack on stalls"""
+        poll = max(self.threshold / 4, 0.005)
+        limit = self.threshold + self.heartbeat_interval
+        stalled_since = None
+        sample = None
+
+        while not self._stop.wait(poll):
+            last_beat = self._last_beat
+            if stalled_since is None:
+                if time.perf_counter() - last_beat > limit:
+                    stalled_since = last_beat
+                    sample = self._sample_gui_stack()
+            elif last_beat != stalled_since:
+                blocked = last_beat - stalled_since - self.heartbeat_interval
+                self._report(blocked, sample)
+                stalled_since = None
+
+    def _sample_gui_stack(self) -> Dict:
+        """Capture the GUI thread's stack and name the operation it is running"""
+        frame = sys._current_frames().get(self._gui_thread_id)
+        stack: List[str] = []
+        names: List[str] = []
+        repo_frames: List[str] = []
+
+        while frame is not None:
+            code = frame.f_code
+            name = getattr(code, 'co_qualname', code.co_name)
+            filename = os.path.abspath(code.co_filename)
+            stack.append(f'  File "{filename}", line {frame.f_lineno}, in {name}')
+            names.append(name)
+            if filename.startswith(_REPO_ROOT) and os.sep + 'site-packages' + os.sep not in filename:
+                repo_frames.append(name)
+            frame = frame.f_back
+        stack.reverse()
+        frames = list(reversed(repo_frames or names))
+
+        # The outermost frame is the entry point running the event loop,
+        # the next one is the handler the loop dispatched to
+        if len(frames) > 1:
+            operation = frames[1]
+        else:
+            operation = frames[0] if frames else '<unknown>'
+        location = frames[-1] if frames else operation
+
+        return {'operation': operation, 'location': location, 'stack': stack}
+
+    def _report(self, blocked: float, sample: Dict):
+        """Log one stall"""
+        blocked_ms = blocked * 1000
+        stall = {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'duration_ms': round(blocked_ms, 1),
+            **sample
+        }
+        self.stalls.append(stall)
+
+        if metrics.registry.enabled:
+            metrics.registry.observe('ui.stall', blocked)
+
+        where = sample['operation']
+        if sample['location'] != where:
+            where += f" (at {sample['location']})"
+        print(f"Warning: GUI thread blocked for {blocked_ms:.0f} ms in {where}")
+
+        if not self.log_file:
+            return
+        try:
+            with open(self.log_file, 'a') as f:
+                f.write(f"{stall['timestamp']} blocked {blocked_ms:.0f} ms in {where}\n")
+                f.write('\n'.join(sample['stack']) + '\n\n')
+        except OSError as e:
+            print(f"Warning: Failed to write stall log: {str(e)}")
@@ -1,231 +1,245 @@
 """
-UI styling constants for consistent design
+UI styling: one application stylesheet keyed on dynamic properties, with themes
 """
 
+from functools import lru_cache
+from string import Template
+from typing import List
+from PySide6.QtWidgets import QApplication, QWidget
+
 class Styles:
-    """Centralized styling for the application"""
-    
-    GLOBAL_STYLE = """
+    """Centralized styling for the application
+
+    Widgets do not get style sheets of their own. They carry dynamic
+    properties that the application stylesheet selects on:
+
+        variant  QPushButton: primary, secondary, correct, incorrect, skip
+        role     what a widget is (title, muted, field, card-text, ...)
+        tone     text color for state: ok, warning, error, accent, strong
+        side     card face: front, back
+
+    The stylesheet is compiled once per theme. A state change goes through
+    set_state(), which re-polishes only the widget that changed.
+    """
+
+    DEFAULT_THEME = 'light'
+
+    THEMES = {
+        'light': {
+            'label': 'Light',
+            'background': '#ecf0f1',
+            'surface': 'white',
+            'surface_revealed': '#e8f8f5',
+            'text': '#2c3e50',
+            'text_strong': '#34495e',
+            'muted': '#7f8c8d',
+            'faint': '#95a5a6',
+            'fainter': '#bdc3c7',
+            'border': '#bdc3c7',
+            'border_light': '#e5e5e5',
+            'track': '#d5dbdb',
+            'on_accent': 'white',
+            'primary': '#3498db',
+            'primary_hover': '#2980b9',
+            'primary_pressed': '#21618c',
+            'disabled': '#bdc3c7',
+            'secondary': '#95a5a6',
+            'secondary_hover': '#7f8c8d',
+            'secondary_pressed': '#6c7a7b',
+            'success': '#27ae60',
+            'success_hover': '#229954',
+            'success_pressed': '#1e8449',
+            'danger': '#e74c3c',
+            'danger_hover': '#c0392b',
+            'danger_pressed': '#a93226',
+            'warning': '#f39c12',
+            'warning_hover': '#e67e22',
+            'warning_pressed': '#d68910',
+            'notice': '#e67e22',
+            'badge': '#1CB0F6',
+            'info_background': '#E0F2FE',
+            'info_text': '#005F99'
+        },
+        'dark': {
+            'label': 'Dark',
+            'background': '#1f2428',
+            'surface': '#2b3238',
+            'surface_revealed': '#1f3b36',
+            'text': '#ecf0f1',
+            'text_strong': '#dfe6e9',
+            'muted': '#a4b0b5',
+            'faint': '#8a969c',
+            'fainter': '#68757b',
+            'border': '#4a555c',
+            'border_light': '#3a444a',
+            'track': '#3a444a',
+            'on_accent': 'white',
+            'primary': '#3498db',
+            'primary_hover': '#2980b9',
+            'primary_pressed': '#21618c',
+            'disabled': '#4a555c',
+            'secondary': '#4f5b62',
+            'secondary_hover': '#5f6c73',
+            'secondary_pressed': '#3f494f',
+            'success': '#2ecc71',
+            'success_hover': '#27ae60',
+            'success_pressed': '#1e8449',
+            'danger': '#e74c3c',
+            'danger_hover': '#c0392b',
+            'danger_pressed': '#a93226',
+            'warning': '#f39c12',
+            'warning_hover': '#e67e22',
+            'warning_pressed': '#d68910',
+            'notice': '#f0a04b',
+            'badge': '#1CB0F6',
+            'info_background': '#17324a',
+            'info_text': '#8fd0ff'
+        }
+    }
+
+    # Rules are ordered so that later ones win ties in specificity
+    STYLESHEET = Template("""
         QWidget {
-            background-color: #ecf0f1;
+            background-color: $background;
+            color: $text;
             font-family: 'Arial', 'Helvetica', sans-serif;
         }
         QMessageBox {
-            background-color: #ecf0f1;
+            background-color: $background;
         }
         QMessageBox QLabel {
-            color: #2c3e50;
+            color: $text;
             font-size: 14px;
         }
         QMessageBox QPushButton {
-            background-color: #3498db;
-            color: white;
+            background-color: $primary;
+            color: $on_accent;
             border: none;
             border-radius: 5px;
             padding: 8px 20px;
             min-width: 80px;
         }
         QMessageBox QPushButton:hover {
-            background-color: #2980b9;
-        }
-        QMessageBox QPushButton:focus {
-            outline: none;
-            border: none;
+            background-color: $primary_hover;
         }
-    """
-    
-    PRIMARY_BUTTON = """
-        QPushButton {
-            background-color: #3498db;
-            color: white;
+
+        /* Buttons */
+        QPushButton[variant] {
+            color: $on_accent;
             border: none;
             border-radius: 10px;
             padding: 15px 30px;
             font-weight: bold;
         }
-        QPushButton:hover {
-            background-color: #2980b9;
+        QPushButton[variant="primary"] {
+            background-color: $primary;
         }
-        QPushButton:pressed {
-            background-color: #21618c;
+        QPushButton[variant="primary"]:hover {
+            background-color: $primary_hover;
         }
-        QPushButton:disabled {
-            background-color: #bdc3c7;
+        QPushButton[variant="primary"]:pressed {
+            background-color: $primary_pressed;
         }
-        QPushButton:focus {
-            outline: none;
-            border: none;
+        QPushButton[variant="primary"]:disabled {
+            background-color: $disabled;
         }
-    """
-    
-    SECONDARY_BUTTON = """
-        QPushButton {
-            background-color: #95a5a6;
-            color: white;
-            border: none;
+        QPushButton[variant="secondary"] {
+            background-color: $secondary;
             border-radius: 8px;
             padding: 10px 20px;
+            font-weight: normal;
         }
-        QPushButton:hover {
-            background-color: #7f8c8d;
+        QPushButton[variant="secondary"]:hover {
+            background-color: $secondary_hover;
         }
-        QPushButton:pressed {
-            background-color: #6c7a7b;
+        QPushButton[variant="secondary"]:pressed {
+            background-color: $secondary_pressed;
         }
-        QPushButton:focus {
-            outline: none;
-            border: none;
+        QPushButton[variant="secondary"]:disabled {
+            background-color: $disabled;
         }
-    """
-    
-    CORRECT_BUTTON = """
-        QPushButton {
-            background-color: #27ae60;
-            color: white;
-            border: none;
-            border-radius: 10px;
-            padding: 15px 30px;
-            font-weight: bold;
+        QPushButton[variant="secondary"]:checked {
+            background-color: $primary;
         }
-        QPushButton:hover {
-            background-color: #229954;
+        QPushButton[variant="correct"] {
+            background-color: $success;
         }
-        QPushButton:pressed {
-            background-color: #1e8449;
+        QPushButton[variant="correct"]:hover {
+            background-color: $success_hover;
         }
-        QPushButton:focus {
-            outline: none;
-            border: none;
-        }
-    """
-    
-    INCORRECT_BUTTON = """
-        QPushButton {
-            background-color: #e74c3c;
-            color: white;
-            border: none;
-            border-radius: 10px;
-            padding: 15px 30px;
-            font-weight: bold;
+        QPushButton[variant="correct"]:pressed {
+            background-color: $success_pressed;
         }
-        QPushButton:hover {
-            background-color: #c0392b;
+        QPushButton[variant="incorrect"] {
+            background-color: $danger;
         }
-        QPushButton:pressed {
-            background-color: #a93226;
+        QPushButton[variant="incorrect"]:hover {
+            background-color: $danger_hover;
         }
-        QPushButton:focus {
-            outline: none;
-            border: none;
+        QPushButton[variant="incorrect"]:pressed {
+            background-color: $danger_pressed;
         }
-    """
-    
-    SKIP_BUTTON = """
-        QPushButton {
-            background-color: #f39c12;
-            color: white;
-            border: none;
-            border-radius: 10px;
-            padding: 15px 30px;
-            font-weight: bold;
+        QPushButton[variant="skip"] {
+            background-color: $warning;
         }
-        QPushButton:hover {
-            background-color: #e67e22;
+        QPushButton[variant="skip"]:hover {
+            background-color: $warning_hover;
         }
-        QPushButton:pressed {
-            background-color: #d68910;
+        QPushButton[variant="skip"]:pressed {
+            background-color: $warning_pressed;
         }
         QPushButton:focus {
             outline: none;
             border: none;
         }
-    """
-    
-    FLASHCARD = """
-        QWidget {
-            background-color: white;
-            border-radius: 15px;
-            padding: 20px;
-            border: none;
-        }
-        QWidget:focus {
-            outline: none;
-            border: none;
-        }
-    """
-    
-    FLASHCARD_REVEALED = """
-        QWidget {
-            background-color: #e8f8f5;
-            border-radius: 15px;
-            padding: 20px;
-            border: none;
-        }
-        QWidget:focus {
-            outline: none;
-            border: none;
-        }
-    """
-    
-    PROGRESS_BAR = """
-        QProgressBar {
-            border: none;
-            border-radius: 4px;
-            background-color: #d5dbdb;
-        }
-        QProgressBar::chunk {
-            background-color: #3498db;
-            border-radius: 4px;
+
+        /* Inputs */
+        QLineEdit {
+            padding: 8px;
+            border: 2px solid $border;
+            border-radius: 5px;
+            background-color: $surface;
+            color: $text;
+            font-size: 13px;
         }
-    """
-    
-    GROUP_BOX = """
-        QGroupBox {
-            font-size: 16px;
-            font-weight: bold;
-            color: #2c3e50;
-            border: 2px solid #bdc3c7;
-            border-radius: 10px;
-            margin-top: 15px;
-            padding: 20px;
-            background-color: white;
+        QLineEdit:focus {
+            border: 2px solid $primary;
         }
-        QGroupBox::title {
-            subcontrol-origin: margin;
-            left: 10px;
-            padding: 0 5px;
-            background-color: #ecf0f1;
-            color: #2c3e50;
+        QTextEdit[role="help"] {
+            background-color: $background;
+            border: 1px solid $border;
+            border-radius: 5px;
+            padding: 10px;
+            color: $muted;
+            font-size: 12px;
         }
-        QGroupBox QLabel {
-            background-color: transparent;
+        QTextEdit[role="mono"] {
+            font-family: monospace;
+            font-size: 12px;
         }
-    """
-    
-    SPIN_BOX = """
         QSpinBox {
             padding: 8px 10px;
-            border: 2px solid #bdc3c7;
+            border: 2px solid $border;
             border-radius: 5px;
-            background-color: white;
+            background-color: $surface;
             font-size: 14px;
-            color: #2c3e50;
+            color: $text;
             min-width: 100px;
         }
         QSpinBox:focus {
-            border: 2px solid #3498db;
+            border: 2px solid $primary;
             outline: none;
         }
         QSpinBox::up-button {
             subcontrol-origin: border;
             subcontrol-position: top right;
             width: 20px;
-            border-left: 1px solid #bdc3c7;
+            border-left: 1px solid $border;
             border-top-right-radius: 5px;
-            background-color: #ecf0f1;
+            background-color: $background;
         }
         QSpinBox::up-button:hover {
-            background-color: #3498db;
+            background-color: $primary;
         }
         QSpinBox::up-arrow {
             image: none;
@@ -233,22 +247,22 @@ class Styles:
             height: 0px;
             border-left: 5px solid transparent;
             border-right: 5px solid transparent;
-            border-bottom: 5px solid #2c3e50;
+            border-bottom: 5px solid $text;
             margin: 0 auto;
         }
         QSpinBox::up-button:hover QSpinBox::up-arrow {
-            border-bottom-color: white;
+            border-bottom-color: $on_accent;
         }
         QSpinBox::down-button {
             subcontrol-origin: border;
             subcontrol-position: bottom right;
             width: 20px;
-            border-left: 1px solid #bdc3c7;
+            border-left: 1px solid $border;
             border-bottom-right-radius: 5px;
-            background-color: #ecf0f1;
+            background-color: $background;
         }
         QSpinBox::down-button:hover {
-            background-color: #3498db;
+            background-color: $primary;
         }
         QSpinBox::down-arrow {
             image: none;
@@ -256,10 +270,246 @@ class Styles:
             height: 0px;
             border-left: 5px solid transparent;
             border-right: 5px solid transparent;
-            border-top: 5px solid #2c3e50;
+            border-top: 5px solid $text;
             margin: 0 auto;
         }
         QSpinBox::down-button:hover QSpinBox::down-arrow {
-            border-top-color: white;
+            border-top-color: $on_accent;
         }
-    """
\ No newline at end of file
+        QComboBox {
+            padding: 8px 10px;
+            border: 2px solid $border;
+            border-radius: 5px;
+            background-color: $surface;
+            font-size: 14px;
+            color: $text;
+            min-width: 100px;
+        }
+        QComboBox:focus {
+            border: 2px solid $primary;
+            outline: none;
+        }
+        QComboBox::drop-down {
+            width: 20px;
+            border-left: 1px solid $border;
+            background-color: $background;
+        }
+
+        /* Tables */
+        QTableView {
+            background-color: $surface;
+            alternate-background-color: $background;
+            border: 2px solid $border_light;
+            border-radius: 10px;
+            gridline-color: $border_light;
+            selection-background-color: $primary;
+            selection-color: $on_accent;
+            font-size: 13px;
+        }
+        QHeaderView::section {
+            background-color: $surface;
+            color: $muted;
+            padding: 6px;
+            border: none;
+            border-bottom: 2px solid $border_light;
+            font-weight: bold;
+        }
+
+        /* Containers */
+        QGroupBox {
+            font-size: 16px;
+            font-weight: bold;
+            color: $text;
+            border: 2px solid $border;
+            border-radius: 10px;
+            margin-top: 15px;
+            padding: 20px;
+            background-color: $surface;
+        }
+        QGroupBox::title {
+            subcontrol-origin: margin;
+            left: 10px;
+            padding: 0 5px;
+            background-color: $background;
+            color: $text;
+        }
+        QGroupBox QLabel {
+            background-color: transparent;
+        }
+        QProgressBar {
+            border: none;
+            border-radius: 4px;
+            background-color: $track;
+        }
+        QProgressBar::chunk {
+            background-color: $primary;
+            border-radius: 4px;
+        }
+        QFrame[role="stats"], QFrame[role="stats"] QFrame {
+            background-color: $surface;
+            border-radius: 15px;
+            padding: 30px;
+            border: 2px solid $border_light;
+        }
+        QWidget[role="overlay"] {
+            background: transparent;
+        }
+
+        /* Labels */
+        QLabel[role="title"] {
+            color: $text;
+            margin-bottom: 20px;
+        }
+        QLabel[role="heading"] {
+            color: $text;
+        }
+        QLabel[role="subtitle"] {
+            color: $muted;
+            margin-bottom: 40px;
+        }
+        QLabel[role="muted"] {
+            color: $muted;
+        }
+        QLabel[role="stat-header"] {
+            color: $muted;
+            text-transform: uppercase;
+        }
+        QLabel[role="status"] {
+            color: $faint;
+            margin-bottom: 20px;
+        }
+        QLabel[role="connection"] {
+            color: $faint;
+            font-size: 14px;
+            background: transparent;
+            padding: 5px;
+        }
+        QLabel[role="field"], QCheckBox[role="field"] {
+            color: $text;
+            font-size: 14px;
+            background: transparent;
+        }
+        QLabel[role="notice"] {
+            color: $notice;
+            margin-bottom: 10px;
+            font-weight: bold;
+        }
+        QLabel[role="info"] {
+            background-color: $info_background;
+            color: $info_text;
+            border: 2px solid $primary;
+            border-radius: 12px;
+            padding: 15px;
+            margin: 10px 0;
+        }
+        QLabel[role="badge"] {
+            background-color: $badge;
+            color: $on_accent;
+            padding: 6px 14px;
+            border-radius: 12px;
+            font-size: 11px;
+            font-weight: bold;
+            border: none;
+        }
+        QLabel[tone="ok"] {
+            color: $success;
+        }
+        QLabel[tone="warning"] {
+            color: $warning;
+        }
+        QLabel[tone="error"] {
+            color: $danger;
+        }
+        QLabel[tone="accent"] {
+            color: $primary;
+        }
+        QLabel[tone="strong"] {
+            color: $text_strong;
+        }
+
+        /* Flashcard faces, every widget inside a face shares its surface */
+        QWidget[side="front"], QWidget[side="front"] QWidget {
+            background-color: $surface;
+            border-radius: 15px;
+            padding: 20px;
+            border: none;
+        }
+        QWidget[side="back"], QWidget[side="back"] QWidget {
+            background-color: $surface_revealed;
+            border-radius: 15px;
+            padding: 20px;
+            border: none;
+        }
+        QWidget[side] QScrollArea {
+            border: none;
+            background-color: transparent;
+        }
+        QWidget[side] QScrollBar:vertical {
+            border: none;
+            background: $background;
+            width: 10px;
+            margin: 0px;
+            border-radius: 5px;
+        }
+        QWidget[side] QScrollBar::handle:vertical {
+            background: $primary;
+            min-height: 20px;
+            border-radius: 5px;
+        }
+        QWidget[side] QScrollBar::handle:vertical:hover {
+            background: $primary_hover;
+        }
+        QWidget[side] QScrollBar::add-line:vertical, QWidget[side] QScrollBar::sub-line:vertical {
+            height: 0px;
+        }
+        QWidget[side] QLabel[role="card-text"] {
+            color: $text;
+            padding: 20px;
+            background: transparent;
+        }
+        QWidget[side] QLabel[role="card-image"] {
+            color: $faint;
+            padding: 0px;
+            background: transparent;
+        }
+        QWidget[side] QLabel[role="side"] {
+            color: $faint;
+            margin-top: 20px;
+            background: transparent;
+        }
+        QWidget[side] QLabel[role="stage"] {
+            color: $fainter;
+            margin-top: 10px;
+            background: transparent;
+        }
+    """)
+
+@lru_cache(maxsize=None)
+def stylesheet(theme: str = Styles.DEFAULT_THEME) -> str:
+    """Application stylesheet of a theme, compiled once"""
+    return Styles.STYLESHEET.substitute(Styles.THEMES[theme])
+
+def theme_names() -> List[str]:
+    """Names of the available themes"""
+    return list(Styles.THEMES)
+
+def apply_theme(theme: str = None) -> str:
+    """Install a theme on the application, returns the name of the theme used
+
+    Unknown names fall back to the default theme.
+    """
+    if theme not in Styles.THEMES:
+        if theme:
+            print(f"Warning: Unknown theme '{theme}', using {Styles.DEFAULT_THEME}")
+        theme = Styles.DEFAULT_THEME
+    QApplication.instance().setStyleSheet(stylesheet(theme))
+    return theme
+
+def set_state(widget: QWidget, name: str, value: str):
+    """Set a styling property and re-polish only this widget"""
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
@@ -0,0 +1,77 @@
+"""
+Cached text fitting: the largest font size at which text fits a box
+"""
+
+from functools import lru_cache
+from typing import Callable
+from PySide6.QtCore import QObject, QRect, QTimer, Qt
+from PySide6.QtGui import QFont, QFontMetrics
+
+FIT_CACHE_SIZE = 4096
+FRAME_MS = 16  # One pass per 60 Hz frame
+_UNBOUNDED = 1 << 20
+
+def _fits(text: str, family: str, weight: QFont.Weight, size: int,
+          width: int, height: int, wrap: bool) -> bool:
+    metrics = QFontMetrics(QFont(family, size, weight))
+    if wrap:
+        box = metrics.boundingRect(QRect(0, 0, width, _UNBOUNDED),
+                                   Qt.TextFlag.TextWordWrap | Qt.AlignmentFlag.AlignCenter, text)
+        text_width, text_height = box.width(), box.height()
+    else:
+        text_width, text_height = metrics.horizontalAdvance(text), metrics.height()
+    return text_width <= width and (height <= 0 or text_height <= height)
+
+@lru_cache(maxsize=FIT_CACHE_SIZE)
+def fit_point_size(text: str, width: int, height: int = 0, max_size: int = 32, min_size: int = 12,
+                   family: str = "Arial", weight: QFont.Weight = QFont.Weight.Bold,
+                   wrap: bool = False) -> int:
+    """Largest point size from min_size to max_size at which text fits
+
+    Binary search over sizes, a handful of measurements instead of one per
+    point. height <= 0 only limits the width; wrap breaks text at word
+    boundaries like a word-wrapping QLabel. Returns min_size if even that
+    does not fit.
+    """
+    if width <= 0:
+        return min_size
+    low, high, best = min_size, max_size, min_size
+    while low <= high:
+        size = (low + high) // 2
+        if _fits(text, family, weight, size, width, height, wrap):
+            best = size
+            low = size + 1
+        else:
+            high = size - 1
+    return best
+
+def fitted_font(text: str, width: int, height: int = 0, max_size: int = 32, min_size: int = 12,
+                family: str = "Arial", weight: QFont.Weight = QFont.Weight.Bold,
+                wrap: bool = False) -> QFont:
+    """Font of the largest size at which text fits, see fit_point_size()"""
+    size = fit_point_size(text, int(width), int(height), max_size, min_size, family, weight, wrap)
+    return QFont(family, size, weight)
+
+def set_fitted_font(label, font: QFont):
+    """Give a label a font, skipping the relayout if it already has it"""
+    if label.font() != font:
+        label.setFont(font)
+
+class FrameDebouncer(QObject):
+    """Coalesces requests into at most one callback per frame
+
+    Calls to schedule() while a pass is pending are dropped, so a burst of
+    resize events costs one fitting pass instead of one per event.
+    """
+
+    def __init__(self, callback: Callable[[], None], interval_ms: int = FRAME_MS, parent=None):
+        super().__init__(parent)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(callback)
+
+    def schedule(self):
+        """Run the callback at the end of the current frame"""
+        if not self.timer.isActive():
+            self.timer.start()
@@ -0,0 +1,174 @@
+"""
+Background workers that keep blocking service calls off the GUI thread
+"""
+
+from PySide6.QtCore import QThread, Signal
+from services.deck_snapshot import DeckSnapshot
+from services.tracing import tracer
+
+class DeckRevalidationWorker(QThread):
+    """Connects to Google Sheets, fetches fresh words and refreshes the snapshot"""
+
+    loaded = Signal(object, list)  # (sheets_service, words_data)
+    failed = Signal(str)
+
+    def __init__(self, spreadsheet_id: str, sheet_gid: str, parent=None, config=None):
+        super().__init__(parent)
+        self.spreadsheet_id = spreadsheet_id
+        self.sheet_gid = sheet_gid
+        self.config = config or {}  # Shard settings
+
+    def run(self):
+        """Fetch words in the background"""
+        tracer.name_thread('DeckRevalidationWorker')
+        with tracer.span('worker.revalidate'):
+            self._revalidate()
+
+    def _revalidate(self):
+        """Connect, fetch and refresh the snapshot, reporting through signals"""
+        try:
+            from services.sharded_sheets import ShardedSheetsService
+            import models.deck  # Imports NumPy here instead of at the first due count on the GUI thread
+
+            sheets_service = ShardedSheetsService.from_config(self.spreadsheet_id, self.sheet_gid, self.config)
+            words_data = sheets_service.fetch_words()
+
+            if not words_data:
+                raise Exception("No words found in the spreadsheet")
+            sheets_service.assign_ids(words_data)
+
+            try:
+                DeckSnapshot.save(
+                    words_data,
+                    DeckSnapshot.source_key_for(self.spreadsheet_id, self.sheet_gid)
+                )
+            except OSError as e:
+                print(f"Warning: Failed to save deck snapshot: {str(e)}")
+
+            self.loaded.emit(sheets_service, words_data)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+class ForecastWorker(QThread):
+    """Runs the due-load forecast off the GUI thread"""
+
+    ready = Signal(list)  # forecast days
+    failed = Signal(str)
+
+    def __init__(self, words_data: list, review_log, analytics, cards_per_session: int,
+                 days: int = 30, scheduler=None, parent=None):
+        """analytics may be None, a throwaway instance is then built off the GUI thread"""
+        super().__init__(parent)
+        self.words_data = words_data
+        self.scheduler = scheduler
+        self.review_log = review_log
+        self.analytics = analytics
+        self.cards_per_session = cards_per_session
+        self.days = days
+
+    def run(self):
+        """Build deck columns and simulate the coming days"""
+        tracer.name_thread('ForecastWorker')
+        with tracer.span('worker.forecast'):
+            try:
+                from services.analytics import ReviewAnalytics
+                from models.deck import DeckColumns
+                from services.forecast import forecaster_from_history
+
+                analytics = self.analytics or ReviewAnalytics(self.review_log)
+                summary = analytics.summary()
+                forecaster = forecaster_from_history(summary, self.cards_per_session, self.scheduler)
+                deck = DeckColumns.from_words(self.words_data, forecaster.scheduler)
+                self.ready.emit(forecaster.forecast(deck, self.days))
+            except Exception as e:
+                self.failed.emit(str(e))
+
+class SearchIndexWorker(QThread):
+    """Builds the deck's trigram search index off the GUI thread"""
+
+    ready = Signal(object)  # TrigramIndex
+    failed = Signal(str)
+
+    def __init__(self, manager, parent=None):
+        super().__init__(parent)
+        self.manager = manager
+        # The GUI thread keeps changing the deck, index a copy of its cards
+        self.words = list(manager.words_data)
+        self.layout_version = manager.layout_version
+
+    def run(self):
+        """Build a standalone index, the GUI thread installs it on the manager"""
+        from services.search_index import TrigramIndex
+
+        tracer.name_thread('SearchIndexWorker')
+        with tracer.span('worker.search_index'):
+            try:
+                self.ready.emit(TrigramIndex.from_words(self.words))
+            except Exception as e:
+                self.failed.emit(str(e))
+
+class OutboxFlushWorker(QThread):
+    """Writes the queued answer cells to the sheet off the GUI thread"""
+
+    flushed = Signal(int)  # cells written
+    failed = Signal(str)
+
+    def __init__(self, outbox, sheets_service, parent=None):
+        super().__init__(parent)
+        self.outbox = outbox
+        self.sheets_service = sheets_service
+
+    def run(self):
+        """Flush the outbox once"""
+        tracer.name_thread('OutboxFlushWorker')
+        with tracer.span('worker.outbox_flush'):
+            try:
+                self.flushed.emit(self.outbox.flush(self.sheets_service))
+            except Exception as e:
+                self.failed.emit(str(e))
+
+class ArchiveWorker(QThread):
+    """Moves retired cards to the archive worksheet off the GUI thread"""
+
+    archived = Signal(object)  # cards archived, for manager.apply_archived()
+    failed = Signal(str)
+
+    def __init__(self, manager, parent=None):
+        super().__init__(parent)
+        self.manager = manager
+        # Planned on the GUI thread, the worker only moves rows in the sheet
+        self.planned = manager.plan_archive()
+
+    def run(self):
+        """Archive the planned cards once"""
+        tracer.name_thread('ArchiveWorker')
+        with tracer.span('worker.archive'):
+            try:
+                self.archived.emit(self.manager.archive_planned(self.planned))
+            except Exception as e:
+                self.failed.emit(str(e))
+
+class ReviewLogCompactionWorker(QThread):
+    """Drops review history of cards no longer in the deck or archive off the GUI thread"""
+
+    failed = Signal(str)
+
+    def __init__(self, review_log, sheets_service, words, parent=None):
+        super().__init__(parent)
+        self.review_log = review_log
+        self.sheets_service = sheets_service
+        self.words = list(words)
+
+    def run(self):
+        """Compact the review log once, if due"""
+        from services.dedup import review_id
+
+        tracer.name_thread('ReviewLogCompactionWorker')
+        with tracer.span('worker.review_log_compaction'):
+            try:
+                # Archived cards keep their history
+                archived = self.sheets_service.fetch_archive()
+                deck_ids = {review_id(word) for word in self.words + archived}
+                self.review_log.maybe_compact(lambda record: record.card_id in deck_ids)
+            except Exception as e:
+                self.failed.emit(str(e))